@@ -0,0 +1,157 @@
+"""
+Multi-clause (compound) search benchmark.
+
+Builds a synthetic collection and text-detection table, then times
+SearchEngine.search_compound (pre-filtered clauses + sort-merge join) against
+a naive plan (every clause unfiltered, nested-loop join) for 2, 3 and 4
+clause queries. Clause vectors come from the synthetic query generator
+instead of CLIP, so the benchmark runs offline and measures only planning,
+vector search and joining.
+
+Usage:
+    python benchmarks/bench_compound_search.py
+    python benchmarks/bench_compound_search.py --size 200000 --backend flat --out compound.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import synthetic
+from benchmarks.bench_vector_backends import make_backend
+
+DIM = 512
+VIDEO_ID = 7  # The engine is scoped to this video, like the per-video search UI
+CONCEPTS = ["person", "bicycle", "red car", "dog", "backpack", "truck"]
+SIGNS = ["EXIT", "STOP", "NO PARKING", "ABC 123", "OPEN"]
+
+
+class SyntheticEmbedder:
+    """Maps each benchmark concept to a fixed synthetic query vector."""
+    def __init__(self):
+        vectors = synthetic.queries(len(CONCEPTS), dim=DIM, seed=0)
+        self.vectors = {c: v.tolist() for c, v in zip(CONCEPTS, vectors)}
+
+    def embed_text(self, text):
+        return self.vectors[text]
+
+
+def naive_compound(engine, clauses, window, clause_limit):
+    """Every clause unfiltered, then a nested-loop join on video and time."""
+    streams = [engine._run_clause(c, None, clause_limit) for c in clauses]
+    matches = [[m] for m in streams[0]]
+    for stream in streams[1:]:
+        nxt = []
+        for parts in matches:
+            for m in stream:
+                if m["video_id"] != parts[0]["video_id"]:
+                    continue
+                ts = [p["timestamp"] for p in parts] + [m["timestamp"]]
+                if max(ts) - min(ts) <= window:
+                    nxt.append(parts + [m])
+        matches = nxt
+    return matches
+
+
+def fill(store, db, size, n_text, batch=2000):
+    from src.data.models import TextDetection
+
+    for start, vecs in synthetic.vector_chunks(size, dim=DIM, chunk=batch):
+        store.add_embeddings_batch(list(zip(vecs, synthetic.payloads(start, len(vecs)))))
+    store.flush()
+
+    rng = random.Random(0)
+    max_ts = (size // len(synthetic.CLASSES)) * 15 / 30.0
+    session = db.get_session()
+    for i in range(n_text):
+        ts = rng.uniform(0, max_ts)
+        session.add(TextDetection(
+            video_id=rng.choice([VIDEO_ID, VIDEO_ID, rng.randrange(20)]),
+            frame_index=int(ts * 30),
+            timestamp=ts,
+            text_content=rng.choice(SIGNS),
+            confidence=0.9,
+            bbox_xyxy=[0, 0, 10, 10]
+        ))
+    session.commit()
+    session.close()
+
+
+def timed(fn, repeats):
+    latencies = []
+    out = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    return out, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compound search benchmark")
+    parser.add_argument("--size", type=int, default=50000, help="Vectors in the collection")
+    parser.add_argument("--text-rows", type=int, default=5000)
+    parser.add_argument("--backend", default="flat", choices=["qdrant", "flat"])
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--clause-limit", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    from src.core.search_engine import SearchEngine
+    from src.data.db_manager import DatabaseManager
+    from src.data.vector_store import VectorStore
+
+    queries = [
+        "person AND bicycle",
+        "red car near text 'EXIT'",
+        "person AND backpack AND dog",
+        "person AND bicycle AND truck near text 'STOP'",
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="neuroops_compound_") as path:
+        store = VectorStore(str(VIDEO_ID), backend=make_backend(args.backend, os.path.join(path, "vec"), "float32"))
+        db = DatabaseManager(db_path=os.path.join(path, "bench.db"))
+        print(f"[BENCH] Filling {args.size} vectors / {args.text_rows} text rows ({args.backend})...", flush=True)
+        fill(store, db, args.size, args.text_rows)
+
+        engine = SearchEngine(str(VIDEO_ID), embedder=SyntheticEmbedder(), vector_store=store, db=db)
+        from src.core.search_engine import parse_compound_query
+
+        for q in queries:
+            query = f"{q} within {args.window} seconds"
+            clauses, window = parse_compound_query(query)
+            planned, planned_ms = timed(
+                lambda: engine.search_compound(query, limit=50, clause_limit=args.clause_limit), args.repeats)
+            naive, naive_ms = timed(
+                lambda: naive_compound(engine, clauses, window, args.clause_limit), args.repeats)
+            row = {
+                "query": q,
+                "clauses": len(clauses),
+                "planned_p50_ms": round(float(np.percentile(planned_ms, 50)), 3),
+                "planned_p95_ms": round(float(np.percentile(planned_ms, 95)), 3),
+                "naive_p50_ms": round(float(np.percentile(naive_ms, 50)), 3),
+                "naive_p95_ms": round(float(np.percentile(naive_ms, 95)), 3),
+                "planned_moments": len(planned),
+                "naive_matches": len(naive),
+            }
+            results.append(row)
+            print(f"  {row}", flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"size": args.size, "backend": args.backend, "results": results}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Result-card thumbnails: crop store vs decoding the video at the hit.
+
+    put       CropStore.put per detection crop at ingest (resize + JPEG + write)
+    crop      what a card pays with a stored crop: open() + QImage load
+    decode    what it would pay otherwise: frame-accurate seek to the hit's
+              timestamp, decode, crop and scale
+Also reports the store's bytes per crop. Without --video a synthetic 1080p
+clip is encoded to a temporary directory first.
+
+Usage:
+    python benchmarks/bench_crop_store.py --video clip.mp4 --hits 50
+    python benchmarks/bench_crop_store.py --out crops.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_thumbnails import synthetic_clip  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop store benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--hits", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication, QImage
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841
+    from src.core.video.decoder import VideoDecoder
+    from src.data.crop_store import CropStore
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "synthetic_1080p.mp4")
+            print("[BENCH] Encoding synthetic 1080p clip...", flush=True)
+            synthetic_clip(video, seconds=30)
+
+        decoder = VideoDecoder(video, index_dir=os.path.join(tmp, "keyframes"))
+        w, h = decoder.width, decoder.height
+        hits = []
+        for _ in range(args.hits):
+            bw, bh = rng.randint(60, 400), rng.randint(80, 500)
+            x, y = rng.randint(0, w - bw), rng.randint(0, h - bh)
+            hits.append((rng.random() * (decoder.duration_sec - 1), (x, y, x + bw, y + bh)))
+
+        def decode_crop(timestamp, box):
+            decoder.seek(timestamp)
+            frame = decoder._next_frame()
+            x1, y1, x2, y2 = box
+            rgb = frame.to_ndarray(format="rgb24")[y1:y2, x1:x2]
+            return QImage(np.ascontiguousarray(rgb).data, x2 - x1, y2 - y1, 3 * (x2 - x1),
+                          QImage.Format.Format_RGB888).scaled(200, 100)
+
+        # Ingest: crops from the frames at the hits, written to the store
+        store = CropStore(os.path.join(tmp, "crops"))
+        put_ms, keys = [], []
+        for timestamp, (x1, y1, x2, y2) in hits:
+            decoder.seek(timestamp)
+            rgb = decoder._next_frame().to_ndarray(format="rgb24")[y1:y2, x1:x2]
+            t0 = time.perf_counter()
+            keys.append(store.put(np.ascontiguousarray(rgb)))
+            put_ms.append((time.perf_counter() - t0) * 1000)
+
+        crop_ms = []
+        for key in keys:
+            t0 = time.perf_counter()
+            QImage(store.open(key))
+            crop_ms.append((time.perf_counter() - t0) * 1000)
+
+        decode_ms = []
+        for timestamp, box in hits:
+            t0 = time.perf_counter()
+            decode_crop(timestamp, box)
+            decode_ms.append((time.perf_counter() - t0) * 1000)
+        decoder.close()
+
+        stored = [os.path.getsize(store.path(k)) for k in set(keys)]
+
+    rows = [
+        {"step": name, "median_ms": round(statistics.median(ms), 2), "p95_ms": round(float(np.percentile(ms, 95)), 2)}
+        for name, ms in (("put", put_ms), ("crop", crop_ms), ("decode", decode_ms))
+    ]
+    header = ["step", "median_ms", "p95_ms"]
+    print("\n" + " | ".join(f"{c:>10}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>10}" for c in header))
+    print(f"\n{len(stored)} crops, {statistics.mean(stored) / 1024:.1f} KB per crop")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"video": video, "hits": args.hits, "kb_per_crop": round(statistics.mean(stored) / 1024, 2),
+                       "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
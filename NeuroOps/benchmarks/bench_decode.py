@@ -0,0 +1,133 @@
+"""
+Decode-to-QImage throughput of the workbench player path.
+
+Modes, all decoding the same frames with PyAV:
+    decode   demux + decode only (upper bound)
+    legacy   frame.to_image() -> PIL tobytes("raw", "RGBA") -> QImage(...).copy()
+    fast     VideoDecoder.to_qimage: one swscale pass to RGB24 at the display
+             size, the converted plane wrapped by the QImage (no copy)
+
+With --pixmap every QImage is also turned into a QPixmap, as the GUI does
+(runs on Qt's offscreen platform). Without --video a synthetic 1080p clip
+is encoded to a temporary file first.
+
+Usage:
+    python benchmarks/bench_decode.py --video clip.mp4 --display 1280x720
+    python benchmarks/bench_decode.py --frames 300 --pixmap --out decode.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def synthetic_clip(path, frames=300, width=1920, height=1080, fps=30):
+    import av
+    container = av.open(path, "w")
+    stream = container.add_stream("h264", rate=fps)
+    stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+    rng = np.random.default_rng(0)
+    base = (rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8)
+    base = np.kron(base, np.ones((8, 8, 1), dtype=np.uint8))  # blocky, compressible texture
+    for i in range(frames):
+        img = np.roll(base, 4 * i, axis=1)
+        for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+
+
+def legacy_qimage(frame):
+    from PyQt6.QtGui import QImage
+    img = frame.to_image()
+    data = img.tobytes("raw", "RGBA")
+    return QImage(data, img.width, img.height, QImage.Format.Format_RGBA8888).copy()
+
+
+def run(video, n_frames, convert, pixmap, index_dir):
+    from PyQt6.QtGui import QPixmap
+    from src.core.video.decoder import VideoDecoder
+
+    decoder = VideoDecoder(video, index_dir=index_dir)
+    done = 0
+    t0 = time.perf_counter()
+    for packet in decoder.container.demux(decoder.stream):
+        for frame in packet.decode():
+            img = convert(decoder, frame)
+            if pixmap and img is not None:
+                QPixmap.fromImage(img)
+            done += 1
+            if done >= n_frames:
+                break
+        if done >= n_frames:
+            break
+    elapsed = time.perf_counter() - t0
+    size = decoder.output_size()
+    decoder.close()
+    return done / elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode-to-QImage benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--display", default=None, help="WxH view size for the fast path (default: native)")
+    parser.add_argument("--pixmap", action="store_true", help="Also convert to QPixmap like the GUI")
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841  (QPixmap needs it)
+
+    # Keyframe indexes go to the temp dir too, never to database/keyframes
+    tmp = tempfile.TemporaryDirectory()
+    index_dir = os.path.join(tmp.name, "keyframes")
+    video = args.video
+    if video is None:
+        video = os.path.join(tmp.name, "synthetic_1080p.mp4")
+        print("[BENCH] Encoding synthetic 1080p clip...", flush=True)
+        synthetic_clip(video, frames=args.frames)
+
+    display = tuple(int(v) for v in args.display.lower().split("x")) if args.display else None
+
+    def fast(decoder, frame):
+        decoder.set_display_size(display)
+        return decoder.to_qimage(frame)
+
+    modes = {
+        "decode": lambda decoder, frame: None,
+        "legacy": lambda decoder, frame: legacy_qimage(frame),
+        "fast": fast,
+    }
+    rows = []
+    for name, convert in modes.items():
+        fps, (w, h) = run(video, args.frames, convert, args.pixmap, index_dir)
+        rows.append({"mode": name, "fps": round(fps, 1),
+                     "output": {"decode": "-", "legacy": "native"}.get(name, f"{w}x{h}")})
+    legacy_fps = rows[1]["fps"]
+    for r in rows:
+        r["vs_legacy"] = round(r["fps"] / legacy_fps, 2)
+
+    header = ["mode", "fps", "output", "vs_legacy"]
+    print("\n" + " | ".join(f"{c:>10}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>10}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"video": video, "pixmap": args.pixmap, "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
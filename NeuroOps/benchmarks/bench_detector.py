@@ -0,0 +1,113 @@
+"""
+ObjectDetector backend benchmark: per-frame latency and throughput for the
+PyTorch, ONNX Runtime and OpenVINO backends across CPU thread counts.
+
+Frames come from --video when given (decoded once up front), otherwise
+from a synthetic 1080p noise pattern. Exported models are created on the
+first run and reused from the hash-keyed cache afterwards.
+
+Usage:
+    python benchmarks/bench_detector.py --model yolo26n.pt
+    python benchmarks/bench_detector.py --video sample.mp4 --backends torch onnx --threads 1 2 4 --out det.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def load_frames(video, n_frames):
+    if video:
+        import imageio.v3 as iio
+        frames = []
+        for frame in iio.imiter(video, plugin="pyav"):
+            frames.append(frame)
+            if len(frames) >= n_frames:
+                break
+        return frames
+    rng = np.random.default_rng(0)
+    base = (rng.random((1080, 1920, 3)) * 255).astype(np.uint8)
+    return [np.roll(base, 7 * i, axis=1) for i in range(n_frames)]
+
+
+def bench(backend, threads, model, frames, warmup):
+    from src.ai.detector import ObjectDetector
+
+    t0 = time.perf_counter()
+    detector = ObjectDetector(model, backend=backend, threads=threads)
+    load_s = time.perf_counter() - t0
+
+    for frame in frames[:warmup]:
+        detector.detect(frame)
+
+    latencies = []
+    boxes = 0
+    t_start = time.perf_counter()
+    for frame in frames:
+        t0 = time.perf_counter()
+        r = detector.detect(frame)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        boxes += len(r.boxes)
+    total_s = time.perf_counter() - t_start
+
+    return {
+        "backend": backend,
+        "threads": threads or "default",
+        "load_s": round(load_s, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "fps": round(len(frames) / total_s, 2),
+        "boxes_per_frame": round(boxes / len(frames), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detector backend benchmark")
+    parser.add_argument("--model", default="yolo26n.pt")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "openvino"],
+                        choices=["torch", "onnx", "openvino"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[0, 1, 2, 4],
+                        help="0 = runtime default")
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    import torch
+    default_threads = torch.get_num_threads()
+
+    frames = load_frames(args.video, args.frames)
+    print(f"[BENCH] {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}", flush=True)
+
+    results = []
+    for backend in args.backends:
+        for threads in args.threads:
+            torch.set_num_threads(default_threads)  # set_num_threads is process-wide
+            try:
+                row = bench(backend, threads or None, args.model, frames, args.warmup)
+            except Exception as e:
+                print(f"[BENCH] {backend} (threads={threads}) failed: {e}")
+                continue
+            print(f"  {row}", flush=True)
+            results.append(row)
+
+    header = ["backend", "threads", "load_s", "p50_ms", "p95_ms", "fps", "boxes_per_frame"]
+    print("\n" + " | ".join(f"{h:>15}" for h in header))
+    for r in results:
+        print(" | ".join(f"{str(r[h]):>15}" for h in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
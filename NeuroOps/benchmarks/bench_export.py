@@ -0,0 +1,129 @@
+"""
+Clip export: time per clip and frame accuracy of the cut.
+
+Modes:
+    legacy    ffmpeg binary, `-ss -i -t -c copy` (the old handle_save /
+              export_clip); needs imageio-ffmpeg, skipped without it
+    reencode  smart_cut forced to re-encode the whole clip
+    smart     smart_cut: inner GOPs copied, boundary GOPs re-encoded
+    batch     export_clips of --clips hits, 1 worker vs --workers
+
+"frames" is the clip's frame count minus the source frames whose pts
+fall in the requested range: smart_cut also keeps the frame already on
+screen at the start (+1 when the start falls between frames); larger
+values mean the cut started early, on a keyframe. The batch speed-up
+needs free cores (x264 already threads each encode).
+
+Without --video a synthetic 1080p clip (2 s GOP) is encoded to a temporary
+directory first.
+
+Usage:
+    python benchmarks/bench_export.py --video clip.mp4 --length 10
+    python benchmarks/bench_export.py --clips 16 --workers 4 --out export.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_thumbnails import synthetic_clip  # noqa: E402
+
+
+def frame_count(path, start=None, end=None):
+    import av
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        n = 0
+        for packet in container.demux(stream):
+            if packet.pts is None:
+                continue
+            t = packet.pts * stream.time_base
+            if start is None or start <= t < end:
+                n += 1
+        return n
+
+
+def legacy_cut(video, out, start, end):
+    import imageio_ffmpeg
+    subprocess.run([imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-ss', f"{start:.3f}", '-i', video,
+                    '-t', f"{end - start:.3f}", '-c', 'copy', out],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clip export benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--seconds", type=int, default=60, help="Synthetic clip length")
+    parser.add_argument("--length", type=float, default=10.0, help="Clip length (s)")
+    parser.add_argument("--clips", type=int, default=8, help="Clips in the batch")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    from src.core.video import export
+    from src.core.video.export import export_clips, smart_cut
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "clip.mp4")
+            print(f"Encoding a {args.seconds}s 1080p synthetic clip...")
+            synthetic_clip(video, seconds=args.seconds)
+        index_dir = os.path.join(tmp, "kf")
+        duration = frame_count(video) / 25.0 if args.video is None else None
+        if duration is None:
+            import av
+            with av.open(video) as container:
+                duration = float(container.duration / 1e6)
+        start = min(3.3, max(0.0, duration - args.length - 0.1))
+        end = start + args.length
+        expected = frame_count(video, start, end)
+        smart_cut(video, os.path.join(tmp, "warm.mp4"), 0.0, 0.5, index_dir=index_dir)  # keyframe index
+
+        def timed(name, cut):
+            out = os.path.join(tmp, f"{name}.mp4")
+            t0 = time.perf_counter()
+            cut(out)
+            rows.append({"mode": name, "ms": (time.perf_counter() - t0) * 1000,
+                         "frames": frame_count(out) - expected})
+
+        try:
+            import imageio_ffmpeg  # noqa: F401
+            timed("legacy", lambda out: legacy_cut(video, out, start, end))
+        except ImportError:
+            print("imageio-ffmpeg not installed: skipping legacy")
+        codecs = export.SMART_CODECS
+        export.SMART_CODECS = ()
+        timed("reencode", lambda out: smart_cut(video, out, start, end, index_dir=index_dir))
+        export.SMART_CODECS = codecs
+        timed("smart", lambda out: smart_cut(video, out, start, end, index_dir=index_dir))
+
+        starts = np.linspace(0.0, max(0.0, duration - args.length), args.clips)
+        for workers in (1, args.workers):
+            clips = [(video, os.path.join(tmp, f"batch{workers}_{n}.mp4"), float(s), float(s) + args.length)
+                     for n, s in enumerate(starts)]
+            t0 = time.perf_counter()
+            export_clips(clips, workers=workers, index_dir=index_dir)
+            rows.append({"mode": f"batch x{args.clips} w{workers}", "ms": (time.perf_counter() - t0) * 1000,
+                         "frames": None})
+
+    print(f"{'mode':<18}{'ms':>10}{'frames':>8}")
+    for r in rows:
+        frames = "" if r["frames"] is None else f"{r['frames']:+d}"
+        print(f"{r['mode']:<18}{r['ms']:>10.0f}{frames:>8}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"length": args.length, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
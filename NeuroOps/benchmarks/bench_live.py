@@ -0,0 +1,116 @@
+"""
+Live analysis: how stale is the frame inference sees when it is slower
+than the camera?
+
+Modes:
+    fifo    reader -> unbounded queue.Queue -> inference (works through
+            every frame in order; the backlog grows for as long as it runs)
+    latest  reader -> LatestFrame -> inference (src/ai/live.py; frames
+            arriving during inference replace each other)
+
+The camera is simulated: a thread stamping frames at --fps. Inference is
+a sleep of --infer ms. "age" is the time from capture to the start of
+inference on that frame; "dropped" are frames never analysed.
+
+Usage:
+    python benchmarks/bench_live.py --fps 25 --infer 120 --seconds 10
+    python benchmarks/bench_live.py --out live.json
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.ai.live import LatestFrame  # noqa: E402
+
+
+class FifoSlot:
+    """The pre-live way: every frame queued."""
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame, frame_idx, timestamp):
+        self.received += 1
+        self.queue.put((frame, frame_idx, timestamp))
+
+    def get(self, timeout=None):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.closed = True
+
+
+def run(slot, fps, infer_s, seconds):
+    stop = threading.Event()
+
+    def camera():
+        i, next_at = 0, time.monotonic()
+        while not stop.is_set():
+            slot.put(None, i, time.monotonic())
+            i += 1
+            next_at += 1.0 / fps
+            time.sleep(max(0.0, next_at - time.monotonic()))
+
+    reader = threading.Thread(target=camera, daemon=True)
+    reader.start()
+    ages, analysed = [], 0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        item = slot.get(timeout=1.0)
+        if item is None:
+            continue
+        ages.append(time.monotonic() - item[2])
+        analysed += 1
+        time.sleep(infer_s)
+    stop.set()
+    reader.join()
+    ages = np.array(ages) * 1000
+    return {
+        "analysed": analysed,
+        "dropped": slot.received - analysed,
+        "age_mean_ms": round(float(ages.mean()), 1),
+        "age_p95_ms": round(float(np.percentile(ages, 95)), 1),
+        "age_last_ms": round(float(ages[-1]), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live analysis staleness benchmark")
+    parser.add_argument("--fps", type=float, default=25.0, help="Camera frame rate")
+    parser.add_argument("--infer", type=float, default=120.0, help="Inference time per frame (ms)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    rows = []
+    for mode, slot in (("fifo", FifoSlot()), ("latest", LatestFrame())):
+        row = {"mode": mode, **run(slot, args.fps, args.infer / 1000.0, args.seconds)}
+        rows.append(row)
+
+    print(f"\n{args.fps:g} fps camera, {args.infer:g} ms inference, {args.seconds:g} s")
+    print(f"{'mode':<8} {'analysed':>9} {'dropped':>8} {'age mean':>10} {'age p95':>10} {'age last':>10}")
+    for r in rows:
+        print(f"{r['mode']:<8} {r['analysed']:>9} {r['dropped']:>8} {r['age_mean_ms']:>8.1f}ms "
+              f"{r['age_p95_ms']:>8.1f}ms {r['age_last_ms']:>8.1f}ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
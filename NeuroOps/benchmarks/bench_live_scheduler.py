@@ -0,0 +1,192 @@
+"""
+Cross-camera live inference: effective FPS and capture-to-result latency
+per camera priority as the number of cameras grows.
+
+Modes:
+    independent  every camera samples its own stream at --target fps and
+                 calls the shared detector itself (the batching server
+                 merges whatever requests happen to coincide, first come
+                 first served)
+    scheduled    LiveScheduler: one thread gathers the newest frame of the
+                 due cameras, priority first, runs one batch and degrades
+                 low-priority cameras when it falls behind
+
+Cameras are synthetic streams at --fps; a quarter are high priority, a
+quarter low, the rest normal. The post-detection pipeline is skipped, so
+only detection is measured. --simulate replaces YOLO with a sleep of
+"call_ms,per_image_ms" (e.g. 20,12) for machines without the weights.
+
+Usage:
+    python benchmarks/bench_live_scheduler.py --cameras 4 8 16 --model yolo26n.pt
+    python benchmarks/bench_live_scheduler.py --cameras 16 32 --simulate 20,12 --out live_sched.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.ai.live import LiveCamera, LiveScheduler  # noqa: E402
+from src.ai.model_registry import SharedDetector  # noqa: E402
+
+PRIORITIES = {3: "high", 2: "normal", 1: "low"}
+
+
+class SimulatedDetector:
+    """ObjectDetector stand-in whose batch costs call_ms + n * per_image_ms."""
+    def __init__(self, call_ms, per_image_ms):
+        self.call_s, self.image_s = call_ms / 1000.0, per_image_ms / 1000.0
+        self.model = None
+        self.backend = "simulated"
+
+    def predict(self, frames, imgsz=640, conf=0.25):
+        time.sleep(self.call_s + self.image_s * len(frames))
+        return [None] * len(frames)
+
+
+class NullAnalyzer:
+    def process(self, frame, frame_idx, timestamp, detection=None):
+        return {"detections": 0}
+
+
+class SyntheticStream(threading.Thread):
+    """Replaces a camera's StreamReader: the same frame, restamped at `fps`."""
+    def __init__(self, slot, fps, frame):
+        super().__init__(daemon=True)
+        self.slot, self.fps, self.frame = slot, fps, frame
+        self.is_running = True
+
+    def run(self):
+        i, next_at = 0, time.monotonic()
+        while self.is_running:
+            self.slot.put(self.frame, i, time.time())
+            i += 1
+            next_at += 1.0 / self.fps
+            time.sleep(max(0.0, next_at - time.monotonic()))
+
+    def stop(self):
+        self.is_running = False
+
+
+def make_cameras(n, target, fps, frame):
+    cameras = []
+    for i in range(n):
+        priority = 3 if i < n // 4 else 1 if i >= n - n // 4 else 2
+        cam = LiveCamera({"name": f"cam{i}", "url": "synthetic", "priority": priority}, fps=target,
+                         analyzer=NullAnalyzer(), log=lambda m: None)
+        cam.reader = SyntheticStream(cam.slot, fps, frame)
+        cameras.append(cam)
+    return cameras
+
+
+def run_independent(cameras, detector, seconds):
+    """Each camera samples and detects on its own: [(camera, fps, latencies)]."""
+    stop = threading.Event()
+    results = {}
+
+    def loop(cam):
+        latencies, done = [], 0
+        interval = 1.0 / cam.fps
+        while not stop.is_set():
+            started = time.monotonic()
+            item = cam.slot.get(timeout=0.5)
+            if item is None:
+                continue
+            detector.detect(item[0])
+            latencies.append(time.time() - item[2])
+            done += 1
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        results[cam.camera_name] = (done / seconds, latencies)
+
+    threads = [threading.Thread(target=loop, args=(cam,), daemon=True) for cam in cameras]
+    for cam in cameras:
+        cam.reader.start()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    for cam in cameras:
+        cam.reader.stop()
+    return [(cam, *results[cam.camera_name]) for cam in cameras], None
+
+
+def run_scheduled(cameras, detector, seconds):
+    scheduler = LiveScheduler(detector=detector, log=lambda m: None)
+    for cam in cameras:
+        cam.start()
+        scheduler.add(cam)
+    scheduler.start()
+    time.sleep(seconds)
+    rows = [(cam, cam.effective_fps(), list(cam.latencies)) for cam in cameras]
+    stats = scheduler.stats()
+    scheduler.stop()
+    for cam in cameras:
+        cam.stop()
+    scheduler.join()
+    return rows, stats
+
+
+def summarize(mode, n, rows, stats):
+    out = []
+    for priority, label in PRIORITIES.items():
+        group = [(fps, lat) for cam, fps, lat in rows if cam.priority == priority]
+        if not group:
+            continue
+        latencies = np.concatenate([lat for _, lat in group if lat] or [np.array([np.nan])]) * 1000
+        out.append({
+            "mode": mode, "cameras": n, "priority": label,
+            "fps": round(float(np.mean([fps for fps, _ in group])), 2),
+            "latency_ms": round(float(np.nanmean(latencies)), 1),
+            "latency_p95_ms": round(float(np.nanpercentile(latencies, 95)), 1),
+            "mean_batch": stats["mean_batch"] if stats else None,
+        })
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-camera live inference benchmark")
+    parser.add_argument("--cameras", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--fps", type=float, default=25.0, help="Camera frame rate")
+    parser.add_argument("--target", type=float, default=2.0, help="Analysis FPS per camera")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--model", default="yolo26n.pt")
+    parser.add_argument("--simulate", default=None, help="call_ms,per_image_ms instead of YOLO")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    if args.simulate:
+        base = SimulatedDetector(*map(float, args.simulate.split(",")))
+    else:
+        from src.ai.detector import ObjectDetector
+        base = ObjectDetector(args.model)
+    frame = (np.random.default_rng(0).random((360, 640, 3)) * 255).astype(np.uint8)
+
+    rows = []
+    for n in args.cameras:
+        for mode, run in (("independent", run_independent), ("scheduled", run_scheduled)):
+            detector = SharedDetector(base)
+            cam_rows, stats = run(make_cameras(n, args.target, args.fps, frame), detector, args.seconds)
+            rows += summarize(mode, n, cam_rows, stats)
+            print(f"[BENCH] {n} cameras, {mode} done", flush=True)
+
+    print(f"\n{args.fps:g} fps cameras, {args.target:g} fps target each, {args.seconds:g} s")
+    print(f"{'cameras':>7} {'mode':<12} {'priority':<8} {'fps':>6} {'latency':>10} {'p95':>10} {'batch':>6}")
+    for r in rows:
+        print(f"{r['cameras']:>7} {r['mode']:<12} {r['priority']:<8} {r['fps']:>6.2f} "
+              f"{r['latency_ms']:>8.1f}ms {r['latency_p95_ms']:>8.1f}ms {str(r['mean_batch'] or '-'):>6}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Model startup benchmark: cold vs warm artifact cache.
+
+Every measurement runs in a fresh interpreter (library imports are done
+before the clock starts) and times model construction plus the first
+inference call, which is where ultralytics fuses layers:
+    uncached  NEUROOPS_ARTIFACT_CACHE=0, original weights every time
+    cold      empty artifact directory: load + build the cached artifact
+    warm      artifact present: fused YOLO weights, memory-mapped state dicts,
+              local CLIP snapshot (median of --repeats runs)
+
+The OS page cache is not dropped between runs, so "warm" is what a worker
+restart sees, not a first boot after reboot.
+
+Usage:
+    python benchmarks/bench_model_load.py --detector yolo26n.pt --weights-dir weights
+    python benchmarks/bench_model_load.py --models detector clip --repeats 5 --out load.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+MODELS = ("detector", "biometrics", "clip")
+
+
+def child(args):
+    """Loads one model in this process and prints {"load_s", "first_call_s"}."""
+    import numpy as np
+    import torch  # noqa: F401  (import cost is not part of the measurement)
+
+    if args.child == "detector":
+        import torchvision, ultralytics  # noqa: F401
+        from src.ai.detector import ObjectDetector
+        t0 = time.perf_counter()
+        model = ObjectDetector(args.detector, backend="torch")
+        t1 = time.perf_counter()
+        model.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+    elif args.child == "biometrics":
+        import torchvision, ultralytics  # noqa: F401
+        from src.ai.biometrics.engine import BiometricEngine
+        t0 = time.perf_counter()
+        model = BiometricEngine(args.weights_dir, quantize=False)
+        t1 = time.perf_counter()
+        model.analyze_faces([np.zeros((256, 128, 3), dtype=np.uint8)])
+    else:
+        import sentence_transformers  # noqa: F401
+        from src.ai.embedder import ClipEmbedder
+        t0 = time.perf_counter()
+        model = ClipEmbedder(args.clip, quantize=False)
+        t1 = time.perf_counter()
+        model.embed_image(np.zeros((224, 224, 3), dtype=np.uint8))
+    t2 = time.perf_counter()
+    print(json.dumps({"load_s": t1 - t0, "first_call_s": t2 - t1}))
+
+
+def run_child(name, args, env):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", name,
+           "--detector", args.detector, "--weights-dir", args.weights_dir, "--clip", args.clip]
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+    if out.returncode != 0 or not lines:
+        raise RuntimeError(f"{name} failed:\n{out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm model load benchmark")
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=MODELS)
+    parser.add_argument("--detector", default="yolo26n.pt")
+    parser.add_argument("--weights-dir", default=os.path.join(ROOT, "weights"))
+    parser.add_argument("--clip", default="clip-ViT-B-32")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", type=str, default=None)
+    parser.add_argument("--child", choices=MODELS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="neuroops_artifacts_") as cache_dir:
+        base_env = dict(os.environ, NEUROOPS_ARTIFACT_DIR=cache_dir)
+        for name in args.models:
+            print(f"[BENCH] {name}...", flush=True)
+            try:
+                phases = {
+                    "uncached": [run_child(name, args, dict(base_env, NEUROOPS_ARTIFACT_CACHE="0"))
+                                 for _ in range(args.repeats)],
+                    "cold": [run_child(name, args, base_env)],
+                    "warm": [run_child(name, args, base_env) for _ in range(args.repeats)],
+                }
+            except RuntimeError as e:
+                print(f"[BENCH] skipping {name}: {e}")
+                continue
+            for phase, runs in phases.items():
+                rows.append({
+                    "model": name,
+                    "phase": phase,
+                    "load_s": round(statistics.median(r["load_s"] for r in runs), 3),
+                    "first_call_s": round(statistics.median(r["first_call_s"] for r in runs), 3),
+                })
+
+    header = ["model", "phase", "load_s", "first_call_s"]
+    print("\n" + " | ".join(f"{c:>12}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>12}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"repeats": args.repeats, "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Workbench playback pacing: the old sleep-based loop vs the presentation clock.
+
+Each mode plays the video for --seconds of wall time and reports:
+    speed       media seconds advanced per wall second (1.0 = real time)
+    drift_ms    |wall - media| time elapsed at the end, in ms
+    jitter_ms   std of each frame's presentation error against its due time
+    shown/dropped frames
+Modes:
+    legacy   decode, time.sleep(0.9 / fps), emit (the old VideoWorker loop)
+    clock    VideoWorker at 1x (monotonic clock vs PTS, late frames dropped)
+    scan2/4/8  VideoWorker fast scan (keyframes only)
+Without --video a synthetic 1080p clip is encoded first; on a slow machine
+that is also what shows frame dropping.
+
+Usage:
+    python benchmarks/bench_playback.py --video clip.mp4 --seconds 5
+    python benchmarks/bench_playback.py --out playback.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_thumbnails import synthetic_clip  # noqa: E402
+
+
+def summarize(name, shown, rate, dropped):
+    if len(shown) < 2:
+        return {"mode": name, "speed": 0.0, "drift_ms": 0.0, "jitter_ms": 0.0, "shown": len(shown), "dropped": dropped}
+    (w0, t0), (w1, t1) = shown[0], shown[-1]
+    errors = [(w - w0) - (t - t0) / rate for w, t in shown]
+    return {
+        "mode": name,
+        "speed": round((t1 - t0) / (w1 - w0), 3),
+        "drift_ms": round(abs(errors[-1]) * 1000, 1),
+        "jitter_ms": round(statistics.pstdev(errors) * 1000, 1),
+        "shown": len(shown),
+        "dropped": dropped,
+    }
+
+
+def legacy(video, seconds, index_dir):
+    from src.core.video.decoder import VideoDecoder
+    decoder = VideoDecoder(video, index_dir=index_dir)
+    shown = []
+    deadline = time.monotonic() + seconds
+    for image, timestamp in decoder.decode_frames():
+        time.sleep((1.0 / decoder.fps) * 0.9)
+        image.copy()  # the old loop handed the GUI a copied QImage
+        shown.append((time.monotonic(), timestamp))
+        if time.monotonic() >= deadline:
+            break
+    decoder.close()
+    return summarize("legacy", shown, 1.0, 0)
+
+
+def worker(video, seconds, rate, index_dir):
+    from PyQt6.QtCore import Qt
+    from src.core.video.worker import VideoWorker
+    w = VideoWorker(video, index_dir=index_dir)
+    shown = []
+    w.frame_ready.connect(lambda img, ts: shown.append((time.monotonic(), ts)), Qt.ConnectionType.DirectConnection)
+    thread = threading.Thread(target=w.run)
+    thread.start()
+    w.set_rate(rate)
+    w.play()
+    time.sleep(seconds)
+    w.stop()
+    thread.join()
+    # The first frame is shown before the worker switches rate; skip it
+    return summarize("clock" if rate == 1.0 else f"scan{int(rate)}", shown[1:], rate, w.dropped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Playback pacing benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "synthetic_1080p.mp4")
+            print("[BENCH] Encoding synthetic 1080p clip...", flush=True)
+            synthetic_clip(video, seconds=int(args.seconds * 8) + 2)
+
+        index_dir = os.path.join(tmp, "keyframes")
+        rows = [legacy(video, args.seconds, index_dir), worker(video, args.seconds, 1.0, index_dir)]
+        for rate in (2.0, 4.0, 8.0):
+            rows.append(worker(video, args.seconds, rate, index_dir))
+
+    header = ["mode", "speed", "drift_ms", "jitter_ms", "shown", "dropped"]
+    print("\n" + " | ".join(f"{c:>9}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>9}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"video": video, "seconds": args.seconds, "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
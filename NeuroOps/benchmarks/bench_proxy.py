@@ -0,0 +1,88 @@
+"""
+Workbench scrub cost on the original vs its low-resolution proxy.
+
+Each scrub seeks to a random timestamp and decodes to the exact frame,
+converted to RGB at the decoded size (what VideoWorker hands to the
+view). Proxies are built with transcode_proxy first, timed:
+    proxy      short GOP (12 frames)
+    intra      all-intra (gop 1)
+
+Without --video a synthetic 1080p clip (2 s GOP) is encoded to a temporary
+directory first.
+
+Usage:
+    python benchmarks/bench_proxy.py --video clip.mp4 --scrubs 50
+    python benchmarks/bench_proxy.py --height 360 --out proxy.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_thumbnails import synthetic_clip  # noqa: E402
+
+
+def scrub(path, targets):
+    import av
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        start = time.perf_counter()
+        for t in targets:
+            container.seek(int(t / stream.time_base), stream=stream)
+            for frame in container.decode(stream):
+                if frame.pts is not None and frame.pts * stream.time_base >= t - 1e-3:
+                    frame.to_ndarray(format="rgb24")
+                    break
+        return (time.perf_counter() - start) / len(targets) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy scrub benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--seconds", type=int, default=20, help="Synthetic clip length")
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--scrubs", type=int, default=30)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    from src.core.video.proxy import transcode_proxy, _duration
+    import av
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "clip.mp4")
+            print(f"Encoding a {args.seconds}s 1080p synthetic clip...")
+            synthetic_clip(video, seconds=args.seconds)
+        with av.open(video) as container:
+            duration = _duration(container)
+        targets = np.random.default_rng(0).uniform(0, max(0.0, duration - 0.5), args.scrubs)
+
+        rows = [{"source": "original", "build_s": 0.0, "mb": os.path.getsize(video) / 1e6,
+                 "scrub_ms": scrub(video, targets)}]
+        for name, gop in (("proxy", 12), ("intra", 1)):
+            out = os.path.join(tmp, f"{name}.mp4")
+            start = time.perf_counter()
+            transcode_proxy(video, out, height=args.height, gop=gop)
+            build = time.perf_counter() - start
+            rows.append({"source": name, "build_s": build, "mb": os.path.getsize(out) / 1e6,
+                         "scrub_ms": scrub(out, targets)})
+
+    print(f"{'source':<10}{'build s':>10}{'size MB':>10}{'scrub ms':>10}")
+    for r in rows:
+        print(f"{r['source']:<10}{r['build_s']:>10.1f}{r['mb']:>10.1f}{r['scrub_ms']:>10.1f}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"height": args.height, "scrubs": args.scrubs, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
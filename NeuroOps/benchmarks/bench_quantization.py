@@ -0,0 +1,131 @@
+"""
+INT8 accuracy/throughput check for the CPU embedding models.
+
+Embeds a fixed crop set with the float and the INT8 variant of each model
+and reports the cosine drift between the two embeddings (mean / p5 / min)
+next to crops-per-second for both. Crops come from --crops (a directory of
+images, BGR like the pipeline's person crops) or from a deterministic
+synthetic set. The INT8 artifacts are built on the first run and reused
+from weights/cache afterwards; load_s shows that difference.
+
+Usage:
+    python benchmarks/bench_quantization.py --crops path/to/face_crops
+    python benchmarks/bench_quantization.py --models adaface --weights weights --out int8.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def load_crops(crops_dir, n):
+    import cv2
+    if crops_dir:
+        names = sorted(f for f in os.listdir(crops_dir) if f.lower().endswith((".jpg", ".jpeg", ".png")))
+        crops = [cv2.imread(os.path.join(crops_dir, f)) for f in names[:n]]
+        return [c for c in crops if c is not None]
+    # Smooth gradients + blobs: closer to real crops than white noise
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:160, 0:128].astype(np.float32)
+    crops = []
+    for _ in range(n):
+        img = np.zeros((160, 128, 3), np.float32)
+        for c in range(3):
+            fx, fy, ph = rng.uniform(0.01, 0.08, 2).tolist() + [rng.uniform(0, 6.28)]
+            img[:, :, c] = 127 + 100 * np.sin(xx * fx + yy * fy + ph)
+        for _ in range(4):
+            cx, cy, r = rng.uniform(0, 128), rng.uniform(0, 160), rng.uniform(8, 30)
+            img[(xx - cx) ** 2 + (yy - cy) ** 2 < r * r] = rng.uniform(0, 255, 3)
+        crops.append(img.clip(0, 255).astype(np.uint8))
+    return crops
+
+
+def drift(float_vecs, int8_vecs):
+    a = np.asarray(float_vecs, dtype=np.float32)
+    b = np.asarray(int8_vecs, dtype=np.float32)
+    a /= np.linalg.norm(a, axis=1, keepdims=True) + 1e-12
+    b /= np.linalg.norm(b, axis=1, keepdims=True) + 1e-12
+    cos = (a * b).sum(1)
+    return {
+        "cos_mean": round(float(cos.mean()), 4),
+        "cos_p5": round(float(np.percentile(cos, 5)), 4),
+        "cos_min": round(float(cos.min()), 4),
+    }
+
+
+def timed_embed(fn, crops):
+    t0 = time.perf_counter()
+    out = [fn(c) for c in crops]
+    return out, len(crops) / (time.perf_counter() - t0)
+
+
+def bench_clip(crops):
+    from src.ai.embedder import ClipEmbedder
+
+    rows = {}
+    outs = {}
+    for quantize in (False, True):
+        t0 = time.perf_counter()
+        emb = ClipEmbedder(quantize=quantize)
+        load_s = time.perf_counter() - t0
+        fn = lambda c: emb.embed_image(c[:, :, ::-1].copy())  # crops are BGR, CLIP wants RGB
+        fn(crops[0])
+        outs[quantize], rate = timed_embed(fn, crops)
+        rows["int8" if quantize else "float"] = {"load_s": round(load_s, 3), "crops_per_s": round(rate, 2)}
+    return {"model": "clip", **rows, **drift(outs[False], outs[True])}
+
+
+def bench_adaface(crops, weights):
+    from src.ai.biometrics.engine import BiometricEngine
+
+    rows = {}
+    outs = {}
+    for quantize in (False, True):
+        t0 = time.perf_counter()
+        engine = BiometricEngine(weights_dir=weights, quantize=quantize)
+        load_s = time.perf_counter() - t0
+        if not engine.use_biometrics:
+            raise RuntimeError(f"AdaFace weights not found in {weights}")
+        fn = lambda c: engine.analyze_face(c)[2]
+        fn(crops[0])
+        outs[quantize], rate = timed_embed(fn, crops)
+        rows["int8" if quantize else "float"] = {"load_s": round(load_s, 3), "crops_per_s": round(rate, 2)}
+    return {"model": "adaface", **rows, **drift(outs[False], outs[True])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 quantization benchmark")
+    parser.add_argument("--crops", default=None, help="Directory of crop images")
+    parser.add_argument("--n", type=int, default=64)
+    parser.add_argument("--models", nargs="+", default=["clip", "adaface"], choices=["clip", "adaface"])
+    parser.add_argument("--weights", default=os.path.join(ROOT, "weights"))
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    crops = load_crops(args.crops, args.n)
+    print(f"[BENCH] {len(crops)} crops ({'from ' + args.crops if args.crops else 'synthetic'})", flush=True)
+
+    results = []
+    for model in args.models:
+        try:
+            row = bench_clip(crops) if model == "clip" else bench_adaface(crops, args.weights)
+        except Exception as e:
+            print(f"[BENCH] {model} failed: {e}")
+            continue
+        print(f"  {row}", flush=True)
+        results.append(row)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Seek latency and accuracy of the workbench decoder.
+
+Ground truth is the PTS of every frame from a full decode. For random
+targets the expected frame is the last one with pts <= target, and each
+mode is scored on exact hits and mean/max error in frames:
+    legacy    container.seek(backward) + first decoded frame (the old seek)
+    noindex   VideoDecoder.seek with use_index=False (decode forward only)
+    indexed   VideoDecoder.seek through the persisted keyframe index
+"step" repeats indexed seeks one frame forward at a time, the editor's
+frame-stepping pattern, which stays inside the GOP without re-seeking.
+
+Without --video, long-GOP (250 frame) H.264 and H.265 clips are encoded to a
+temporary directory first.
+
+Usage:
+    python benchmarks/bench_seek.py --video long_gop.mp4 --seeks 50
+    python benchmarks/bench_seek.py --seeks 30 --out seek.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def synthetic_clip(path, codec, frames=1500, gop=250, width=640, height=360, fps=25):
+    import av
+    container = av.open(path, "w")
+    stream = container.add_stream(codec, rate=fps)
+    stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+    if codec == "libx265":
+        stream.options = {"x265-params": f"keyint={gop}:min-keyint={gop}:bframes=3:log-level=error"}
+    else:
+        stream.options = {"g": str(gop), "bf": "3"}
+    for i in range(frames):
+        img = np.zeros((height, width, 3), dtype=np.uint8)
+        img[:, :, 1] = (i * 7) % 256
+        img[10:40, (i * 3) % (width - 40):(i * 3) % (width - 40) + 30] = 255
+        for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+
+
+def frame_pts(video):
+    import av
+    with av.open(video) as container:
+        return sorted(f.pts for f in container.decode(video=0) if f.pts is not None)
+
+
+def legacy_seek(decoder, timestamp):
+    """The previous VideoDecoder.seek: keyframe seek, first decoded frame."""
+    target = int(timestamp / decoder.time_base)
+    decoder.container.seek(target, stream=decoder.stream, any_frame=False, backward=True)
+    for packet in decoder.container.demux(decoder.stream):
+        for frame in packet.decode():
+            return frame.pts * decoder.time_base
+    return None
+
+
+def score(name, video, targets, all_pts, seek, index_dir):
+    from src.core.video.decoder import VideoDecoder
+
+    decoder = VideoDecoder(video, use_index=name != "noindex", index_dir=index_dir)
+    tb = decoder.time_base
+    latencies, errors = [], []
+    for t in targets:
+        t0 = time.perf_counter()
+        landed = seek(decoder, t)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        expected = all_pts[max(0, bisect_right(all_pts, int(round(t / tb))) - 1)]
+        got = int(round(landed / tb)) if landed is not None else all_pts[-1]
+        errors.append(abs(bisect_right(all_pts, got) - bisect_right(all_pts, expected)))
+    decoder.close()
+    return {
+        "mode": name,
+        "median_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "exact": f"{sum(e == 0 for e in errors)}/{len(errors)}",
+        "mean_err_frames": round(float(np.mean(errors)), 2),
+        "max_err_frames": int(max(errors)),
+    }
+
+
+def bench_video(video, n_seeks, seed, index_dir):
+    from src.core.video.keyframe_index import KeyframeIndex
+
+    all_pts = frame_pts(video)
+    import av
+    with av.open(video) as container:
+        tb = float(container.streams.video[0].time_base)
+    t0 = time.perf_counter()
+    index = KeyframeIndex.load_or_build(video, index_dir)
+    build_ms = (time.perf_counter() - t0) * 1000
+    print(f"[BENCH] {os.path.basename(video)}: {len(all_pts)} frames, {len(index.pts)} keyframes, "
+          f"index built in {build_ms:.1f} ms", flush=True)
+
+    rng = random.Random(seed)
+    duration = (all_pts[-1] - all_pts[0]) * tb
+    targets = [all_pts[0] * tb + rng.random() * duration for _ in range(n_seeks)]
+    step_start = all_pts[len(all_pts) // 3]
+    steps = [p * tb for p in all_pts[len(all_pts) // 3:len(all_pts) // 3 + n_seeks]]
+
+    def seek(decoder, t):
+        return decoder.seek(t)
+
+    def step(decoder, t):
+        landed = decoder.seek(t)
+        next(decoder.decode_frames())  # show the frame, as the editor does
+        return landed
+
+    rows = [
+        score("legacy", video, targets, all_pts, legacy_seek, index_dir),
+        score("noindex", video, targets, all_pts, seek, index_dir),
+        score("indexed", video, targets, all_pts, seek, index_dir),
+        score("step", video, [step_start * tb] + steps, all_pts, step, index_dir),
+    ]
+    for r in rows:
+        r["video"] = os.path.basename(video)
+    return rows, build_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seek latency/accuracy benchmark")
+    parser.add_argument("--video", nargs="*", default=None)
+    parser.add_argument("--seeks", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = os.path.join(tmp, "keyframes")
+        videos = args.video
+        if not videos:
+            videos = []
+            for codec, name in (("libx264", "h264_gop250.mp4"), ("libx265", "hevc_gop250.mp4")):
+                path = os.path.join(tmp, name)
+                print(f"[BENCH] Encoding {name}...", flush=True)
+                synthetic_clip(path, codec)
+                videos.append(path)
+
+        rows, builds = [], {}
+        for video in videos:
+            video_rows, builds[os.path.basename(video)] = bench_video(video, args.seeks, args.seed, index_dir)
+            rows.extend(video_rows)
+
+    header = ["video", "mode", "median_ms", "p95_ms", "exact", "mean_err_frames", "max_err_frames"]
+    print("\n" + " | ".join(f"{c:>15}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>15}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"index_build_ms": builds, "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
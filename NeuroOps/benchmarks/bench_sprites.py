@@ -0,0 +1,123 @@
+"""
+Thumbnail sprite atlas: ingest cost and interaction-time reads.
+
+Builds the atlas for a video (the ingest stage), then times what the UI
+pays when it opens:
+    strip     a 20-slot filmstrip window around a random time
+    results   one thumbnail for each of --results random search hits
+through three sources:
+    decode    keyframe_thumbnails, what an uncached filmstrip decodes
+    atlas     SpriteAtlas.load + tiles, sheets read from disk
+    warm      the same with the process-wide sheet cache already holding them
+Without --video a synthetic 720p clip of --seconds is encoded first.
+
+Usage:
+    python benchmarks/bench_sprites.py --video long.mp4 --trials 10
+    python benchmarks/bench_sprites.py --seconds 600 --out sprites.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def synthetic_clip(path, seconds=300, fps=25, gop=50, width=1280, height=720):
+    import av
+    container = av.open(path, "w")
+    stream = container.add_stream("h264", rate=fps)
+    stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+    stream.options = {"g": str(gop), "preset": "ultrafast"}
+    rng = np.random.default_rng(0)
+    base = (rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8)
+    base = np.kron(base, np.ones((8, 8, 1), dtype=np.uint8))
+    for i in range(seconds * fps):
+        img = np.roll(base, 4 * i, axis=1)
+        for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprite atlas benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--seconds", type=int, default=300, help="Length of the synthetic clip")
+    parser.add_argument("--results", type=int, default=12)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841
+    from src.core.video import sprites
+    from src.core.video.sprites import SpriteAtlas
+    from src.core.video.thumbnails import keyframe_thumbnails
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "synthetic_720p.mp4")
+            print(f"[BENCH] Encoding {args.seconds}s synthetic 720p clip...", flush=True)
+            synthetic_clip(video, seconds=args.seconds)
+        sprite_dir, index_dir = os.path.join(tmp, "sprites"), os.path.join(tmp, "keyframes")
+
+        t0 = time.perf_counter()
+        atlas = SpriteAtlas.build(video, sprite_dir=sprite_dir, index_dir=index_dir)
+        build_s = time.perf_counter() - t0
+        size_kb = sum(os.path.getsize(os.path.join(atlas.dir, n)) for n in atlas.sheets) / 1024
+        print(f"[BENCH] Atlas: {atlas.count} thumbnails, {len(atlas.sheets)} sheets, "
+              f"{size_kb:.0f} KB, built in {build_s:.1f} s", flush=True)
+
+        rng = random.Random(args.seed)
+        span = max(atlas.duration - 20.0, 0.0)
+        strips = [[float(t) + s for s in range(20)] for t in (rng.random() * span for _ in range(args.trials))]
+        pages = [[rng.random() * atlas.duration for _ in range(args.results)] for _ in range(args.trials)]
+
+        def decode(times):
+            return sum(1 for _ in keyframe_thumbnails(video, times, 160, 90, index_dir))
+
+        def from_atlas(times, warm=False):
+            if not warm:
+                sprites._SHEETS.clear()
+            loaded = SpriteAtlas.load(video, sprite_dir)
+            return sum(1 for t in times if not loaded.thumbnail_at(t).isNull())
+
+        rows = []
+        for workload, batches in (("strip", strips), ("results", pages)):
+            for source, fetch in (("decode", decode), ("atlas", from_atlas),
+                                  ("warm", lambda times: from_atlas(times, warm=True))):
+                times_ms = []
+                for batch in batches:
+                    t0 = time.perf_counter()
+                    fetch(batch)
+                    times_ms.append((time.perf_counter() - t0) * 1000)
+                rows.append({"workload": workload, "source": source, "thumbs": len(batches[0]),
+                             "median_ms": round(statistics.median(times_ms), 1),
+                             "max_ms": round(max(times_ms), 1)})
+
+    header = ["workload", "source", "thumbs", "median_ms", "max_ms"]
+    print("\n" + " | ".join(f"{c:>10}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>10}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"video": video, "build_s": round(build_s, 2), "thumbnails": atlas.count,
+                       "sheets": len(atlas.sheets), "atlas_kb": round(size_kb), "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Stream reading: how fast a reader can get through a stream, i.e. how much
+headroom it has before it falls behind a live camera.
+
+Modes:
+    read   cap.read() of every frame (the old VideoThread / StreamReader:
+           every frame decoded and converted to BGR)
+    grab   StreamReader's draining: cap.grab() of every frame, retrieve()
+           only --max-fps of them per second of video
+
+The file is read as fast as possible. "x realtime" is the reading speed
+over the clip's frame rate: below 1 the reader lags behind a live camera
+and its frames get older every second.
+
+Without --video a synthetic 1080p clip (25 fps) is encoded to a temporary
+directory first.
+
+Usage:
+    python benchmarks/bench_stream.py --video camera_dump.mp4 --max-fps 5
+    python benchmarks/bench_stream.py --seconds 20 --out stream.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.bench_thumbnails import synthetic_clip  # noqa: E402
+
+
+def read_all(video, mode, max_fps):
+    import cv2
+    cap = cv2.VideoCapture(video)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    every = max(1, round(fps / max_fps)) if max_fps else 1
+    frames = converted = 0
+    t0 = time.perf_counter()
+    while True:
+        if mode == "read":
+            ok, _ = cap.read()
+            converted += ok
+        else:
+            ok = cap.grab()
+            if ok and frames % every == 0:
+                converted += cap.retrieve()[0]
+        if not ok:
+            break
+        frames += 1
+    elapsed = time.perf_counter() - t0
+    cap.release()
+    return {
+        "mode": mode,
+        "frames": frames,
+        "converted": converted,
+        "ms_per_frame": round(1000 * elapsed / max(1, frames), 2),
+        "x_realtime": round(frames / elapsed / fps, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream reading benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--seconds", type=int, default=20, help="Synthetic clip length")
+    parser.add_argument("--max-fps", type=float, default=5.0, help="Frames converted per second of video")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "clip.mp4")
+            print(f"Encoding a {args.seconds}s 1080p synthetic clip...")
+            synthetic_clip(video, seconds=args.seconds)
+        rows = [read_all(video, mode, args.max_fps) for mode in ("read", "grab")]
+
+    print(f"\n{'mode':<6} {'frames':>7} {'converted':>10} {'ms/frame':>9} {'x realtime':>11}")
+    for r in rows:
+        print(f"{r['mode']:<6} {r['frames']:>7} {r['converted']:>10} {r['ms_per_frame']:>9.2f} {r['x_realtime']:>11.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
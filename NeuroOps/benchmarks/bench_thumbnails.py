@@ -0,0 +1,128 @@
+"""
+Filmstrip thumbnail extraction time for one strip (one slot per second).
+
+Modes:
+    legacy    container.seek + full decode of the first frame + PIL resize
+              per slot (the old ThumbnailWorker)
+    keyframe  ThumbnailWorker with an empty disk cache: keyframe-only
+              decode (skip_frame='NONKEY') scaled by swscale, saved as JPEG
+    cached    ThumbnailWorker again, every slot loaded from the disk cache
+
+Without --video a synthetic 1080p clip (2 s GOP) is encoded to a temporary
+directory first.
+
+Usage:
+    python benchmarks/bench_thumbnails.py --video clip.mp4 --slots 60
+    python benchmarks/bench_thumbnails.py --out thumbnails.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+
+def synthetic_clip(path, seconds=60, fps=25, gop=50, width=1920, height=1080):
+    import av
+    container = av.open(path, "w")
+    stream = container.add_stream("h264", rate=fps)
+    stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+    stream.options = {"g": str(gop), "preset": "ultrafast"}
+    rng = np.random.default_rng(0)
+    base = (rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8)
+    base = np.kron(base, np.ones((8, 8, 1), dtype=np.uint8))
+    for i in range(seconds * fps):
+        img = np.roll(base, 4 * i, axis=1)
+        for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+
+
+def legacy_strip(video, slots, width, height):
+    import av
+    from PyQt6.QtGui import QImage
+    container = av.open(video)
+    stream = container.streams.video[0]
+    stream.thread_type = 'AUTO'
+    done = 0
+    for time_sec in np.arange(0.0, float(slots), 1.0):
+        container.seek(int(time_sec / stream.time_base), stream=stream)
+        for frame in container.decode(stream):
+            img = frame.to_image().resize((width, height))
+            QImage(img.tobytes("raw", "RGB"), img.width, img.height, QImage.Format.Format_RGB888)
+            done += 1
+            break
+    container.close()
+    return done
+
+
+def worker_strip(video, slots, width, height, thumb_dir, index_dir):
+    from PyQt6.QtCore import Qt
+    from src.ui.workbench.filmstrip import ThumbnailWorker
+    got = []
+    worker = ThumbnailWorker(video, start_time=0.0, end_time=float(slots), width=width, height=height,
+                             thumb_dir=thumb_dir, index_dir=index_dir)
+    worker.thumbnail_ready.connect(lambda i, img: got.append(i), Qt.ConnectionType.DirectConnection)
+    worker.run()
+    return len(got)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filmstrip thumbnail benchmark")
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--slots", type=int, default=30)
+    parser.add_argument("--size", default="160x90")
+    parser.add_argument("--out", type=str, default=None)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841  (QImage.save needs it)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video
+        if video is None:
+            video = os.path.join(tmp, "synthetic_1080p.mp4")
+            print("[BENCH] Encoding synthetic 1080p clip...", flush=True)
+            synthetic_clip(video, seconds=max(args.slots, 1))
+        thumb_dir, index_dir = os.path.join(tmp, "thumbs"), os.path.join(tmp, "keyframes")
+
+        modes = [
+            ("legacy", lambda: legacy_strip(video, args.slots, width, height)),
+            ("keyframe", lambda: worker_strip(video, args.slots, width, height, thumb_dir, index_dir)),
+            ("cached", lambda: worker_strip(video, args.slots, width, height, thumb_dir, index_dir)),
+        ]
+        rows = []
+        for name, strip in modes:
+            t0 = time.perf_counter()
+            count = strip()
+            elapsed = (time.perf_counter() - t0) * 1000
+            rows.append({"mode": name, "thumbs": count, "total_ms": round(elapsed, 1),
+                         "ms_per_thumb": round(elapsed / max(count, 1), 2)})
+
+    legacy_ms = rows[0]["total_ms"]
+    for r in rows:
+        r["speedup"] = round(legacy_ms / r["total_ms"], 1) if r["total_ms"] else 0.0
+
+    header = ["mode", "thumbs", "total_ms", "ms_per_thumb", "speedup"]
+    print("\n" + " | ".join(f"{c:>12}" for c in header))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>12}" for c in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"video": video, "slots": args.slots, "size": args.size, "results": rows}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
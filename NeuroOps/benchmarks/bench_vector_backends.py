@@ -0,0 +1,136 @@
+"""
+Compares the vector store backends (qdrant local mode vs the flat NumPy index)
+on synthetic 512-d collections.
+
+For every (backend, size) pair a fresh subprocess builds the collection in a
+temporary directory, so resident memory is measured without interference
+from the other runs.
+
+Usage:
+    python benchmarks/bench_vector_backends.py
+    python benchmarks/bench_vector_backends.py --sizes 10000 100000 --backends flat
+    python benchmarks/bench_vector_backends.py --out bench_backends.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import synthetic
+
+DIM = 512
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def make_backend(kind, path, dtype):
+    from src.data.vector_store import QdrantBackend, FlatBackend
+
+    if kind == "qdrant":
+        from qdrant_client import QdrantClient
+        return QdrantBackend(client=QdrantClient(path=path))
+    return FlatBackend(path=path, dtype=dtype)
+
+
+def run_single(kind, size, n_queries, k, batch, dtype):
+    """Builds one collection and measures it. Runs inside the worker subprocess."""
+    collection = "neuroops_bench"
+    with tempfile.TemporaryDirectory(prefix=f"neuroops_{kind}_") as path:
+        backend = make_backend(kind, path, dtype)
+        backend.ensure_collection(collection, DIM)
+        rss_before = rss_mb()
+
+        t0 = time.perf_counter()
+        for start, vecs in synthetic.vector_chunks(size, dim=DIM, chunk=batch):
+            ids = [str(uuid.UUID(int=row)) for row in range(start, start + len(vecs))]
+            backend.upsert(collection, ids, vecs, synthetic.payloads(start, len(vecs)))
+        backend.flush(collection)
+        build_s = time.perf_counter() - t0
+
+        q = synthetic.queries(n_queries, dim=DIM)
+        truth = synthetic.brute_force_topk(size, q, k, dim=DIM)
+
+        latencies = []
+        recalls = []
+        for i, qv in enumerate(q):
+            t0 = time.perf_counter()
+            hits = backend.search(collection, qv, limit=k)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            found = {uuid.UUID(str(h.id)).int for h in hits}
+            recalls.append(len(found & set(truth[i].tolist())) / float(k))
+
+        return {
+            "backend": kind if kind != "flat" else f"flat-{dtype}",
+            "size": size,
+            "build_s": round(build_s, 3),
+            "insert_per_s": round(size / build_s, 1) if build_s > 0 else None,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+            "rss_mb": round(rss_mb() - rss_before, 1),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vector backend comparison")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--backends", nargs="+", default=["qdrant", "flat"], choices=["qdrant", "flat"])
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float16"], help="Flat index storage type")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=1000, help="Rows per upsert call")
+    parser.add_argument("--out", type=str, default=None, help="Write results as JSON")
+    parser.add_argument("--worker", nargs=2, metavar=("BACKEND", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        kind, size = args.worker[0], int(args.worker[1])
+        print(json.dumps(run_single(kind, size, args.queries, args.k, args.batch, args.dtype)))
+        return
+
+    results = []
+    for size in args.sizes:
+        for kind in args.backends:
+            print(f"[BENCH] {kind} @ {size} vectors...", flush=True)
+            cmd = [sys.executable, os.path.abspath(__file__), "--worker", kind, str(size),
+                   "--queries", str(args.queries), "--k", str(args.k),
+                   "--batch", str(args.batch), "--dtype", args.dtype]
+            proc = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
+            if proc.returncode != 0:
+                print(f"[BENCH] {kind} @ {size} failed:\n{proc.stderr}")
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    header = ["backend", "size", "insert_per_s", "p50_ms", "p95_ms", f"recall@{args.k}", "rss_mb"]
+    print("\n" + " | ".join(f"{h:>14}" for h in header))
+    for r in results:
+        print(" | ".join(f"{str(r.get(h)):>14}" for h in header))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+VectorStore scaling benchmark.
+
+Fills fresh collections with synthetic 512-d vectors and detection payloads
+through VectorStore.add_embeddings_batch, then measures:
+    - insert throughput (vectors/s)
+    - VectorStore.search latency (p50/p95/p99)
+    - recall@k against brute force
+    - on-disk size of the collection
+
+Everything runs offline against a temporary local storage directory.
+
+Usage:
+    python benchmarks/bench_vector_search.py run --out before.json
+    python benchmarks/bench_vector_search.py run --sizes 1000 10000 --backend flat --out after.json
+    python benchmarks/bench_vector_search.py compare before.json after.json --tolerance 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import synthetic
+from benchmarks.bench_vector_backends import make_backend
+
+DIM = 512
+
+# metric -> True if higher is better
+METRICS = {
+    "insert_per_s": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "recall": True,
+    "disk_mb": False,
+}
+
+
+def dir_size_mb(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total / (1024.0 * 1024.0)
+
+
+def bench_size(backend_kind, size, n_queries, k, batch, dtype):
+    from src.data.vector_store import VectorStore
+
+    with tempfile.TemporaryDirectory(prefix="neuroops_bench_") as path:
+        store = VectorStore(collection_suffix="bench", backend=make_backend(backend_kind, path, dtype))
+
+        insert_s = 0.0
+        row_of = {}
+        for start, vecs in synthetic.vector_chunks(size, dim=DIM, chunk=batch):
+            payloads = synthetic.payloads(start, len(vecs))
+            for i, payload in enumerate(payloads):
+                payload["bench_row"] = start + i
+            items = list(zip([v.tolist() for v in vecs], payloads))
+            t0 = time.perf_counter()
+            store.add_embeddings_batch(items)
+            insert_s += time.perf_counter() - t0
+        store.flush()
+
+        q = synthetic.queries(n_queries, dim=DIM)
+        truth = synthetic.brute_force_topk(size, q, k, dim=DIM)
+
+        # Warm-up so one-off index loading isn't counted as query latency
+        store.search(q[0].tolist(), limit=k, score_threshold=None)
+
+        latencies = []
+        recalls = []
+        for i, qv in enumerate(q):
+            t0 = time.perf_counter()
+            hits = store.search(qv.tolist(), limit=k, score_threshold=None)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            found = {h.payload.get("bench_row") for h in hits}
+            recalls.append(len(found & set(truth[i].tolist())) / float(k))
+
+        return {
+            "size": size,
+            "insert_per_s": round(size / insert_s, 1) if insert_s > 0 else None,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            "recall": round(float(np.mean(recalls)), 4),
+            "disk_mb": round(dir_size_mb(path), 2),
+        }
+
+
+def run(args):
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "backend": args.backend if args.backend != "flat" else f"flat-{args.dtype}",
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "k": args.k,
+        "queries": args.queries,
+        "batch": args.batch,
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"[BENCH] {report['backend']} @ {size} vectors...", flush=True)
+        result = bench_size(args.backend, size, args.queries, args.k, args.batch, args.dtype)
+        print(f"        {result}", flush=True)
+        report["results"].append(result)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return 0
+
+
+def compare(args):
+    """Flags every metric that got worse by more than the tolerance. Returns 1 on regression."""
+    with open(args.baseline) as f:
+        base = json.load(f)
+    with open(args.candidate) as f:
+        cand = json.load(f)
+
+    base_by_size = {r["size"]: r for r in base["results"]}
+    regressions = 0
+    print(f"Baseline:  {args.baseline} ({base.get('backend')}, {base.get('created')})")
+    print(f"Candidate: {args.candidate} ({cand.get('backend')}, {cand.get('created')})\n")
+    print(f"{'size':>9} {'metric':>13} {'baseline':>12} {'candidate':>12} {'change':>9}")
+
+    for r in cand["results"]:
+        b = base_by_size.get(r["size"])
+        if b is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = b.get(metric), r.get(metric)
+            if old is None or new is None:
+                continue
+            if metric == "recall":
+                # Absolute drop; recall lives in [0, 1]
+                change = new - old
+                worse = change < -args.recall_tolerance
+                change_str = f"{change:+.4f}"
+            else:
+                change = (new - old) / old if old else 0.0
+                worse = (change < -args.tolerance) if higher_is_better else (change > args.tolerance)
+                change_str = f"{change * 100:+.1f}%"
+            flag = "  REGRESSION" if worse else ""
+            regressions += int(worse)
+            print(f"{r['size']:>9} {metric:>13} {old:>12} {new:>12} {change_str:>9}{flag}")
+
+    print(f"\n{regressions} regression(s) beyond tolerance.")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VectorStore search benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the benchmark and write a JSON report")
+    p_run.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    p_run.add_argument("--backend", default="qdrant", choices=["qdrant", "flat"])
+    p_run.add_argument("--dtype", default="float32", choices=["float32", "float16"], help="Flat index storage type")
+    p_run.add_argument("--queries", type=int, default=200)
+    p_run.add_argument("--k", type=int, default=10)
+    p_run.add_argument("--batch", type=int, default=256, help="Items per add_embeddings_batch call")
+    p_run.add_argument("--out", type=str, default="bench_vector_search.json")
+
+    p_cmp = sub.add_parser("compare", help="Compare two reports and flag regressions")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("candidate")
+    p_cmp.add_argument("--tolerance", type=float, default=0.10, help="Relative change allowed for throughput/latency/size")
+    p_cmp.add_argument("--recall-tolerance", type=float, default=0.01, help="Absolute recall drop allowed")
+
+    args = parser.parse_args()
+    sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
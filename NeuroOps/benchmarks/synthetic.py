@@ -0,0 +1,86 @@
+"""
+Deterministic synthetic collections for the benchmarks.
+
+Vectors are drawn around a fixed set of cluster centers so that nearest
+neighbours are meaningful (uniform random 512-d vectors are all roughly
+orthogonal and make recall numbers useless). Every chunk is regenerated
+from (seed, chunk index), so a million-vector collection never has to sit
+in memory at once.
+"""
+import numpy as np
+
+CLASSES = ["person", "car", "bicycle", "truck", "bus", "motorcycle", "dog", "backpack"]
+
+
+def _centers(dim, n_clusters, seed):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    return centers / np.linalg.norm(centers, axis=1, keepdims=True)
+
+
+BLOCK = 1024
+
+
+def _block(b, centers, dim, seed, noise):
+    """Rows [b * BLOCK, (b + 1) * BLOCK), independent of how callers chunk them."""
+    rng = np.random.default_rng((seed, b))
+    labels = rng.integers(0, len(centers), BLOCK)
+    vecs = centers[labels] + noise * rng.standard_normal((BLOCK, dim)).astype(np.float32) / np.sqrt(dim)
+    return vecs.astype(np.float32)
+
+
+def vector_chunks(n, dim=512, seed=0, chunk=10000, n_clusters=256, noise=0.35):
+    """Yields (start_row, vectors[float32, chunk x dim]) until n rows are produced."""
+    centers = _centers(dim, n_clusters, seed)
+    cache = {}
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        parts = []
+        for b in range(start // BLOCK, (stop - 1) // BLOCK + 1):
+            if b not in cache:
+                cache.clear()
+                cache[b] = _block(b, centers, dim, seed, noise)
+            lo = max(start - b * BLOCK, 0)
+            hi = min(stop - b * BLOCK, BLOCK)
+            parts.append(cache[b][lo:hi])
+        yield start, np.concatenate(parts)
+
+
+def payloads(start, rows, n_videos=20, fps=30.0):
+    """Detection-style payloads matching what VideoAnalysisWorker writes."""
+    out = []
+    for row in range(start, start + rows):
+        frame_idx = (row // len(CLASSES)) * 15
+        out.append({
+            "video_id": row % n_videos,
+            "frame_idx": frame_idx,
+            "class_name": CLASSES[row % len(CLASSES)],
+            "confidence": 0.4 + (row % 60) / 100.0,
+            "timestamp": frame_idx / fps,
+        })
+    return out
+
+
+def queries(n_queries, dim=512, seed=0, n_clusters=256, noise=0.35):
+    centers = _centers(dim, n_clusters, seed)
+    rng = np.random.default_rng((seed, 7919, n_queries))
+    labels = rng.integers(0, n_clusters, n_queries)
+    q = centers[labels] + noise * rng.standard_normal((n_queries, dim)).astype(np.float32) / np.sqrt(dim)
+    return q.astype(np.float32)
+
+
+def brute_force_topk(n, query_vectors, k, dim=512, seed=0, chunk=10000):
+    """Exact top-k row indices for every query, streamed over the synthetic chunks."""
+    q = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    best_scores = np.full((len(q), 0), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(q), 0), dtype=np.int64)
+    for start, vecs in vector_chunks(n, dim=dim, seed=seed, chunk=chunk):
+        vecs = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+        scores = q @ vecs.T
+        rows = np.broadcast_to(np.arange(start, start + len(vecs)), scores.shape)
+        all_scores = np.concatenate([best_scores, scores], axis=1)
+        all_rows = np.concatenate([best_rows, rows], axis=1)
+        keep = np.argsort(-all_scores, axis=1)[:, :k]
+        best_scores = np.take_along_axis(all_scores, keep, axis=1)
+        best_rows = np.take_along_axis(all_rows, keep, axis=1)
+    return best_rows
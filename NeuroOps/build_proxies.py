@@ -0,0 +1,46 @@
+"""
+Builds low-resolution workbench proxies (database/proxies) for every
+ingested video that doesn't have a valid one yet. New ingests get theirs
+after analysis; this backfills the rest. Exports always cut the originals.
+
+Usage:
+    python build_proxies.py                  # $NEUROOPS_PROXY_HEIGHT (480), half the cores
+    python build_proxies.py --height 360 --workers 4
+    python build_proxies.py --all-intra      # every frame a keyframe: instant scrubbing, bigger files
+"""
+import argparse
+import os
+
+from src.core.video.proxy import build_proxies
+from src.data.db_manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workbench proxy generation")
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--all-intra", action="store_true")
+    args = parser.parse_args()
+
+    paths = [p for p in DatabaseManager().get_all_paths() if os.path.exists(p)]
+    print(f"{len(paths)} videos on disk.")
+    shown = {}
+
+    def progress(path, fraction):
+        step = int(fraction * 10)
+        if shown.get(path) != step:
+            shown[path] = step
+            print(f"  {os.path.basename(path)}: {fraction:.0%}")
+
+    status = build_proxies(paths, height=args.height, gop=1 if args.all_intra else 12,
+                           workers=args.workers, progress=progress)
+    for path, s in status.items():
+        if s.startswith("error"):
+            print(f"  {os.path.basename(path)}: {s}")
+    built = sum(1 for s in status.values() if s == "built")
+    skipped = sum(1 for s in status.values() if s == "skipped")
+    print(f"Built {built}, skipped {skipped} (valid proxy or already small), failed {len(status) - built - skipped}.")
+
+
+if __name__ == "__main__":
+    main()
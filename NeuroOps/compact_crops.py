@@ -0,0 +1,61 @@
+"""
+Compacts the detection crop store (database/crops): removes crops no
+vector point references anymore (e.g. after force_clear.py or re-ingesting
+a video), leftover temp files and empty shards, then evicts least recently
+used crops down to the budget.
+
+Safe to run next to a live ingest: unreferenced crops and temp files
+touched within the grace period (default 60 minutes) are left alone, since
+the ingest writes a crop before it upserts the point that references it.
+
+Usage:
+    python compact_crops.py                 # budget from $NEUROOPS_CROP_STORE_MB
+    python compact_crops.py --max-mb 500
+    python compact_crops.py --keep-unreferenced
+    python compact_crops.py --grace-minutes 0   # offline: nothing is ingesting
+"""
+import argparse
+
+from src.data.crop_store import CropStore, get_crop_store
+from src.data.vector_store import get_backend
+
+
+def referenced_crops(backend):
+    keys = set()
+    for name in backend.list_collections():
+        if not name.startswith("neuroops"):
+            continue
+        for point in backend.scroll(name):
+            key = (point.payload or {}).get("crop")
+            if key:
+                keys.add(key)
+    return keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop store compaction")
+    parser.add_argument("--max-mb", type=float, default=None)
+    parser.add_argument("--keep-unreferenced", action="store_true",
+                        help="Skip the vector store scan; only evict to the budget")
+    parser.add_argument("--grace-minutes", type=float, default=60,
+                        help="Keep unreferenced crops and temp files newer than this")
+    args = parser.parse_args()
+
+    store = get_crop_store()
+    if args.max_mb is not None:
+        store = CropStore(store.root, max_mb=args.max_mb)
+
+    referenced = None
+    if not args.keep_unreferenced:
+        print("Collecting crop references from the vector store...")
+        referenced = referenced_crops(get_backend())
+        print(f"{len(referenced)} referenced crops.")
+
+    stats = store.compact(referenced, grace=args.grace_minutes * 60)
+    print(f"Removed {stats['unreferenced']} unreferenced, {stats['evicted']} evicted (LRU), "
+          f"{stats['temp']} temp files, {stats['dirs']} empty shards.")
+    print(f"Store: {stats['crops']} crops, {stats['mb']} MB of {store.max_bytes / (1024 * 1024):.0f} MB.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import hashlib
+import os
+
+# <project>/weights/cache — derived/compiled model artifacts live here
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARTIFACT_DIR = os.path.join(_base_dir, "weights", "cache")
+
+
+def file_hash(path, length=12):
+    """Short sha1 of a file's contents, used to key exported artifacts."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:length]
+
+
+def text_hash(text, length=12):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:length]
+
+
+def file_key(path, length=12):
+    """
+    Cheap key for a source file (path, size, mtime). Hashing a large
+    checkpoint on every startup would cost what the load cache saves.
+    """
+    st = os.stat(path)
+    return text_hash(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}", length)
+
+
+def cache_enabled():
+    """$NEUROOPS_ARTIFACT_CACHE=0 loads every model from its original weights."""
+    return os.environ.get("NEUROOPS_ARTIFACT_CACHE", "1") != "0"
+
+
+def artifact_dir():
+    return os.environ.get("NEUROOPS_ARTIFACT_DIR") or ARTIFACT_DIR
+
+
+def artifact_path(name, key, suffix):
+    """weights/cache/<name>.<key><suffix>, creating the cache directory if needed."""
+    cache_dir = artifact_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{name}.{key}{suffix}")
+
+
+def save_atomic(obj, path):
+    import torch
+    tmp = path + ".tmp"
+    torch.save(obj, tmp)
+    os.replace(tmp, path)
+
+
+def cached_state_dict(name, source_path, build):
+    """
+    Ready-to-load state dict for a checkpoint. The first call runs build()
+    (torch.load + key cleanup) and saves the result under weights/cache;
+    later calls memory-map that file, so tensors are paged in on demand
+    instead of being read and copied up front. Use with
+    load_state_dict(..., assign=True) to keep the mapped storage.
+    """
+    import torch
+    if not cache_enabled():
+        return build()
+    path = artifact_path(name, text_hash(f"{file_key(source_path)}|{torch.__version__}"), ".state.pt")
+    if os.path.exists(path):
+        return torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    state_dict = build()
+    save_atomic(state_dict, path)
+    print(f"[ARTIFACTS] Cached {name} weights at {path}")
+    return state_dict
+
+
+def build_loaded(build, state_dict):
+    """
+    build() with `state_dict` adopted as its weights (assign=True, so
+    memory-mapped tensors stay mapped), skipping the random init a large
+    backbone would spend before being overwritten: the module is built on
+    the meta device, which is thread-local, unlike patching torch.nn.init.
+    Falls back to a normal build if the state dict leaves a tensor unset.
+    """
+    import torch
+    with torch.device("meta"):
+        module = build()
+    module.load_state_dict(state_dict, assign=True)
+    if any(t.is_meta for t in list(module.parameters()) + list(module.buffers())):
+        module = build()
+        module.load_state_dict(state_dict)
+    return module
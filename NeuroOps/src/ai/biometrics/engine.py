@@ -1,4 +1,5 @@
 import torch
+import torch.nn.functional as F
 import numpy as np
 import cv2
 import os
@@ -7,67 +8,136 @@ from .models.adaface import build_model
 from PIL import Image
 
 class BiometricEngine:
-    def __init__(self, weights_dir="./weights"):
+    def __init__(self, weights_dir="./weights", quantize=None):
+        """
+        quantize: INT8 AdaFace on CPU (None = follow $NEUROOPS_INT8). Static
+                  quantization is calibrated on the crops in
+                  <weights_dir>/calibration; without them only the Linear
+                  layer is quantized (dynamic).
+        """
+        from ..quantization import int8_enabled
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.weights_dir = weights_dir
+        self.quantize = self.device == "cpu" and int8_enabled(quantize)
+        self.quantized = False
         
         # Paths
         self.spoof_path = os.path.join(weights_dir, "MiniFASNetV2.pth")
         self.adaface_path = os.path.join(weights_dir, "adaface_ir50_ms1mv2.ckpt")
+        self.face_path = os.path.join(weights_dir, "yolov8n-face.pt")
         
         self.use_biometrics = False
+        self.face_detector = None
         self._load_models()
         
     def _load_models(self):
         try:
             # 1. Load Anti-Spoofing (MiniFASNetV2)
             if os.path.exists(self.spoof_path):
-                # MiniFASNetV2: 80x80, conv6_kernel=(7,7), num_classes=3
-                self.spoof_model = MiniFASNetV2(conv6_kernel=(7, 7)).to(self.device)
-                state_dict = torch.load(self.spoof_path, map_location=self.device)
-                # Handle DataParallel wrap if present
-                if 'state_dict' in state_dict:
-                    state_dict = state_dict['state_dict']
-                # Remove module. prefix if present
-                new_state_dict = {}
-                for k, v in state_dict.items():
-                    name = k.replace("module.", "")
-                    new_state_dict[name] = v
-                self.spoof_model.load_state_dict(new_state_dict, strict=False)
-                self.spoof_model.eval()
+                # MiniFASNetV2: 80x80 input -> 5x5 feature map, so conv6_kernel=(5,5), num_classes=3
+                self.spoof_model = self._load_cached(
+                    "minifasnet_v2", self.spoof_path, lambda: MiniFASNetV2(conv6_kernel=(5, 5))
+                )
                 print("[BIOMETRICS] Loaded MiniFASNetV2 (Anti-Spoofing)")
             else:
                 print(f"[BIOMETRICS] Warning: {self.spoof_path} not found. Anti-spoofing disabled.")
                 self.spoof_model = None
 
             # 2. Load Recognition (AdaFace IR-50)
-            if os.path.exists(self.adaface_path):
-                self.adaface_model = build_model('ir_50').to(self.device)
-                # Load checkpoint
-                checkpoint = torch.load(self.adaface_path, map_location=self.device)
-                if 'state_dict' in checkpoint:
-                     state_dict = checkpoint['state_dict']
-                else:
-                     state_dict = checkpoint
-                
-                # Cleaning keys
-                new_state_dict = {}
-                for k, v in state_dict.items():
-                    name = k.replace("module.", "")
-                    new_state_dict[name] = v
-                    
-                self.adaface_model.load_state_dict(new_state_dict, strict=False)
-                self.adaface_model.eval()
+            if os.path.exists(self.adaface_path) and self.quantize:
+                self.adaface_model = self._load_adaface_int8()
+                self.use_biometrics = True
+            elif os.path.exists(self.adaface_path):
+                self.adaface_model = self._load_adaface_float()
                 print("[BIOMETRICS] Loaded AdaFace (Face Recognition)")
                 self.use_biometrics = True
             else:
                 print(f"[BIOMETRICS] Warning: {self.adaface_path} not found. Recognition disabled.")
                 self.adaface_model = None
+
+            # 3. Face Detection / Alignment gate (YOLOv8-face)
+            self.face_detector = None
+            if os.path.exists(self.face_path):
+                from .face_detector import FaceDetector
+                self.face_detector = FaceDetector(self.face_path)
+                print("[BIOMETRICS] Loaded YOLOv8-face (Detection/Alignment)")
+            else:
+                print(f"[BIOMETRICS] Warning: {self.face_path} not found. Recognition runs on whole crops.")
                 
         except Exception as e:
             print(f"[BIOMETRICS] Error loading models: {e}")
             self.use_biometrics = False
 
+    def _load_adaface_float(self):
+        return self._load_cached("adaface_ir50", self.adaface_path, lambda: build_model('ir_50'))
+
+    def _load_cached(self, name, ckpt_path, build):
+        """
+        Builds a model and loads its checkpoint. The cleaned state dict is
+        cached under weights/cache on first load; later loads build the
+        module without random init and adopt the memory-mapped cached
+        tensors directly.
+        """
+        from ..artifacts import build_loaded, cached_state_dict
+        built = []
+
+        def clean_state_dict():
+            checkpoint = torch.load(ckpt_path, map_location="cpu")
+            # Handle DataParallel wrap if present
+            state_dict = checkpoint['state_dict'] if 'state_dict' in checkpoint else checkpoint
+            # Remove module. prefix if present
+            new_state_dict = {k.replace("module.", ""): v for k, v in state_dict.items()}
+            # Checkpoints may lack some keys (strict=False); store the complete
+            # state so warm loads can assign every tensor
+            model = build()
+            model.load_state_dict(new_state_dict, strict=False)
+            built.append(model)
+            return model.state_dict()
+
+        state_dict = cached_state_dict(name, ckpt_path, clean_state_dict)
+        model = built[0] if built else build_loaded(build, state_dict)
+        return model.to(self.device).eval()
+
+    def _calibration_batches(self, batch_size=16):
+        calib_dir = os.path.join(self.weights_dir, "calibration")
+        if not os.path.isdir(calib_dir):
+            return []
+        crops = []
+        for name in sorted(os.listdir(calib_dir)):
+            if name.lower().endswith((".jpg", ".jpeg", ".png")):
+                crop = cv2.imread(os.path.join(calib_dir, name))
+                if crop is not None:
+                    crops.append(self.preprocess_adaface(crop))
+        return [torch.cat(crops[i:i + batch_size]) for i in range(0, len(crops), batch_size)]
+
+    def _load_adaface_int8(self):
+        """
+        Loads the INT8 AdaFace TorchScript from weights/cache, building it from
+        the float checkpoint on first use. Cached artifacts are keyed by the
+        checkpoint's file_key (path, size, mtime), torch version and
+        quantization mode.
+        """
+        from ..artifacts import artifact_path, file_key, text_hash
+        from ..quantization import quantize_adaface, save_scripted, load_scripted
+
+        batches = self._calibration_batches()
+        mode = "static" if batches else "dynamic"
+        key = text_hash(f"{file_key(self.adaface_path)}|{torch.__version__}|{mode}")
+        path = artifact_path("adaface_ir50", key, ".int8.pt")
+
+        if os.path.exists(path):
+            model = load_scripted(path)
+        else:
+            if not batches:
+                print("[BIOMETRICS] No calibration crops found; AdaFace INT8 falls back to dynamic (Linear only).")
+            quantized = quantize_adaface(self._load_adaface_float(), batches)
+            model = save_scripted(quantized, torch.zeros(1, 3, 112, 112), path)
+            print(f"[BIOMETRICS] Cached INT8 AdaFace at {path}")
+
+        self.quantized = True
+        print(f"[BIOMETRICS] Loaded AdaFace INT8 ({mode})")
+        return model
+
     def preprocess_spoof(self, image_crop):
         # Resize to 80x80
         img = cv2.resize(image_crop, (80, 80))
@@ -85,6 +155,75 @@ class BiometricEngine:
         img = torch.from_numpy(img).unsqueeze(0).to(self.device)
         return img
 
+    def _resize_batch(self, crops, size):
+        """Resizes every crop into one preallocated N x size x size x 3 uint8 array."""
+        batch = np.empty((len(crops), size, size, 3), dtype=np.uint8)
+        for i, crop in enumerate(crops):
+            cv2.resize(crop, (size, size), dst=batch[i])
+        return batch
+
+    def preprocess_spoof_batch(self, crops):
+        batch = self._resize_batch(crops, 80)
+        batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2), dtype=np.float32)  # N, C, H, W
+        return torch.from_numpy(batch).to(self.device)
+
+    def preprocess_adaface_batch(self, crops):
+        batch = self._resize_batch(crops, 112)
+        batch = np.ascontiguousarray(batch[:, :, :, ::-1].transpose(0, 3, 1, 2), dtype=np.float32)  # BGR to RGB, N, C, H, W
+        batch *= 2.0 / 255.0  # Normalize -1 to 1
+        batch -= 1.0
+        return torch.from_numpy(batch).to(self.device)
+
+    def detect_faces(self, crops):
+        """
+        Runs the face gate over person crops in one batch. Returns one entry
+        per crop (None when no usable face, else a dict with the aligned
+        `face` and the `spoof` context crop), or None if no face model is loaded.
+        """
+        if self.face_detector is None:
+            return None
+        return self.face_detector.detect(crops)
+
+    def analyze_faces(self, crops, batch_size=64, spoof_crops=None):
+        """
+        Batched analyze_face for all crops of a frame: one forward pass per
+        model per `batch_size` crops. `spoof_crops` optionally gives the
+        anti-spoofing model its own (wider) crops, aligned with `crops`.
+        Returns:
+            spoof_scores (np.ndarray, N): Probability of being real (class 1)
+            embeddings (np.ndarray, N x 512): L2-normalized identity vectors
+        Unusable crops (None / empty) get score 0.0 and a zero embedding.
+        """
+        n = len(crops)
+        scores = np.zeros(n, dtype=np.float32)
+        embeddings = np.zeros((n, 512), dtype=np.float32)
+        if not self.use_biometrics or n == 0:
+            return scores, embeddings
+
+        valid = [i for i, c in enumerate(crops) if c is not None and c.size > 0]
+        if self.spoof_model is None:
+            scores[valid] = 1.0
+
+        with torch.no_grad():
+            for start in range(0, len(valid), batch_size):
+                idx = valid[start:start + batch_size]
+                chunk = [crops[i] for i in idx]
+
+                # 1. Anti-Spoofing Check (index 1 = live, see analyze_face)
+                if self.spoof_model:
+                    spoof_chunk = chunk if spoof_crops is None else [spoof_crops[i] for i in idx]
+                    probs = F.softmax(self.spoof_model(self.preprocess_spoof_batch(spoof_chunk)), dim=1)
+                    scores[idx] = probs[:, 1].cpu().numpy()
+
+                # 2. Identify (embeddings extracted regardless of spoof score)
+                if self.adaface_model:
+                    feats, _ = self.adaface_model(self.preprocess_adaface_batch(chunk))
+                    embeddings[idx] = feats.float().cpu().numpy()
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return scores, embeddings
+
     def analyze_face(self, image_crop):
         """
         Returns:
@@ -0,0 +1,112 @@
+import numpy as np
+import cv2
+
+# ArcFace 5-point template for 112x112 crops (eyes, nose, mouth corners)
+ARCFACE_TEMPLATE = np.array([
+    [38.2946, 51.6963],
+    [73.5318, 51.5014],
+    [56.0252, 71.7366],
+    [41.5493, 92.3655],
+    [70.7299, 92.2041],
+], dtype=np.float32)
+
+FACE_SIZE = 112
+SPOOF_SCALE = 2.7  # MiniFASNet is trained on the face box enlarged 2.7x
+
+
+def align_face(image, box, landmarks=None):
+    """
+    Returns a 112x112 face. With 5 landmarks the face is warped onto the
+    ArcFace template; otherwise the box is squared, padded by 10% and resized.
+    """
+    if landmarks is not None and len(landmarks) == 5 and np.all(np.asarray(landmarks) > 0):
+        matrix, _ = cv2.estimateAffinePartial2D(np.asarray(landmarks, dtype=np.float32), ARCFACE_TEMPLATE)
+        if matrix is not None:
+            return cv2.warpAffine(image, matrix, (FACE_SIZE, FACE_SIZE), borderValue=0)
+    return _scaled_crop(image, box, 1.1, FACE_SIZE)
+
+
+def spoof_crop(image, box):
+    """Face box enlarged by SPOOF_SCALE (clipped to the image), resized to 80x80."""
+    return _scaled_crop(image, box, SPOOF_SCALE, 80)
+
+
+def _scaled_crop(image, box, scale, size):
+    h, w = image.shape[:2]
+    x1, y1, x2, y2 = box
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    half = max(x2 - x1, y2 - y1) * scale / 2
+    x1, y1 = int(max(0, cx - half)), int(max(0, cy - half))
+    x2, y2 = int(min(w, cx + half)), int(min(h, cy + half))
+    return cv2.resize(image[y1:y2, x1:x2], (size, size))
+
+
+def sharpness(face):
+    """Variance of the Laplacian; low values mean a blurred face."""
+    gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if face.ndim == 3 else face
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def is_frontal(landmarks, max_offset=0.35):
+    """Rejects strong profiles: the nose must sit between the eyes, near their midpoint."""
+    if landmarks is None or len(landmarks) != 5:
+        return True
+    left_eye, right_eye, nose = landmarks[0], landmarks[1], landmarks[2]
+    eye_dist = abs(right_eye[0] - left_eye[0])
+    if eye_dist < 1:
+        return False
+    offset = abs(nose[0] - (left_eye[0] + right_eye[0]) / 2) / eye_dist
+    return offset <= max_offset
+
+
+class FaceDetector:
+    """
+    YOLOv8-face gating stage for person crops. One batched forward over all
+    crops of a frame; for each crop the best face is aligned if it is large,
+    sharp and frontal enough, otherwise the crop is dropped (None).
+    """
+    def __init__(self, weights_path, conf=0.5, min_size=24, min_sharpness=15.0, imgsz=320):
+        from ultralytics import YOLO
+        from ..detector import cached_fused
+        self.model = YOLO(cached_fused(weights_path))
+        self.conf = conf
+        self.min_size = min_size
+        self.min_sharpness = min_sharpness
+        self.imgsz = imgsz
+
+    def detect(self, crops):
+        """
+        Returns one entry per crop: None, or a dict with
+        face (112x112 aligned), spoof (80x80 context crop), box, confidence.
+        """
+        out = [None] * len(crops)
+        valid = [i for i, c in enumerate(crops) if c is not None and c.size > 0]
+        if not valid:
+            return out
+
+        results = self.model([crops[i] for i in valid], imgsz=self.imgsz, conf=self.conf, verbose=False)
+        for i, r in zip(valid, results):
+            if len(r.boxes) == 0:
+                continue
+            best = int(r.boxes.conf.argmax())
+            box = r.boxes.xyxy[best].cpu().numpy()
+            if min(box[2] - box[0], box[3] - box[1]) < self.min_size:
+                continue
+
+            landmarks = None
+            if getattr(r, "keypoints", None) is not None and len(r.keypoints.xy) > best:
+                landmarks = r.keypoints.xy[best].cpu().numpy()
+            if not is_frontal(landmarks):
+                continue
+
+            face = align_face(crops[i], box, landmarks)
+            if sharpness(face) < self.min_sharpness:
+                continue
+
+            out[i] = {
+                "face": face,
+                "spoof": spoof_crop(crops[i], box),
+                "box": box.tolist(),
+                "confidence": float(r.boxes.conf[best]),
+            }
+        return out
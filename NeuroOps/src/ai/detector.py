@@ -1,16 +1,200 @@
 from ultralytics import YOLO
 import torch
+import numpy as np
+import os
+import shutil
+from .artifacts import file_hash, file_key, artifact_path, cache_enabled, save_atomic
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+
+def cached_export(model_name, fmt, imgsz=640):
+    """
+    Exports the YOLO weights once and caches the result next to the .pt,
+    keyed by the weights' hash (yolo26n.<hash>.onnx / yolo26n.<hash>_openvino_model).
+    Returns the path of the exported model.
+    """
+    pt_path = model_name
+    if not os.path.exists(pt_path):
+        # Let ultralytics resolve/download the weights first
+        pt_path = YOLO(model_name).ckpt_path or model_name
+
+    base = os.path.splitext(pt_path)[0]
+    digest = file_hash(pt_path)
+    target = f"{base}.{digest}.onnx" if fmt == "onnx" else f"{base}.{digest}_openvino_model"
+    if os.path.exists(target):
+        return target
+
+    print(f"[DETECTOR] Exporting {pt_path} to {fmt} (one-time, cached as {target})...")
+    exported = YOLO(pt_path).export(format=fmt, imgsz=imgsz, dynamic=False, verbose=False)
+    shutil.move(str(exported), target)
+    return target
+
+
+def cached_fused(model_name):
+    """
+    Path of a fused copy of the YOLO weights in weights/cache (Conv+BN folded,
+    EMA/optimizer state dropped), built on first use. YOLO() loads it like
+    the original .pt and fuse() becomes a no-op. Returns model_name itself
+    when the cache is disabled or the weights can't be found locally.
+    """
+    if not cache_enabled() or not os.path.exists(model_name):
+        return model_name
+    name = os.path.splitext(os.path.basename(model_name))[0]
+    path = artifact_path(name, file_key(model_name), ".fused.pt")
+    if os.path.exists(path):
+        return path
+
+    yolo = YOLO(model_name)
+    yolo.fuse()
+    ckpt = dict(torch.load(model_name, map_location="cpu", weights_only=False))
+    ckpt["model"] = yolo.model
+    for k in ("ema", "optimizer", "updates"):
+        ckpt.pop(k, None)
+    save_atomic(ckpt, path)
+    print(f"[DETECTOR] Cached fused {model_name} at {path}")
+    return path
+
+
+class ExportedYOLO:
+    """
+    Runs an exported YOLO graph with ONNX Runtime or OpenVINO on CPU and
+    returns ultralytics Results, so callers see the same interface as the
+    PyTorch model (r.boxes.xyxy / .conf / .cls, model.names).
+    """
+    def __init__(self, path, fmt, threads=None):
+        import ast
+        self.fmt = fmt
+
+        if fmt == "onnx":
+            import onnxruntime as ort
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if threads:
+                opts.intra_op_num_threads = threads
+                opts.inter_op_num_threads = 1
+            self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+            self.input_name = self.session.get_inputs()[0].name
+            meta = dict(self.session.get_modelmeta().custom_metadata_map)
+        else:
+            import glob
+            import yaml
+            import openvino as ov
+            config = {"PERFORMANCE_HINT": "LATENCY"}
+            if threads:
+                config["INFERENCE_NUM_THREADS"] = threads
+            xml = glob.glob(os.path.join(path, "*.xml"))[0]
+            self.compiled = ov.Core().compile_model(xml, "CPU", config)
+            self.request = self.compiled.create_infer_request()
+            with open(os.path.join(path, "metadata.yaml")) as f:
+                meta = yaml.safe_load(f)
+
+        names = meta.get("names", {})
+        self.names = ast.literal_eval(names) if isinstance(names, str) else dict(names)
+        imgsz = meta.get("imgsz", [640, 640])
+        self.imgsz = ast.literal_eval(imgsz) if isinstance(imgsz, str) else list(imgsz)
+        self.stride = int(meta.get("stride", 32))
+
+    def _letterbox(self, frame):
+        h, w = frame.shape[:2]
+        th, tw = self.imgsz
+        gain = min(th / h, tw / w)
+        nh, nw = int(round(h * gain)), int(round(w * gain))
+        top, left = (th - nh) // 2, (tw - nw) // 2
+
+        import cv2
+        canvas = np.full((th, tw, 3), 114, dtype=np.uint8)
+        canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        # YOLO.__call__ treats numpy input as BGR and flips it; do the same for identical results
+        blob = canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+        return np.ascontiguousarray(blob), gain, left, top
+
+    def _forward(self, blob):
+        if self.fmt == "onnx":
+            return self.session.run(None, {self.input_name: blob})[0]
+        return self.request.infer({0: blob})[self.compiled.output(0)]
+
+    def _postprocess(self, out, conf, iou, max_det):
+        """Returns an (N, 6) array of x1, y1, x2, y2, conf, cls in letterbox coordinates."""
+        out = out[0]
+        if out.shape[-1] == 6 and out.shape[0] <= max(max_det, 300):
+            # End-to-end (NMS-free) heads already emit final boxes
+            det = out[out[:, 4] >= conf]
+            return det[:max_det]
+
+        import torchvision
+        preds = out.T  # (anchors, 4 + classes)
+        scores = preds[:, 4:]
+        cls = scores.argmax(1)
+        best = scores[np.arange(len(scores)), cls]
+        keep = best >= conf
+        if not keep.any():
+            return np.zeros((0, 6), dtype=np.float32)
+        xywh, best, cls = preds[keep, :4], best[keep], cls[keep]
+        xyxy = np.empty_like(xywh)
+        xyxy[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+        xyxy[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+        idx = torchvision.ops.batched_nms(
+            torch.from_numpy(xyxy), torch.from_numpy(best), torch.from_numpy(cls), iou
+        ).numpy()[:max_det]
+        return np.concatenate([xyxy[idx], best[idx, None], cls[idx, None].astype(np.float32)], axis=1)
+
+    def __call__(self, frame, conf=0.25, iou=0.7, max_det=300):
+        from ultralytics.engine.results import Results
+
+        blob, gain, left, top = self._letterbox(frame)
+        det = self._postprocess(self._forward(blob), conf, iou, max_det).astype(np.float32)
+        if len(det):
+            h, w = frame.shape[:2]
+            det[:, [0, 2]] = ((det[:, [0, 2]] - left) / gain).clip(0, w)
+            det[:, [1, 3]] = ((det[:, [1, 3]] - top) / gain).clip(0, h)
+        return Results(frame, path="", names=self.names, boxes=torch.from_numpy(det))
+
 
 class ObjectDetector:
-    def __init__(self, model_name="yolo26n.pt"):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.use_half = self.device == "cuda"
-        print(f"Loading YOLO on {self.device} (half={self.use_half})...")
-        self.model = YOLO(model_name)
-        # Fuse model layers for faster inference
-        self.model.fuse()
-    
+    def __init__(self, model_name="yolo26n.pt", backend=None, threads=None):
+        """
+        backend: "torch" (default), "onnx" or "openvino". Falls back to
+                 $NEUROOPS_DETECTOR_BACKEND. The exported backends run on CPU.
+        threads: intra-op CPU threads for the chosen runtime (None = runtime default).
+        """
+        self.backend = (backend or os.environ.get("NEUROOPS_DETECTOR_BACKEND", "torch")).lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown detector backend: {self.backend} (expected one of {BACKENDS})")
+
+        if self.backend == "torch":
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.use_half = self.device == "cuda"
+            if threads:
+                torch.set_num_threads(threads)
+            print(f"Loading YOLO on {self.device} (half={self.use_half})...")
+            self.model = YOLO(cached_fused(model_name))
+            # Fuse model layers for faster inference (no-op for the cached fused weights)
+            self.model.fuse()
+        else:
+            self.device = "cpu"
+            self.use_half = False
+            path = cached_export(model_name, self.backend)
+            print(f"Loading YOLO ({self.backend}) from {path}...")
+            self.model = ExportedYOLO(path, self.backend, threads=threads)
+
     def detect(self, frame):
         # Frame is numpy array (RGB)
-        results = self.model(frame, verbose=False, half=self.use_half, imgsz=640)
+        if self.backend != "torch":
+            return self.model(frame)
+        results = self.model(frame, verbose=False, imgsz=640, **self._half())
         return results[0]  # Return first result (single frame)
+
+    def predict(self, frames, imgsz=640, conf=0.25):
+        """
+        Batched inference over a list of images at the given input size.
+        Exported backends run at their fixed export size and ignore imgsz.
+        Returns one Results per image.
+        """
+        if self.backend != "torch":
+            return [self.model(f, conf=conf) for f in frames]
+        return self.model(frames, verbose=False, imgsz=imgsz, conf=conf, **self._half())
+
+    def _half(self):
+        # Newer ultralytics warns on any explicit half=..., so only pass it when enabled
+        return {"half": True} if self.use_half else {}
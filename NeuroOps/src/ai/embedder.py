@@ -1,13 +1,93 @@
 from sentence_transformers import SentenceTransformer
 from PIL import Image
 import numpy as np
+import os
 import torch
 
 class ClipEmbedder:
-    def __init__(self, model_name="clip-ViT-B-32"):
+    def __init__(self, model_name="clip-ViT-B-32", quantize=None):
+        """
+        quantize: run the image tower with INT8 dynamic quantization on CPU
+                  (None = follow $NEUROOPS_INT8). Text embeddings stay float.
+        """
+        from .quantization import int8_enabled
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         print(f"Loading CLIP ({model_name}) on {self.device}...")
-        self.model = SentenceTransformer(model_name, device=self.device)
+        self.snapshot = None  # local snapshot directory the model was loaded from
+        self.model = self._load(model_name)
+        self.quantized = False
+        if self.device == "cpu" and int8_enabled(quantize):
+            self._quantize_vision(model_name)
+
+    def _load(self, model_name):
+        """
+        Loads from a local snapshot under weights/cache when present. The
+        snapshot is written on first load (safetensors, which transformers
+        memory-maps), so later workers skip hub resolution entirely.
+        """
+        import shutil
+        import sentence_transformers
+        from .artifacts import artifact_path, cache_enabled, text_hash
+
+        if not cache_enabled() or os.path.isdir(model_name):
+            return SentenceTransformer(model_name, device=self.device)
+        key = text_hash(f"{model_name}|{sentence_transformers.__version__}")
+        path = artifact_path(model_name.replace("/", "_"), key, ".st")
+        if os.path.isdir(path):
+            self.snapshot = path
+            return SentenceTransformer(path, device=self.device)
+
+        model = SentenceTransformer(model_name, device=self.device)
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        model.save(tmp)
+        os.replace(tmp, path)
+        self.snapshot = path
+        print(f"[EMBEDDER] Cached {model_name} snapshot at {path}")
+        return model
+
+    def _snapshot_key(self):
+        """file_key of the snapshot's weight files: changes whenever the snapshot is rewritten."""
+        import glob
+        from .artifacts import file_key, text_hash
+        weights = sorted(glob.glob(os.path.join(self.snapshot, "**", "*.safetensors"), recursive=True)
+                         + glob.glob(os.path.join(self.snapshot, "**", "*.bin"), recursive=True))
+        return text_hash("|".join(file_key(w) for w in weights))
+
+    def _quantize_vision(self, model_name):
+        """
+        Swaps the vision tower and its projection for INT8 dynamic-quantized
+        copies. With a local snapshot, the quantized modules are saved whole
+        under weights/cache (keyed by the snapshot's file_key) and later
+        processes load them as they are instead of quantizing again.
+        """
+        from .artifacts import artifact_path, save_atomic, text_hash
+        from .quantization import quantize_linear_dynamic
+
+        clip = getattr(self.model[0], "model", None)
+        if clip is None or not hasattr(clip, "vision_model"):
+            print("[EMBEDDER] INT8 requested but the model has no CLIP vision tower; staying float.")
+            return
+
+        path = None
+        if self.snapshot is not None:
+            key = text_hash(f"{self._snapshot_key()}|{torch.__version__}|dynamic-int8")
+            path = artifact_path(model_name.replace("/", "_") + ".vision", key, ".int8.pt")
+        if path is not None and os.path.exists(path):
+            quantized = torch.load(path, map_location="cpu", weights_only=False)
+        else:
+            quantized = quantize_linear_dynamic(torch.nn.ModuleDict({
+                "vision_model": clip.vision_model,
+                "visual_projection": clip.visual_projection,
+            }))
+            if path is not None:
+                save_atomic(quantized, path)
+                print(f"[EMBEDDER] Cached INT8 vision tower at {path}")
+
+        clip.vision_model = quantized["vision_model"]
+        clip.visual_projection = quantized["visual_projection"]
+        self.quantized = True
+        print("[EMBEDDER] CLIP image tower running INT8 (dynamic)")
 
     def embed_image(self, image_array):
         """
@@ -23,6 +103,15 @@ class ClipEmbedder:
         vector = self.model.encode(image)
         return vector.tolist()
 
+    def embed_images(self, images):
+        """
+        Embeds a list of numpy image arrays (RGB) in one batch.
+        Returns a list of vectors.
+        """
+        images = [Image.fromarray(i) if isinstance(i, np.ndarray) else i for i in images]
+        vectors = self.model.encode(images, batch_size=max(1, len(images)))
+        return vectors.tolist()
+
     def embed_text(self, text):
         """
         Embeds text query.
@@ -0,0 +1,395 @@
+"""
+Live analysis of camera streams. Per camera, a StreamReader thread keeps
+only the newest decoded frame in a LatestFrame slot. One LiveScheduler
+takes the due cameras' newest frames, runs YOLO once on them as a batch
+and hands each frame and its detections to the camera's LiveCamera
+thread, which runs the rest of the same FrameAnalyzer as file ingest, so
+detections land in the same DB tables and vector collections (under the
+camera's video row) and are searchable like any ingested video.
+Inference never works through a backlog: frames that arrive while it is
+busy replace each other and are counted as dropped.
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.core.video.stream import LatestFrame, StreamReader
+
+
+def live_fps():
+    """$NEUROOPS_LIVE_FPS: frames analysed per second per camera (default 2, as file ingest)."""
+    return float(os.environ.get("NEUROOPS_LIVE_FPS", 2.0))
+
+
+class LiveCamera(threading.Thread):
+    """
+    One camera's side of live analysis: its stream reader, and a thread
+    running the FrameAnalyzer on the frames the LiveScheduler dispatches to
+    it. `camera` is a DatabaseManager.get_cameras() dict. It analyses at
+    `fps` ($NEUROOPS_LIVE_FPS, capped by the camera's fps_limit) times the
+    `scale` the scheduler sets under overload, and keeps the effective FPS
+    and capture-to-result latency it reports. Detections are timestamped in
+    wall-clock seconds.
+    """
+    COMMIT_S = 5.0
+    WINDOW_S = 10.0  # effective FPS is measured over this window
+
+    def __init__(self, camera, fps=None, analyzer=None, log=print, alert=None, stats=None):
+        super().__init__(name=f"live-{camera['name']}", daemon=True)
+        self.camera = camera
+        self.camera_name = camera["name"]
+        # Never above the camera's own FPS limit
+        self.fps = fps or min(live_fps(), camera.get("fps_limit") or live_fps())
+        self.priority = camera.get("priority") or 2
+        self.analyzer = analyzer
+        self.log = log
+        self.alert = alert
+        self.stats = stats
+        self.slot = LatestFrame()
+        # Frames beyond the camera's FPS limit are grabbed (to stay current) but never converted
+        self.reader = StreamReader(camera["url"], self.slot, log, label=camera["name"],
+                                   max_fps=camera.get("fps_limit"))
+        self.is_running = True
+
+        # Scheduler state
+        self.scale = 1.0
+        self.activity = 0.0  # moving share of recent frames with detections
+        self.last_dispatch = None
+        self.busy = True  # until the analyzer is loaded, then while a frame is in flight
+        self._inbox = queue.Queue(maxsize=1)
+
+        self.processed = 0
+        self.failed = 0  # frames whose analysis raised (logged and skipped)
+        self.last_frame_idx = None
+        self.started_at = time.monotonic()
+        self.completed = deque()  # monotonic completion times within WINDOW_S
+        self.latencies = deque(maxlen=100)  # capture to result, seconds
+
+    @property
+    def interval(self):
+        return 1.0 / (self.fps * self.scale)
+
+    def submit(self, frame, frame_idx, timestamp, detection=None):
+        """Called by the scheduler: one RGB frame (and its YOLO result, if batched) to analyse."""
+        self.busy = True
+        self._inbox.put((frame, frame_idx, timestamp, detection))
+
+    def run(self):
+        session = vector_store = None
+        try:
+            if self.analyzer is None:
+                from .pipeline import FrameAnalyzer
+                from src.data.db_manager import DatabaseManager
+                from src.data.vector_store import VectorStore
+                db = DatabaseManager()
+                vector_store = VectorStore(str(self.camera["video_id"]))
+                session = db.get_session()
+                self.analyzer = FrameAnalyzer(self.camera["video_id"], db, vector_store, session,
+                                              log=self.log, alert=self.alert)
+            self.reader.start()
+            self.log(f"[LIVE] {self.camera_name}: analysing at up to {self.fps:g} fps")
+            self.busy = False
+            self._loop(session, vector_store)
+        except Exception as e:
+            self.log(f"[LIVE] {self.camera_name}: {e}")
+        finally:
+            self.busy = True
+            self.reader.stop()
+            self.slot.close()
+            if session is not None:
+                self._commit(session)  # never raises over the error that ended the loop
+                session.close()
+            if vector_store is not None:
+                vector_store.flush()
+
+    def _commit(self, session):
+        """Commits the analysed rows; on failure logs and rolls back so the session stays usable."""
+        try:
+            session.commit()
+        except Exception as e:
+            self.log(f"[LIVE] {self.camera_name}: commit failed: {e}")
+            session.rollback()
+
+    def _loop(self, session, vector_store):
+        last_commit = time.monotonic()
+        while self.is_running:
+            try:
+                frame, frame_idx, timestamp, detection = self._inbox.get(timeout=0.5)
+            except queue.Empty:
+                if self.slot.closed:
+                    break
+                continue
+            try:
+                stats = self.analyzer.process(frame, frame_idx, timestamp, detection)
+            except Exception as e:
+                # One bad frame (or DB error) must not end the camera's analysis
+                self.failed += 1
+                self.log(f"[LIVE] {self.camera_name}: frame {frame_idx} failed: {e}")
+                if session is not None:
+                    session.rollback()
+                continue
+            finally:
+                self.busy = False
+            done = time.monotonic()
+            self.processed += 1
+            self.last_frame_idx = frame_idx
+            self.latencies.append(time.time() - timestamp)
+            self.completed.append(done)
+            self.activity += 0.2 * (float(stats.get("detections", 0) > 0) - self.activity)
+            if self.stats:
+                self.stats(dict(stats, camera=self.camera_name))
+
+            if done - last_commit >= self.COMMIT_S:
+                last_commit = done
+                if session is not None:
+                    self._commit(session)
+                if vector_store is not None:
+                    vector_store.flush()
+
+    def effective_fps(self):
+        now = time.monotonic()
+        while self.completed and self.completed[0] < now - self.WINDOW_S:
+            self.completed.popleft()
+        return len(self.completed) / max(1e-6, min(self.WINDOW_S, now - self.started_at))
+
+    def status(self):
+        """Analysis numbers plus the stream reader's health counters (stream_fps, reconnects, ...)."""
+        latencies = sorted(self.latencies)
+        stream = self.reader.stats()
+        return {
+            "camera": self.camera_name,
+            "running": self.is_alive(),
+            "priority": self.priority,
+            "target_fps": round(self.fps * self.scale, 2),
+            "fps": round(self.effective_fps(), 2),
+            "latency_ms": round(1000 * sum(latencies) / len(latencies), 1) if latencies else None,
+            "latency_p95_ms": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 1) if latencies else None,
+            "processed": self.processed,
+            "failed": self.failed,
+            "stream_fps": stream.pop("fps"),
+            **{key: value for key, value in stream.items() if key != "stream"},
+        }
+
+    def stop(self):
+        self.is_running = False
+        self.reader.stop()
+        self.slot.close()
+
+
+class LiveScheduler(threading.Thread):
+    """
+    Serves every live camera from one detector. Each round it takes the
+    newest frame of up to `max_batch` ($NEUROOPS_LIVE_BATCH) due cameras,
+    those whose interval has passed and whose pipeline is idle, most
+    deserving first: priority x (1 + recent activity) x how overdue, so
+    equal cameras take turns; a camera STARVED intervals overdue goes ahead
+    of all others. YOLO runs once on the batch and each camera gets its
+    frame and detections back.
+
+    Overload shows as cameras being served late. Then the rate of the
+    lowest-priority cameras is halved (down to MIN_SCALE) before any higher
+    priority is touched; with headroom again, rates come back highest
+    priority first.
+
+    With $NEUROOPS_DETECTOR_MODE=adaptive, tiling keeps per-camera motion
+    state, so cameras are still scheduled here but detect in their own
+    pipeline (through the shared, batching detector handle).
+    """
+    IDLE_S = 0.01
+    ADAPT_S = 2.0
+    MIN_SCALE = 0.125
+    STARVED = 2.0  # intervals overdue after which a camera is served before any other
+    LATE_HIGH = 0.5  # mean lateness, in intervals, that counts as overload
+    LATE_LOW = 0.1
+
+    def __init__(self, detector=None, max_batch=None, log=print):
+        super().__init__(name="live-scheduler", daemon=True)
+        self.detector = detector
+        self.max_batch = max_batch or int(os.environ.get("NEUROOPS_LIVE_BATCH", 8))
+        self.log = log
+        self.cameras = {}
+        self._lock = threading.Lock()
+        self.is_running = True
+
+        self.batches = 0
+        self.frames = 0
+        self.deferred = 0  # due cameras left for the next round by a full batch
+        self.load = {"late": 0.0, "util": 0.0}
+        self._late = []
+        self._busy_s = 0.0
+
+    def add(self, camera):
+        with self._lock:
+            self.cameras[camera.camera_name] = camera
+
+    def remove(self, name):
+        with self._lock:
+            return self.cameras.pop(name, None)
+
+    def run(self):
+        if self.detector is None:
+            from .tiled_detection import adaptive_enabled
+            if not adaptive_enabled():
+                from .model_registry import get_detector
+                self.detector = get_detector("yolo26n.pt")
+        window_start = time.monotonic()
+        while self.is_running:
+            now = time.monotonic()
+            batch = self.pick(now)
+            if batch:
+                self.dispatch(batch, now)
+            else:
+                time.sleep(self.IDLE_S)
+            if now - window_start >= self.ADAPT_S:
+                self.adapt(time.monotonic() - window_start)
+                window_start = time.monotonic()
+
+    def pick(self, now):
+        """Takes the newest frame of the most deserving due cameras: [(camera, (frame, idx, ts))]."""
+        with self._lock:
+            cameras = list(self.cameras.values())
+        due = []
+        for cam in cameras:
+            if cam.busy or not cam.slot.pending:
+                continue
+            overdue = self.STARVED if cam.last_dispatch is None else (now - cam.last_dispatch) / cam.interval
+            if overdue >= 1.0:
+                # Starved cameras go first whatever their priority, so a degraded one keeps its rate
+                due.append((overdue >= self.STARVED, cam.priority * (1.0 + cam.activity) * overdue, overdue, cam))
+        due.sort(key=lambda d: d[:2], reverse=True)
+        self.deferred += max(0, len(due) - self.max_batch)
+
+        batch = []
+        for _, _, overdue, cam in due[:self.max_batch]:
+            item = cam.slot.get(timeout=0)
+            if item is not None:
+                if cam.last_dispatch is not None:
+                    self._late.append(overdue - 1.0)
+                cam.last_dispatch = now
+                batch.append((cam, item))
+        return batch
+
+    def dispatch(self, batch, now):
+        import cv2
+        frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for _, (frame, _, _) in batch]
+        detections = [None] * len(frames)
+        if self.detector is not None:
+            t0 = time.perf_counter()
+            try:
+                detections = self.detector.predict(frames)
+            except Exception as e:
+                self.log(f"[LIVE] Batch detection failed: {e}")
+                return
+            finally:
+                self._busy_s += time.perf_counter() - t0
+        self.batches += 1
+        self.frames += len(frames)
+        for (cam, (_, frame_idx, timestamp)), frame, detection in zip(batch, frames, detections):
+            cam.submit(frame, frame_idx, timestamp, detection)
+
+    def adapt(self, elapsed):
+        """Per ADAPT_S window: slow the lowest priority level down when late, restore when idle."""
+        late = sum(self._late) / len(self._late) if self._late else 0.0
+        util = self._busy_s / elapsed if elapsed > 0 else 0.0
+        self.load = {"late": round(late, 3), "util": round(util, 3)}
+        self._late, self._busy_s = [], 0.0
+        with self._lock:
+            cameras = list(self.cameras.values())
+
+        if late > self.LATE_HIGH:
+            levels = [c.priority for c in cameras if c.scale > self.MIN_SCALE]
+            if levels:
+                level = min(levels)
+                for cam in cameras:
+                    if cam.priority == level:
+                        cam.scale = max(self.MIN_SCALE, cam.scale / 2)
+                self.log(f"[LIVE] Overloaded: priority {level} cameras slowed down (late {late:.2f}, util {util:.2f})")
+        elif late < self.LATE_LOW and util < 0.7:
+            levels = [c.priority for c in cameras if c.scale < 1.0]
+            if levels:
+                level = max(levels)
+                for cam in cameras:
+                    if cam.priority == level:
+                        cam.scale = min(1.0, cam.scale * 2)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "frames": self.frames,
+            "mean_batch": round(self.frames / self.batches, 2) if self.batches else 0.0,
+            "deferred": self.deferred,
+            **self.load,
+        }
+
+    def stop(self):
+        self.is_running = False
+
+
+class LiveAnalysisService(QObject):
+    """
+    Runs a LiveCamera per AI-enabled camera, all fed by one LiveScheduler;
+    signals are safe to connect to widgets.
+    """
+    log_message = pyqtSignal(str)
+    alert_triggered = pyqtSignal(str, str)  # severity, message
+    stats_update = pyqtSignal(dict)  # FrameAnalyzer stats + "camera"
+
+    def __init__(self):
+        super().__init__()
+        self.cameras = {}
+        self.scheduler = None
+
+    def start(self, camera):
+        """(Re)starts analysis of a camera dict (see DatabaseManager.get_cameras)."""
+        self.stop(camera["name"])
+        if self.scheduler is None:
+            self.scheduler = LiveScheduler(log=self.log_message.emit)
+            self.scheduler.start()
+        live = LiveCamera(camera, log=self.log_message.emit, alert=self.alert_triggered.emit,
+                          stats=self.stats_update.emit)
+        self.cameras[camera["name"]] = live
+        live.start()
+        self.scheduler.add(live)
+        return live
+
+    def start_saved(self):
+        """Starts every camera saved with AI detection enabled."""
+        from src.data.db_manager import DatabaseManager
+        for camera in DatabaseManager().get_cameras(ai_only=True):
+            self.start(camera)
+
+    def stop(self, name, timeout=5.0):
+        live = self.cameras.pop(name, None)
+        if live is not None:
+            self.scheduler.remove(name)
+            live.stop()
+            live.join(timeout)
+
+    def stop_all(self):
+        for name in list(self.cameras):
+            self.stop(name)
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler.join(5.0)
+            self.scheduler = None
+
+    def status(self):
+        """Per-camera effective FPS, latency and frame counts, plus the scheduler's batch stats."""
+        return {
+            "cameras": [live.status() for live in self.cameras.values()],
+            "scheduler": self.scheduler.stats() if self.scheduler else None,
+        }
+
+
+_service = None
+
+
+def get_live_service():
+    global _service
+    if _service is None:
+        _service = LiveAnalysisService()
+    return _service
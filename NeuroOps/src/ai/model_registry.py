@@ -0,0 +1,333 @@
+"""
+Process-wide model registry. Analysis workers, the search engine and the
+identity gallery share one instance of each model instead of loading their
+own. Every shared model sits behind a BatchingServer: a single thread owns
+the model and runs concurrent requests together as one batch, which also
+makes the handles safe to call from any thread.
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+import queue
+
+
+class BatchingServer:
+    """
+    Collects requests for up to `max_wait_ms` (or until `max_batch` items are
+    queued) and runs them through `batch_fn(items) -> results` in one call.
+    If the batch call raises, each item is re-run alone, so only the items
+    that fail on their own get the exception.
+    """
+    def __init__(self, name, batch_fn, max_batch=16, max_wait_ms=5.0):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.busy_s = 0.0
+        self.retried = 0  # items re-run alone after their batch failed
+        self._stats_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._serve, name=f"batching-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        future = Future()
+        self.queue.put((item, future))
+        return future
+
+    def submit_many(self, items):
+        return [self.submit(item) for item in items]
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    def map(self, items):
+        """Runs a caller-side batch (e.g. all crops of a frame) and returns results in order."""
+        return [f.result() for f in self.submit_many(items)]
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Items already queued are taken even after the deadline
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, items):
+        """
+        batch_fn(items) as one (result, exception) per item. A short result
+        list fails the items left without a result.
+        """
+        try:
+            results = list(self.batch_fn(items))
+        except Exception as e:
+            return [(None, e)] * len(items)
+        if len(results) != len(items):
+            print(f"[REGISTRY] {self.name}: {len(results)} results for a batch of {len(items)}")
+        missing = RuntimeError(f"{self.name}: no result for this item "
+                               f"({len(results)} results for a batch of {len(items)})")
+        return [(results[i], None) if i < len(results) else (None, missing) for i in range(len(items))]
+
+    def _serve(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            t0 = time.perf_counter()
+            outcomes = self._run(items)
+            if len(items) > 1 and all(error is not None for _, error in outcomes):
+                # One bad item must not fail its batch-mates: run each on its own
+                outcomes = [self._run([item])[0] for item in items]
+                with self._stats_lock:
+                    self.retried += len(items)
+            busy = time.perf_counter() - t0
+
+            with self._stats_lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+                self.busy_s += busy
+
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "batch_hist": dict(sorted(self.batch_sizes.items())),
+                "busy_s": round(self.busy_s, 3),
+                "retried": self.retried,
+            }
+
+
+def module_mb(*objs):
+    """Parameter + buffer memory of the torch modules among objs (shared tensors counted once)."""
+    import torch
+    seen = set()
+    total = 0
+    for obj in objs:
+        if not isinstance(obj, torch.nn.Module):
+            continue
+        for t in list(obj.parameters()) + list(obj.buffers()):
+            if t.data_ptr() in seen:
+                continue
+            seen.add(t.data_ptr())
+            total += t.numel() * t.element_size()
+    return round(total / 1e6, 1)
+
+
+class SharedClip:
+    """ClipEmbedder interface (embed_image / embed_text) over batching servers."""
+    def __init__(self, embedder, max_batch=32, max_wait_ms=5.0):
+        self.embedder = embedder
+        encode_texts = lambda texts: embedder.model.encode(texts, batch_size=len(texts)).tolist()
+        self.image_server = BatchingServer("clip-image", embedder.embed_images, max_batch, max_wait_ms)
+        self.text_server = BatchingServer("clip-text", encode_texts, max_batch, max_wait_ms)
+        self.servers = [self.image_server, self.text_server]
+
+    def embed_image(self, image_array):
+        return self.image_server(image_array)
+
+    def embed_images(self, images):
+        return self.image_server.map(images)
+
+    def embed_text(self, text):
+        return self.text_server(text)
+
+    def memory_mb(self):
+        return module_mb(self.embedder.model)
+
+
+class SharedDetector:
+    """ObjectDetector interface (detect, predict, model.names) over a batching server."""
+    def __init__(self, detector, max_batch=8, max_wait_ms=5.0):
+        self.detector = detector
+        self.model = detector.model
+        self.backend = detector.backend
+
+        def detect_batch(items):
+            # Items are (frame, imgsz, conf); requests with the same settings run together
+            results = [None] * len(items)
+            groups = {}
+            for i, (_, imgsz, conf) in enumerate(items):
+                groups.setdefault((imgsz, conf), []).append(i)
+            for (imgsz, conf), idx in groups.items():
+                for i, r in zip(idx, detector.predict([items[i][0] for i in idx], imgsz=imgsz, conf=conf)):
+                    results[i] = r
+            return results
+
+        self.server = BatchingServer("yolo", detect_batch, max_batch, max_wait_ms)
+        self.servers = [self.server]
+
+    def detect(self, frame):
+        return self.server((frame, 640, 0.25))
+
+    def predict(self, frames, imgsz=640, conf=0.25):
+        return self.server.map([(f, imgsz, conf) for f in frames])
+
+    def memory_mb(self):
+        return module_mb(getattr(self.detector.model, "model", None))
+
+
+class SharedIdentityEncoder:
+    """
+    IdentityEncoder interface over a batching server. Items are tagged so
+    face-gated frame crops and single query crops share one model thread.
+    """
+    def __init__(self, encoder, max_batch=32, max_wait_ms=5.0):
+        self.encoder = encoder
+        self.engine = encoder.engine
+
+        def run(items):
+            out = [None] * len(items)
+            gated = [i for i, (mode, _) in enumerate(items) if mode == "gated"]
+            for i, feature in zip(gated, encoder.extract_features([items[i][1] for i in gated])):
+                out[i] = feature
+            for i, (mode, crop) in enumerate(items):
+                if mode == "query":
+                    out[i] = encoder.extract_feature(crop)
+            return out
+
+        self.server = BatchingServer("reid", run, max_batch, max_wait_ms)
+        self.servers = [self.server]
+
+    def extract_feature(self, image_crop):
+        return self.server(("query", image_crop))
+
+    def extract_features(self, image_crops):
+        return self.server.map([("gated", c) for c in image_crops])
+
+    def memory_mb(self):
+        face = getattr(self.engine.face_detector, "model", None)
+        return module_mb(getattr(self.engine, "spoof_model", None),
+                         getattr(self.engine, "adaface_model", None),
+                         getattr(face, "model", None))
+
+
+class SharedOCR:
+    """
+    OCRProcessor interface. EasyOCR batches internally (detect_regions,
+    recognize_boxes), so the server only serialises callers.
+    """
+    def __init__(self, ocr):
+        self.ocr = ocr
+        run = lambda calls: [getattr(ocr, name)(*args) for name, args in calls]
+        self.server = BatchingServer("ocr", run, max_batch=1)
+        self.servers = [self.server]
+
+    def detect_text(self, frame):
+        return self.server(("detect_text", (frame,)))
+
+    def detect_regions(self, frame, rois):
+        return self.server(("detect_regions", (frame, rois)))
+
+    def recognize_boxes(self, frame, boxes):
+        return self.server(("recognize_boxes", (frame, boxes)))
+
+    def memory_mb(self):
+        reader = self.ocr.reader
+        return module_mb(getattr(reader, "detector", None), getattr(reader, "recognizer", None))
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._models = {}  # key -> Future of the shared handle
+        self._lock = threading.Lock()
+
+    def get(self, key, factory):
+        """
+        Returns the shared handle for key, creating it with factory() on first
+        use. The lock only guards the table: callers of other keys don't wait
+        for a load, callers of the same key wait for its Future. A failed load
+        is forgotten so the next call retries it.
+        """
+        with self._lock:
+            future = self._models.get(key)
+            loading = future is None
+            if loading:
+                future = self._models[key] = Future()
+        if loading:
+            print(f"[REGISTRY] Loading shared model: {key}")
+            try:
+                future.set_result(factory())
+            except Exception as e:
+                with self._lock:
+                    del self._models[key]
+                future.set_exception(e)
+        return future.result()
+
+    def stats(self):
+        """Per-server queue depth, request/batch counts and batch-size histogram, plus model memory."""
+        with self._lock:
+            futures = dict(self._models)
+        handles = {key: f.result() for key, f in futures.items() if f.done() and f.exception() is None}
+        out = {}
+        for key, handle in handles.items():
+            servers = {s.name: s.stats() for s in handle.servers}
+            out[key] = {"memory_mb": handle.memory_mb(), "servers": servers}
+        return out
+
+    def report(self):
+        lines = []
+        for key, info in self.stats().items():
+            lines.append(f"{key}: {info['memory_mb']} MB")
+            for name, s in info["servers"].items():
+                lines.append(f"  {name}: queue={s['queue_depth']} requests={s['requests']} "
+                             f"batches={s['batches']} mean_batch={s['mean_batch']} hist={s['batch_hist']}")
+        return "\n".join(lines)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def get_clip(model_name="clip-ViT-B-32"):
+    def load():
+        from .embedder import ClipEmbedder
+        return SharedClip(ClipEmbedder(model_name))
+    return get_registry().get(f"clip:{model_name}", load)
+
+
+def get_detector(model_name="yolo26n.pt"):
+    def load():
+        from .detector import ObjectDetector
+        return SharedDetector(ObjectDetector(model_name))
+    return get_registry().get(f"yolo:{model_name}", load)
+
+
+def get_identity_encoder():
+    def load():
+        from src.visual_cortex.reid import IdentityEncoder
+        return SharedIdentityEncoder(IdentityEncoder())
+    return get_registry().get("reid", load)
+
+
+def get_ocr():
+    def load():
+        from .ocr import OCRProcessor
+        return SharedOCR(OCRProcessor())
+    return get_registry().get("ocr", load)
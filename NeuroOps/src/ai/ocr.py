@@ -49,3 +49,67 @@ class OCRProcessor:
             })
             
         return detections
+
+    def detect_regions(self, frame, rois):
+        """
+        Runs only the text detector inside the given ROIs, as one batch
+        (crops are zero-padded to a common size).
+        Args:
+            frame (numpy.ndarray): The video frame (RGB).
+            rois (list): [x1, y1, x2, y2] regions in frame coordinates.
+        Returns:
+            list: One list of text boxes [x1, y1, x2, y2] (frame coordinates) per ROI.
+        """
+        if not rois:
+            return []
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in rois]
+        h = max(c.shape[0] for c in crops)
+        w = max(c.shape[1] for c in crops)
+        batch = np.zeros((len(crops), h, w, 3), dtype=np.uint8)
+        for i, c in enumerate(crops):
+            batch[i, :c.shape[0], :c.shape[1]] = c
+
+        horizontal, free = self.reader.detect(batch, reformat=False)
+        boxes = []
+        for (x1, y1, _, _), hor, fre in zip(rois, horizontal, free):
+            found = [[x1 + b[0], y1 + b[2], x1 + b[1], y1 + b[3]] for b in hor]
+            # Rotated boxes are read through their upright bounding box
+            for pts in fre:
+                xs = [p[0] for p in pts]
+                ys = [p[1] for p in pts]
+                found.append([x1 + min(xs), y1 + min(ys), x1 + max(xs), y1 + max(ys)])
+            boxes.append([[int(v) for v in b] for b in found])
+        return boxes
+
+    def recognize_boxes(self, frame, boxes):
+        """
+        Recognizes text in known text boxes with a single recognizer call
+        (no detection pass).
+        Args:
+            frame (numpy.ndarray): The video frame (RGB).
+            boxes (list): [x1, y1, x2, y2] text boxes in frame coordinates.
+        Returns:
+            list: One {'bbox', 'text', 'confidence'} dict (or None) per box.
+        """
+        h, w = frame.shape[:2]
+        clipped = [[max(0, int(x1)), max(0, int(y1)), min(w, int(x2)), min(h, int(y2))] for x1, y1, x2, y2 in boxes]
+        valid = [b for b in clipped if b[2] > b[0] and b[3] > b[1]]
+        if not valid:
+            return [None] * len(boxes)
+
+        results = self.reader.recognize(
+            frame,
+            horizontal_list=[[x1, x2, y1, y2] for x1, y1, x2, y2 in valid],
+            free_list=[],
+            batch_size=len(valid)
+        )
+        # EasyOCR sorts its output by position; map back through the box corners
+        by_box = {}
+        for bbox, text, prob in results:
+            (x1, y1), (x2, y2) = bbox[0], bbox[2]
+            by_box[(int(x1), int(y1), int(x2), int(y2))] = {
+                'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                'text': text,
+                'confidence': float(prob)
+            }
+        return [by_box.get(tuple(b)) for b in clipped]
@@ -0,0 +1,178 @@
+"""
+ROI-driven OCR: text is read only inside YOLO boxes of configured classes
+and in fixed sign regions, instead of over the whole frame. Boxes are
+tracked across sampled frames so each plate is read until it is legible
+and then served from the per-track cache.
+"""
+import json
+import os
+
+DEFAULT_CONFIG = {
+    "container_classes": ["car", "truck", "bus", "motorcycle"],  # text detector runs inside these
+    "text_classes": ["license plate", "license_plate"],          # the box itself is the text
+    "sign_regions": [],        # fixed [x1, y1, x2, y2] regions, normalized to 0..1
+    "sign_interval_s": 3.0,
+    "min_roi_px": 24,
+    "min_text_confidence": 0.4,
+    "accept_confidence": 0.8,  # a track read this well is never read again
+    "retry_s": 1.0,            # unresolved tracks are retried at most this often
+    "full_frame": False,       # legacy whole-frame OCR instead of ROIs
+}
+
+
+def load_ocr_config(path=None):
+    if path is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        path = os.path.join(base_dir, "configs", "ocr.json")
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                config.update(json.load(f))
+        except Exception as e:
+            print(f"[OCR] Error loading {path}: {e}")
+    return config
+
+
+def iou(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+
+class RoiTracker:
+    """Greedy IoU tracker for the sparse, sampled frames the pipeline sees."""
+    def __init__(self, iou_threshold=0.3, max_age_s=2.0):
+        self.iou_threshold = iou_threshold
+        self.max_age_s = max_age_s
+        self.tracks = {}  # id -> {"box", "class_name", "last_seen"}
+        self.next_id = 1
+
+    def update(self, detections, timestamp):
+        """detections: [(xyxy, class_name)]. Returns a track id per detection."""
+        pairs = []
+        for t_id, t in self.tracks.items():
+            for i, (box, cls) in enumerate(detections):
+                if cls == t["class_name"]:
+                    score = iou(box, t["box"])
+                    if score >= self.iou_threshold:
+                        pairs.append((score, t_id, i))
+        pairs.sort(reverse=True)
+
+        ids = [None] * len(detections)
+        used = set()
+        for _, t_id, i in pairs:
+            if ids[i] is None and t_id not in used:
+                ids[i] = t_id
+                used.add(t_id)
+        for i, (box, cls) in enumerate(detections):
+            if ids[i] is None:
+                ids[i] = self.next_id
+                self.next_id += 1
+            self.tracks[ids[i]] = {"box": list(box), "class_name": cls, "last_seen": timestamp}
+        return ids
+
+    def expire(self, timestamp):
+        """Drops tracks not seen for max_age_s; returns their ids."""
+        gone = [t_id for t_id, t in self.tracks.items() if timestamp - t["last_seen"] > self.max_age_s]
+        for t_id in gone:
+            del self.tracks[t_id]
+        return gone
+
+
+class RoiOCR:
+    """
+    Per-video OCR stage. process() returns the readings of a frame: dicts
+    with bbox, text, confidence, track_id and class_name. Tracks served
+    from the cache come back as their best reading so far with
+    cached=True, so the caller can keep their time span open.
+    """
+    def __init__(self, ocr, config=None):
+        self.ocr = ocr
+        self.config = config or load_ocr_config()
+        self.tracker = RoiTracker()
+        self.cache = {}          # track id -> {"text", "confidence", "bbox", "last_try"}
+        self.last_sign_read = None
+        self.reads = 0
+        self.cache_hits = 0
+
+    def _rois(self, frame, detections):
+        cfg = self.config
+        wanted = set(cfg["container_classes"]) | set(cfg["text_classes"])
+        h, w = frame.shape[:2]
+        rois = []
+        for (x1, y1, x2, y2), cls in detections:
+            if cls not in wanted or min(x2 - x1, y2 - y1) < cfg["min_roi_px"]:
+                continue
+            pad = 0.05 * max(x2 - x1, y2 - y1)
+            rois.append(([int(max(0, x1 - pad)), int(max(0, y1 - pad)),
+                          int(min(w, x2 + pad)), int(min(h, y2 + pad))], cls))
+        return rois
+
+    def _due(self, track_id, timestamp):
+        entry = self.cache.get(track_id)
+        if entry is None:
+            return True
+        if entry["confidence"] >= self.config["accept_confidence"]:
+            return False
+        return timestamp - entry["last_try"] >= self.config["retry_s"]
+
+    def process(self, frame, detections, timestamp):
+        cfg = self.config
+        rois = self._rois(frame, detections)
+        track_ids = self.tracker.update(rois, timestamp)
+        for t_id in self.tracker.expire(timestamp):
+            self.cache.pop(t_id, None)
+
+        containers, text_boxes, owners = [], [], []
+        readings = []
+        for (box, cls), t_id in zip(rois, track_ids):
+            if not self._due(t_id, timestamp):
+                self.cache_hits += 1
+                entry = self.cache[t_id]
+                if entry["text"] is not None:
+                    readings.append({"bbox": entry["bbox"], "text": entry["text"],
+                                     "confidence": entry["confidence"], "track_id": t_id,
+                                     "class_name": cls, "cached": True})
+                continue
+            self.cache.setdefault(t_id, {"text": None, "confidence": 0.0, "bbox": None, "last_try": timestamp})
+            self.cache[t_id]["last_try"] = timestamp
+            if cls in cfg["text_classes"]:
+                text_boxes.append(box)
+                owners.append((t_id, cls))
+            else:
+                containers.append((box, t_id, cls))
+
+        # Fixed sign regions, re-read on their own interval
+        if cfg["sign_regions"] and (self.last_sign_read is None
+                                    or timestamp - self.last_sign_read >= cfg["sign_interval_s"]):
+            self.last_sign_read = timestamp
+            h, w = frame.shape[:2]
+            for i, (x1, y1, x2, y2) in enumerate(cfg["sign_regions"]):
+                text_boxes.append([int(x1 * w), int(y1 * h), int(x2 * w), int(y2 * h)])
+                owners.append((f"sign-{i}", "sign"))
+
+        # Text detector only inside vehicle ROIs, one batch for the frame
+        if containers:
+            found = self.ocr.detect_regions(frame, [box for box, _, _ in containers])
+            for (_, t_id, cls), boxes in zip(containers, found):
+                for b in boxes:
+                    text_boxes.append(b)
+                    owners.append((t_id, cls))
+
+        if not text_boxes:
+            return readings
+
+        # All text boxes of the frame in one recognizer call
+        self.reads += len(text_boxes)
+        for (t_id, cls), res in zip(owners, self.ocr.recognize_boxes(frame, text_boxes)):
+            if not res or not res['text'].strip() or res['confidence'] < cfg["min_text_confidence"]:
+                continue
+            entry = self.cache.get(t_id)
+            if entry is not None and res['confidence'] > entry["confidence"]:
+                entry["text"], entry["confidence"], entry["bbox"] = res['text'], res['confidence'], res['bbox']
+            readings.append(dict(res, track_id=t_id, class_name=cls))
+        return readings
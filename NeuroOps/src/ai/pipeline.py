@@ -2,6 +2,261 @@ from PyQt6.QtCore import QThread, pyqtSignal
 import numpy as np
 import time
 
+# Detections below this confidence skip CLIP / Re-ID / OCR
+CONF_THRESHOLD = 0.4
+# Whole-frame OCR pass (full_frame mode) once per this many seconds
+OCR_INTERVAL_S = 3.0
+
+
+class FrameAnalyzer:
+    """
+    Everything done to one sampled frame: detection, rules, active
+    learning, crop storage, CLIP embedding, Re-ID and OCR. Detections go to
+    `session` and embeddings to `vector_store`, so file ingest
+    (VideoAnalysisWorker) and live camera ingest (src/ai/live.py) write the
+    same rows and points. Models come from the shared registry.
+
+    log(msg) and alert(severity, msg) are the worker's signal emitters.
+    """
+    def __init__(self, video_id, db, vector_store, session, log=print, alert=None, detector=None, embedder=None):
+        from .model_registry import get_detector, get_clip
+        from .tiled_detection import AdaptiveDetector, adaptive_enabled
+        from .ocr_roi import load_ocr_config
+        from .text_consolidation import TextConsolidator
+        from src.data.crop_store import get_crop_store
+        from src.decision_engine.core import DecisionCore
+        from src.active_learning.label_studio import LabelStudioConnector
+        from src.agency.agent import AutonomousAgent
+
+        self.video_id = video_id
+        self.db = db
+        self.vector_store = vector_store
+        self.session = session
+        self.log = log
+        self.alert = alert or (lambda severity, msg: None)
+
+        self.decision_core = DecisionCore()
+        self.label_studio = LabelStudioConnector()
+        self.agent = AutonomousAgent()
+
+        # Load only essential models upfront — others load on first use.
+        # Models come from the shared registry, so concurrent analyses and
+        # searches reuse one copy and get batched together.
+        self.detector = detector
+        if not self.detector:
+            self.log("Loading YOLO detector...")
+            self.detector = get_detector("yolo26n.pt")
+            if adaptive_enabled():
+                # Coarse pass + high-res tiles over motion / weak candidates
+                self.detector = AdaptiveDetector(self.detector)
+        self.embedder = embedder
+        if not self.embedder:
+            self.log("Loading CLIP embedder...")
+            self.embedder = get_clip()
+        self.vllm = None
+        self.reid = None
+        self.ocr = None
+        self.roi_ocr = None
+        self.last_ocr = None
+
+        self.ocr_config = load_ocr_config()
+        self.crop_store = get_crop_store()
+        # Repeated readings of the same sign/plate extend one row's time span
+        self.text_rows = TextConsolidator(session, video_id)
+
+    def process(self, frame, frame_idx, timestamp, detection=None):
+        """
+        Analyses one RGB frame; returns the dashboard stats for it.
+        `detection` is the frame's YOLO result when the caller already ran
+        it (the live scheduler batches detection across cameras).
+        """
+        from src.data.models import Detection
+        from src.active_learning.sampler import EntropySampler
+        from src.visual_cortex.identity_gallery import get_identity_gallery
+
+        r = detection if detection is not None else self.detector.detect(frame)
+
+        # Collect batch items for Qdrant
+        clip_crops = []
+        clip_meta = []
+        person_crops = []
+        person_meta = []
+        ocr_boxes = []
+
+        # Store detections
+        for box in r.boxes:
+            coords = box.xyxy[0].cpu().tolist()
+            conf = float(box.conf[0].cpu())
+            cls_id = int(box.cls[0].cpu())
+            cls_name = self.detector.model.names[cls_id]
+
+            # Crop object for embedding
+            x1, y1, x2, y2 = map(int, coords)
+            h, w, _ = frame.shape
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(w, x2), min(h, y2)
+
+            point_id = None
+            # Only embed high-confidence detections
+            if x2 > x1 and y2 > y1 and conf >= CONF_THRESHOLD:
+                crop = frame[y1:y2, x1:x2]
+                ocr_boxes.append(((x1, y1, x2, y2), cls_name))
+
+                metadata = {
+                    "video_id": self.video_id,
+                    "frame_idx": frame_idx,
+                    "class_name": cls_name,
+                    "confidence": conf,
+                    "timestamp": timestamp
+                }
+                clip_crops.append(crop)
+                clip_meta.append(metadata)
+
+                # Identity Re-ID (Person Only) — encoded together after the box loop
+                if cls_name == 'person':
+                    person_crops.append(crop)
+                    person_meta.append(metadata)
+
+            # Decision Engine Evaluation
+            context = {
+                "class_name": cls_name,
+                "confidence": conf,
+                "timestamp": timestamp,
+                "zone": "default"
+            }
+            actions = self.decision_core.evaluate(context)
+            for action in actions:
+                if action['type'] == 'alert':
+                    msg = action.get('message', 'Alert')
+                    severity = action.get('severity', 'info')
+                    self.log(f"[ZEN]: {msg}")
+                    self.alert(severity, msg)
+
+                if action['type'] == 'trigger_vllm':
+                    if not self.vllm:
+                        from src.visual_cortex.vllm_client import VLLMClient
+                        self.vllm = VLLMClient()
+                    prompt = action.get('prompt', 'Describe this.')
+                    self.log(f"[VLLM]: Analyzing frame for rule...")
+                    desc = self.vllm.analyze_frame(frame, prompt)
+                    self.log(f"[VLLM RESULT]: {desc}")
+                    self.db.add_summary(
+                        video_id=self.video_id,
+                        timestamp=timestamp,
+                        content=desc,
+                        prompt=prompt
+                    )
+
+                if action['type'] == 'perform_action':
+                    tool_name = action.get('tool')
+                    params = action.get('params', {})
+                    result = self.agent.execute_action(tool_name, params)
+                    self.log(f"[AGENT]: {result}")
+
+            # Active Learning Check
+            if EntropySampler.is_uncertain(conf):
+                uncertainty = EntropySampler.calculate_entropy(conf)
+                self.log(f"[ACTIVE LEARNING] Uncertain detection ({conf:.2f}). Queueing for review...")
+                self.label_studio.upload_task(
+                    frame,
+                    {
+                        "class_name": cls_name,
+                        "confidence": conf,
+                        "uncertainty": uncertainty
+                    }
+                )
+
+            det = Detection(
+                video_id=self.video_id,
+                frame_index=frame_idx,
+                timestamp=timestamp,
+                class_name=cls_name,
+                confidence=conf,
+                bbox_xyxy=coords,
+                embedding_id=point_id
+            )
+            self.session.add(det)
+
+        # Embed all crops of the frame in one batch, then upsert them together
+        if clip_crops:
+            # Result thumbnails: the payload references the crop by content hash
+            for metadata, key in zip(clip_meta, self.crop_store.put_many(clip_crops)):
+                if key:
+                    metadata["crop"] = key
+            vectors = self.embedder.embed_images(clip_crops)
+            self.vector_store.add_embeddings_batch(list(zip(vectors, clip_meta)))
+
+        # Batch upsert identities (clustered into persons as they arrive)
+        if person_crops:
+            if not self.reid:
+                from .model_registry import get_identity_encoder
+                self.log("Loading Re-ID model...")
+                self.reid = get_identity_encoder()
+            id_vectors = self.reid.extract_features(person_crops)
+            # Crops without a usable face are skipped (None)
+            identity_batch = [(v, m) for v, m in zip(id_vectors, person_meta) if v is not None]
+            if identity_batch:
+                get_identity_gallery(self.vector_store).add_identities(identity_batch)
+
+        # OCR (lazy load). ROI mode reads text inside configured detection
+        # boxes / sign regions on every sampled frame, cached per track;
+        # full_frame keeps the periodic whole-frame pass.
+        text_results = []
+        if self.ocr_config["full_frame"] and (self.last_ocr is None or timestamp - self.last_ocr >= OCR_INTERVAL_S):
+            self.last_ocr = timestamp
+            self._load_ocr()
+            # Downscale for faster OCR
+            import cv2
+            h, w = frame.shape[:2]
+            if w > 1280:
+                scale = 1280 / w
+                small = cv2.resize(frame, (1280, int(h * scale)))
+            else:
+                small = frame
+
+            text_results = self.ocr.detect_text(small)
+        elif not self.ocr_config["full_frame"] and (ocr_boxes or self.ocr_config["sign_regions"]):
+            self._load_ocr()
+            if self.roi_ocr is None:
+                from .ocr_roi import RoiOCR
+                self.roi_ocr = RoiOCR(self.ocr, self.ocr_config)
+            text_results = self.roi_ocr.process(frame, ocr_boxes, timestamp)
+
+        for res in text_results:
+            if res.get('cached'):
+                self.text_rows.touch(res['track_id'], timestamp)  # still in view, not re-read
+            elif res['confidence'] > 0.4:
+                row = self.text_rows.add(res, frame_idx, timestamp)
+                if res['confidence'] > 0.8 and row.observations == 1:
+                     self.log(f"[OCR] Detected: {res['text']}")
+
+        # Stats
+        details = []
+        for b in r.boxes:
+            cls_id = int(b.cls[0])
+            conf = float(b.conf[0])
+            cls_name = self.detector.model.names[cls_id]
+            details.append({
+                "class": cls_name,
+                "confidence": conf,
+                "box": b.xyxy[0].tolist()
+            })
+
+        return {
+            "frame": frame_idx,
+            "timestamp": timestamp,
+            "detections": len(r.boxes),
+            "classes": [d['class'] for d in details],
+            "details": details
+        }
+
+    def _load_ocr(self):
+        if not self.ocr:
+            from .model_registry import get_ocr
+            self.log("Loading OCR engine...")
+            self.ocr = get_ocr()
+
+
 class VideoAnalysisWorker(QThread):
     progress_update = pyqtSignal(int)
     log_message = pyqtSignal(str)
@@ -18,14 +273,7 @@ class VideoAnalysisWorker(QThread):
         # Lazy-loaded in run() — avoid importing heavy libs at startup
         self.db = None
         self.vector_store = None
-        self.detector = None
-        self.embedder = None
-        self.decision_core = None
-        self.vllm = None
-        self.label_studio = None
-        self.reid = None
-        self.agent = None
-        self.ocr = None
+        self.analyzer = None
 
     def run(self):
         self.log_message.emit(f"Starting analysis for: {self.video_path}")
@@ -33,42 +281,29 @@ class VideoAnalysisWorker(QThread):
         try:
             # Deferred imports — only loaded when analysis actually starts
             import imageio.v3 as iio
-            from .detector import ObjectDetector
-            from .embedder import ClipEmbedder
+            from .model_registry import get_registry
             from src.data.db_manager import DatabaseManager
-            from src.data.models import Detection, TextDetection
             from src.data.vector_store import VectorStore
-            from src.decision_engine.core import DecisionCore
-            from src.visual_cortex.vllm_client import VLLMClient
-            from src.active_learning.sampler import EntropySampler
-            from src.active_learning.label_studio import LabelStudioConnector
-            from src.visual_cortex.reid import IdentityEncoder
-            from src.agency.agent import AutonomousAgent
-            from src.ai.ocr import OCRProcessor
 
             # Lazy-init services
             if not self.db:
                 self.db = DatabaseManager()
             if not self.vector_store:
                 self.vector_store = VectorStore(str(self.video_id))
-            if not self.decision_core:
-                self.decision_core = DecisionCore()
-            if not self.label_studio:
-                self.label_studio = LabelStudioConnector()
-            if not self.agent:
-                self.agent = AutonomousAgent()
-
-            # Load only essential models upfront — others load on first use
-            self.log_message.emit("Loading YOLO detector...")
-            if not self.detector:
-                self.detector = ObjectDetector("yolo26n.pt")
-            
-            self.log_message.emit("Loading CLIP embedder...")
-            if not self.embedder:
-                self.embedder = ClipEmbedder()
+
+            session = self.db.get_session()
+            self.analyzer = FrameAnalyzer(self.video_id, self.db, self.vector_store, session,
+                                          log=self.log_message.emit, alert=self.alert_triggered.emit)
             
             self.log_message.emit("Models ready. Starting frame processing...")
 
+            # Keyframe index for frame-accurate seeking in the workbench (demux only, cached)
+            try:
+                from src.core.video.keyframe_index import KeyframeIndex
+                KeyframeIndex.load_or_build(self.video_path)
+            except Exception as e:
+                self.log_message.emit(f"[DECODER] Keyframe index skipped: {e}")
+
             # Read video metadata
             props = iio.improps(self.video_path, plugin="pyav")
             total_frames = props.shape[0] if props.shape else 0
@@ -76,15 +311,12 @@ class VideoAnalysisWorker(QThread):
 
             # --- Performance tuning ---
             FRAME_SKIP = 15          # Process every 15th frame (~2 fps)
-            CONF_THRESHOLD = 0.4     # Skip CLIP/Re-ID for low-confidence
-            OCR_INTERVAL = 90        # OCR once per ~3 seconds
             COMMIT_INTERVAL = 90     # DB commit interval
             
             # Using basic imageio iterator
             reader = iio.imread(self.video_path, plugin="pyav", index=None)
             
             frame_idx = 0
-            session = self.db.get_session()
             
             for frame in reader:
                 if not self.is_running:
@@ -92,164 +324,7 @@ class VideoAnalysisWorker(QThread):
                 
                 # Process only every Nth frame
                 if frame_idx % FRAME_SKIP == 0:
-                    r = self.detector.detect(frame)
-                    
-                    # Collect batch items for Qdrant
-                    embedding_batch = []
-                    identity_batch = []
-                    
-                    # Store detections
-                    for box in r.boxes:
-                        coords = box.xyxy[0].cpu().tolist()
-                        conf = float(box.conf[0].cpu())
-                        cls_id = int(box.cls[0].cpu())
-                        cls_name = self.detector.model.names[cls_id]
-
-                        # Crop object for embedding
-                        x1, y1, x2, y2 = map(int, coords)
-                        h, w, _ = frame.shape
-                        x1, y1 = max(0, x1), max(0, y1)
-                        x2, y2 = min(w, x2), min(h, y2)
-                        
-                        point_id = None
-                        # Only embed high-confidence detections
-                        if x2 > x1 and y2 > y1 and conf >= CONF_THRESHOLD:
-                            crop = frame[y1:y2, x1:x2]
-                            vector = self.embedder.embed_image(crop)
-                            
-                            metadata = {
-                                "video_id": self.video_id,
-                                "frame_idx": frame_idx,
-                                "class_name": cls_name,
-                                "confidence": conf,
-                                "timestamp": frame_idx / fps
-                            }
-                            embedding_batch.append((vector, metadata))
-                            
-                            # Identity Re-ID (Person Only — lazy load)
-                            if cls_name == 'person':
-                                if not self.reid:
-                                    self.log_message.emit("Loading Re-ID model...")
-                                    self.reid = IdentityEncoder()
-                                id_vector = self.reid.extract_feature(crop)
-                                identity_batch.append((id_vector, metadata))
-
-                        # Decision Engine Evaluation
-                        context = {
-                            "class_name": cls_name,
-                            "confidence": conf,
-                            "timestamp": frame_idx / fps,
-                            "zone": "default"
-                        }
-                        actions = self.decision_core.evaluate(context)
-                        for action in actions:
-                            if action['type'] == 'alert':
-                                msg = action.get('message', 'Alert')
-                                severity = action.get('severity', 'info')
-                                self.log_message.emit(f"[ZEN]: {msg}")
-                                self.alert_triggered.emit(severity, msg)
-                            
-                            if action['type'] == 'trigger_vllm':
-                                if not self.vllm:
-                                    self.vllm = VLLMClient()
-                                prompt = action.get('prompt', 'Describe this.')
-                                self.log_message.emit(f"[VLLM]: Analyzing frame for rule...")
-                                desc = self.vllm.analyze_frame(frame, prompt)
-                                self.log_message.emit(f"[VLLM RESULT]: {desc}")
-                                self.db.add_summary(
-                                    video_id=self.video_id,
-                                    timestamp=frame_idx / fps,
-                                    content=desc,
-                                    prompt=prompt
-                                )
-
-                            if action['type'] == 'perform_action':
-                                tool_name = action.get('tool')
-                                params = action.get('params', {})
-                                result = self.agent.execute_action(tool_name, params)
-                                self.log_message.emit(f"[AGENT]: {result}")
-
-                        # Active Learning Check
-                        if EntropySampler.is_uncertain(conf):
-                            uncertainty = EntropySampler.calculate_entropy(conf)
-                            self.log_message.emit(f"[ACTIVE LEARNING] Uncertain detection ({conf:.2f}). Queueing for review...")
-                            self.label_studio.upload_task(
-                                frame,
-                                {
-                                    "class_name": cls_name,
-                                    "confidence": conf,
-                                    "uncertainty": uncertainty
-                                }
-                            )
-
-                        det = Detection(
-                            video_id=self.video_id,
-                            frame_index=frame_idx,
-                            timestamp=frame_idx / fps,
-                            class_name=cls_name,
-                            confidence=conf,
-                            bbox_xyxy=coords,
-                            embedding_id=point_id
-                        )
-                        session.add(det)
-                    
-                    # Batch upsert embeddings to Qdrant (much faster than one-by-one)
-                    if embedding_batch:
-                        batch_ids = self.vector_store.add_embeddings_batch(embedding_batch)
-                    
-                    # Batch upsert identities
-                    for id_vec, id_meta in identity_batch:
-                        self.vector_store.add_identity(id_vec, id_meta)
-                    
-                    # OCR Detection (reduced frequency, lazy load)
-                    if frame_idx % OCR_INTERVAL == 0:
-                        if not self.ocr:
-                            self.log_message.emit("Loading OCR engine...")
-                            self.ocr = OCRProcessor()
-                        # Downscale for faster OCR
-                        import cv2
-                        h, w = frame.shape[:2]
-                        if w > 1280:
-                            scale = 1280 / w
-                            small = cv2.resize(frame, (1280, int(h * scale)))
-                        else:
-                            small = frame
-                        
-                        text_results = self.ocr.detect_text(small)
-                        for res in text_results:
-                            if res['confidence'] > 0.4:
-                                text_det = TextDetection(
-                                    video_id=self.video_id,
-                                    frame_index=frame_idx,
-                                    timestamp=frame_idx / fps,
-                                    text_content=res['text'],
-                                    confidence=res['confidence'],
-                                    bbox_xyxy=res['bbox']
-                                )
-                                session.add(text_det)
-                                if res['confidence'] > 0.8:
-                                     self.log_message.emit(f"[OCR] Detected: {res['text']}")
-
-                    # Emit Stats
-                    det_count = len(r.boxes)
-                    details = []
-                    for b in r.boxes:
-                        cls_id = int(b.cls[0])
-                        conf = float(b.conf[0])
-                        cls_name = self.detector.model.names[cls_id]
-                        details.append({
-                            "class": cls_name,
-                            "confidence": conf,
-                            "box": b.xyxy[0].tolist()
-                        })
-                        
-                    self.stats_update.emit({
-                        "frame": frame_idx,
-                        "timestamp": frame_idx / fps,
-                        "detections": det_count,
-                        "classes": [d['class'] for d in details],
-                        "details": details
-                    })
+                    self.stats_update.emit(self.analyzer.process(frame, frame_idx, frame_idx / fps))
 
                     if frame_idx % COMMIT_INTERVAL == 0:
                         session.commit()
@@ -260,6 +335,22 @@ class VideoAnalysisWorker(QThread):
 
             session.commit()
             session.close()
+            self.vector_store.flush()
+
+            # Thumbnail sprite atlas for the filmstrip and result cards (keyframes only, cached)
+            if self.is_running:
+                try:
+                    from src.core.video.sprites import SpriteAtlas
+                    if not SpriteAtlas.load(self.video_path):
+                        self.log_message.emit("Building thumbnail atlas...")
+                        atlas = SpriteAtlas.build(self.video_path, should_stop=lambda: not self.is_running)
+                        if atlas:
+                            self.log_message.emit(f"[SPRITES] {atlas.count} thumbnails in {len(atlas.sheets)} sheets")
+                except Exception as e:
+                    self.log_message.emit(f"[SPRITES] Thumbnail atlas skipped: {e}")
+            self.log_message.emit(f"[MODELS]\n{get_registry().report()}")
+            text_rows = self.analyzer.text_rows
+            self.log_message.emit(f"[OCR] {text_rows.inserted} text rows, {text_rows.merged} repeat readings merged")
             self.log_message.emit("Analysis Complete.")
             self.finished_processing.emit(True)
 
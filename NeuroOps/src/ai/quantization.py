@@ -0,0 +1,105 @@
+"""
+INT8 helpers for the CPU inference paths. Opt-in: pass quantize=True to
+ClipEmbedder / BiometricEngine or set NEUROOPS_INT8=1.
+"""
+import copy
+import os
+import torch
+import torch.nn.functional as F
+from torch import nn
+
+
+def int8_enabled(flag=None):
+    if flag is not None:
+        return bool(flag)
+    return os.environ.get("NEUROOPS_INT8", "").lower() in ("1", "true", "yes")
+
+
+def quantize_linear_dynamic(module):
+    """Dynamic INT8: Linear weights are quantized ahead of time, activations per batch."""
+    return torch.ao.quantization.quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8)
+
+
+class FloatPReLU(nn.Module):
+    """PReLU kept in float inside a quantized graph (the quantized PReLU kernel loses too much accuracy)."""
+    def __init__(self, prelu):
+        super().__init__()
+        self.weight = prelu.weight
+
+    def forward(self, x):
+        return F.prelu(x, self.weight)
+
+
+def _float_prelus(module):
+    for name, child in module.named_children():
+        if isinstance(child, nn.PReLU):
+            setattr(module, name, FloatPReLU(child))
+        else:
+            _float_prelus(child)
+    return module
+
+
+def quantize_static_fx(module, example_input, calibration_batches):
+    """
+    Static INT8 (FX graph mode, x86 backend): conv/linear weights and
+    activations are quantized using ranges observed on the calibration batches.
+    PReLUs run in float between dequantize/quantize.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.fx.custom_config import PrepareCustomConfig
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    module = _float_prelus(module.eval())
+    qconfig_mapping = get_default_qconfig_mapping("x86").set_object_type(FloatPReLU, None)
+    custom = PrepareCustomConfig().set_non_traceable_module_classes([FloatPReLU])
+    prepared = prepare_fx(module, qconfig_mapping, example_inputs=(example_input,),
+                          prepare_custom_config=custom)
+    with torch.no_grad():
+        for batch in calibration_batches:
+            prepared(batch)
+    return convert_fx(prepared)
+
+
+def save_scripted(module, example_input, path):
+    """Traces, freezes and saves a module so later loads skip quantization entirely."""
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(module.eval(), (example_input,)))
+    tmp = path + ".tmp"
+    torch.jit.save(traced, tmp)
+    os.replace(tmp, path)
+    return traced
+
+
+def load_scripted(path, device="cpu"):
+    return torch.jit.load(path, map_location=device).eval()
+
+
+class QuantizedAdaFace(nn.Module):
+    """
+    AdaFace backbone with a static-INT8 conv trunk. The output layer stays
+    dynamic INT8 because its BatchNorm1d(affine=False) can't be fused into
+    the Linear by FX. Returns (embedding, norm) like Backbone.forward.
+    """
+    def __init__(self, trunk, output_layer):
+        super().__init__()
+        self.trunk = trunk
+        self.output_layer = output_layer
+
+    def forward(self, x):
+        # Quantized convs hand back channels-last tensors; Flatten uses .view
+        x = self.output_layer(self.trunk(x).contiguous())
+        norm = torch.norm(x, 2, 1, True)
+        return torch.div(x, norm), norm
+
+
+def quantize_adaface(model, calibration_batches):
+    """
+    Static INT8 for an AdaFace Backbone when calibration batches are given,
+    otherwise dynamic INT8 of its Linear layer only.
+    """
+    model = copy.deepcopy(model).eval().cpu()
+    if not calibration_batches:
+        return quantize_linear_dynamic(model)
+    trunk = nn.Sequential(model.input_layer, model.body).eval()
+    trunk = quantize_static_fx(trunk, calibration_batches[0][:1], calibration_batches)
+    return QuantizedAdaFace(trunk, quantize_linear_dynamic(model.output_layer)).eval()
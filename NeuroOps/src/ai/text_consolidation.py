@@ -0,0 +1,117 @@
+"""
+Temporal consolidation of OCR readings. A reading that matches a recent
+TextDetection of the same video (overlapping box or same track, similar
+normalized text) extends that row's time span instead of adding a new row.
+"""
+import re
+from difflib import SequenceMatcher
+
+from .ocr_roi import iou
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_text(text):
+    """Upper-case alphanumerics only: "abc-123 " and "ABC 123" compare equal."""
+    return _NON_ALNUM.sub("", text.upper())
+
+
+def text_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class TextConsolidator:
+    """
+    Keeps the rows seen in the last `max_gap_s` seconds in memory and
+    matches new readings against them. Rows are added to (and updated in)
+    the caller's session; committing stays with the caller.
+    """
+    def __init__(self, session, video_id, iou_threshold=0.3, similarity=0.75, max_gap_s=10.0):
+        self.session = session
+        self.video_id = video_id
+        self.iou_threshold = iou_threshold
+        self.similarity = similarity
+        self.max_gap_s = max_gap_s
+        self.recent = []  # {"row", "bbox", "norm", "track_id", "confidence", "last_seen"}
+        self.inserted = 0
+        self.merged = 0
+
+    def _match(self, bbox, norm, track_id):
+        best, best_score = None, 0.0
+        for entry in self.recent:
+            same_place = (track_id is not None and entry["track_id"] == track_id) \
+                or iou(bbox, entry["bbox"]) >= self.iou_threshold
+            if not same_place:
+                continue
+            score = text_similarity(norm, entry["norm"])
+            if score >= self.similarity and score > best_score:
+                best, best_score = entry, score
+        return best
+
+    def add(self, res, frame_idx, timestamp):
+        """
+        res: OCR result dict (bbox, text, confidence[, track_id]).
+        Returns the TextDetection row the reading was stored in.
+        """
+        from src.data.models import TextDetection
+
+        self.recent = [e for e in self.recent if timestamp - e["last_seen"] <= self.max_gap_s]
+        norm = normalize_text(res['text'])
+        track_id = res.get('track_id')
+        entry = self._match(res['bbox'], norm, track_id)
+
+        if entry is None:
+            row = TextDetection(
+                video_id=self.video_id,
+                frame_index=frame_idx,
+                timestamp=timestamp,
+                last_seen=timestamp,
+                observations=1,
+                text_content=res['text'],
+                confidence=res['confidence'],
+                bbox_xyxy=res['bbox']
+            )
+            self.session.add(row)
+            self.recent.append({"row": row, "bbox": res['bbox'], "norm": norm, "track_id": track_id,
+                                "confidence": res['confidence'], "last_seen": timestamp, "observations": 1})
+            self.inserted += 1
+            return row
+
+        # Extend the span; keep the best-confidence reading
+        entry["last_seen"] = timestamp
+        entry["bbox"] = res['bbox']  # follow moving plates
+        entry["observations"] += 1
+        if track_id is not None:
+            entry["track_id"] = track_id
+        row = entry["row"]
+        row.last_seen = timestamp
+        row.observations = entry["observations"]
+        if res['confidence'] > entry["confidence"]:
+            entry["confidence"] = res['confidence']
+            entry["norm"] = norm
+            row.text_content = res['text']
+            row.confidence = res['confidence']
+            row.bbox_xyxy = res['bbox']
+        self.merged += 1
+        return row
+
+    def touch(self, track_id, timestamp):
+        """
+        The OCR track `track_id` is still in view (served from the OCR
+        cache, not re-read): extends the rows it was read into. Returns
+        them.
+        """
+        rows = []
+        for entry in self.recent:
+            if entry["track_id"] == track_id and timestamp > entry["last_seen"]:
+                entry["last_seen"] = timestamp
+                entry["observations"] += 1
+                row = entry["row"]
+                row.last_seen = timestamp
+                row.observations = entry["observations"]
+                rows.append(row)
+        return rows
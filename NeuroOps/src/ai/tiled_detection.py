@@ -0,0 +1,170 @@
+"""
+Adaptive-resolution detection for high-resolution frames: a coarse pass on
+the downscaled frame, then native-resolution tiles only where there is
+motion or low-confidence candidates, merged with cross-tile NMS.
+"""
+import os
+import numpy as np
+import cv2
+import torch
+
+
+def tile_grid(width, height, tile=640, overlap=0.2):
+    """Tiles of size `tile` covering the frame with the given fractional overlap."""
+    step = max(1, int(tile * (1 - overlap)))
+
+    def starts(size):
+        if size <= tile:
+            return [0]
+        pos = list(range(0, size - tile, step))
+        return pos + [size - tile]
+
+    return [(x, y, min(x + tile, width), min(y + tile, height))
+            for y in starts(height) for x in starts(width)]
+
+
+def box_overlap(a, b):
+    """Intersection area of two xyxy boxes."""
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0, w) * max(0, h)
+
+
+def select_tiles(tiles, regions, max_tiles=12):
+    """Tiles that intersect any region, most-covered first, at most max_tiles."""
+    scored = []
+    for t in tiles:
+        cover = sum(box_overlap(t, r) for r in regions)
+        if cover > 0:
+            scored.append((cover, t))
+    scored.sort(key=lambda s: -s[0])
+    return [t for _, t in scored[:max_tiles]]
+
+
+def motion_regions(prev_gray, gray, min_area=16):
+    """
+    Bounding boxes of changed areas between two small grayscale frames, in
+    the coordinates of those frames.
+    """
+    diff = cv2.absdiff(prev_gray, gray)
+    _, mask = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+    mask = cv2.dilate(mask, None, iterations=2)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for c in contours:
+        x, y, w, h = cv2.boundingRect(c)
+        if w * h >= min_area:
+            boxes.append((x, y, x + w, y + h))
+    return boxes
+
+
+def merge_detections(det, iou=0.5, containment=0.8):
+    """
+    Cross-tile NMS over an (N, 6) x1, y1, x2, y2, conf, cls array. Besides
+    the usual IoU test, a box mostly contained in a higher-scoring box of the
+    same class is dropped (objects cut at a tile border).
+    """
+    if len(det) == 0:
+        return det
+    import torchvision
+    boxes = torch.from_numpy(det[:, :4]).float()
+    keep = torchvision.ops.batched_nms(
+        boxes, torch.from_numpy(det[:, 4]).float(), torch.from_numpy(det[:, 5]).long(), iou
+    ).numpy()
+    det = det[keep]  # sorted by score
+
+    areas = (det[:, 2] - det[:, 0]) * (det[:, 3] - det[:, 1])
+    kept = []
+    for i in range(len(det)):
+        contained = False
+        for j in kept:
+            if det[j, 5] != det[i, 5]:
+                continue
+            if box_overlap(det[i], det[j]) >= containment * max(areas[i], 1e-6):
+                contained = True
+                break
+        if not contained:
+            kept.append(i)
+    return det[kept]
+
+
+def results_array(r):
+    """ultralytics Results -> (N, 6) float32 array."""
+    if len(r.boxes) == 0:
+        return np.zeros((0, 6), dtype=np.float32)
+    return r.boxes.data[:, :6].cpu().numpy().astype(np.float32)
+
+
+class AdaptiveDetector:
+    """
+    Wraps an ObjectDetector (or the shared registry handle) with the same
+    detect(frame) -> Results interface. Keeps per-stream state (previous
+    frame for motion), so use one instance per video/camera.
+    """
+    def __init__(self, detector, coarse_imgsz=640, tile=640, overlap=0.2, conf=0.25,
+                 low_conf=0.1, iou=0.5, max_tiles=12, motion=True):
+        self.detector = detector
+        self.model = detector.model
+        self.coarse_imgsz = coarse_imgsz
+        self.tile = tile
+        self.overlap = overlap
+        self.conf = conf
+        self.low_conf = low_conf
+        self.iou = iou
+        self.max_tiles = max_tiles
+        self.motion = motion
+
+        self._prev_small = None
+        self.frames = 0
+        self.tiles_run = 0
+
+    def _motion(self, frame):
+        h, w = frame.shape[:2]
+        scale = 320.0 / max(h, w)
+        small = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        small = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_RGB2GRAY), (5, 5), 0)
+        prev, self._prev_small = self._prev_small, small
+        if prev is None or prev.shape != small.shape:
+            return []
+        return [tuple(v / scale for v in b) for b in motion_regions(prev, small)]
+
+    def regions(self, frame, coarse):
+        """Areas worth a high-resolution look: low-confidence candidates and motion."""
+        regions = []
+        pad = self.tile * 0.1
+        for x1, y1, x2, y2, c, _ in coarse:
+            if c < self.conf:
+                regions.append((x1 - pad, y1 - pad, x2 + pad, y2 + pad))
+        if self.motion:
+            regions.extend(self._motion(frame))
+        return regions
+
+    def detect(self, frame):
+        from ultralytics.engine.results import Results
+
+        h, w = frame.shape[:2]
+        self.frames += 1
+        coarse = results_array(self.detector.predict([frame], imgsz=self.coarse_imgsz, conf=self.low_conf)[0])
+
+        # Frames not much larger than the coarse input gain nothing from tiling
+        if max(h, w) <= self.coarse_imgsz * 1.5:
+            det = coarse[coarse[:, 4] >= self.conf]
+            return Results(frame, path="", names=self.model.names, boxes=torch.from_numpy(det))
+
+        tiles = select_tiles(tile_grid(w, h, self.tile, self.overlap), self.regions(frame, coarse), self.max_tiles)
+        parts = [coarse[coarse[:, 4] >= self.conf]]
+        if tiles:
+            self.tiles_run += len(tiles)
+            crops = [np.ascontiguousarray(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in tiles]
+            for (x1, y1, _, _), r in zip(tiles, self.detector.predict(crops, imgsz=self.tile, conf=self.conf)):
+                d = results_array(r)
+                d[:, [0, 2]] += x1
+                d[:, [1, 3]] += y1
+                parts.append(d)
+
+        det = merge_detections(np.concatenate(parts), self.iou)
+        return Results(frame, path="", names=self.model.names, boxes=torch.from_numpy(det))
+
+
+def adaptive_enabled():
+    return os.environ.get("NEUROOPS_DETECTOR_MODE", "").lower() == "adaptive"
@@ -1,34 +1,140 @@
+import re
+from sqlalchemy import func
 from src.data.db_manager import DatabaseManager
 from src.data.models import TextDetection
 
+DEFAULT_WINDOW = 2.0 # seconds between co-occurring clauses
+
+# "... within 2 seconds" / "within 1.5s" at the end of a compound query
+_WINDOW_RE = re.compile(r"\s+within\s+(\d+(?:\.\d+)?)\s*(?:s|sec|secs|second|seconds)?\s*$", re.IGNORECASE)
+# Clause separators: upper-case only, so natural phrasing stays one clause
+# ("black and white cat", "car parked near gate").
+_SPLIT_RE = re.compile(r"\s+(?:AND|NEAR|&)\s+")
+# text 'EXIT' / ocr:"EXIT" / 'EXIT'
+_TEXT_RE = re.compile(r"""^(?:(?:text|ocr)\s*[:=]?\s*)?(['"])(.+)\1$|^(?:text|ocr)\s*[:=]\s*(\S.*)$""", re.IGNORECASE)
+
+
+def parse_compound_query(text_query):
+    """
+    Splits an analyst query into clauses and a time window.
+
+    "person AND bicycle within 2 seconds" -> [vector 'person', vector 'bicycle'], 2.0
+    "red car NEAR text 'EXIT'"           -> [vector 'red car', text 'EXIT'], DEFAULT_WINDOW
+
+    Returns (clauses, window); clauses are {"kind": "vector"|"text", "query": str}.
+    """
+    window = DEFAULT_WINDOW
+    query = text_query.strip()
+    m = _WINDOW_RE.search(query)
+    if m:
+        window = float(m.group(1))
+        query = query[:m.start()]
+
+    clauses = []
+    for part in _SPLIT_RE.split(query):
+        part = part.strip()
+        if not part:
+            continue
+        t = _TEXT_RE.match(part)
+        if t:
+            clauses.append({"kind": "text", "query": (t.group(2) or t.group(3)).strip()})
+        else:
+            clauses.append({"kind": "vector", "query": part})
+    return clauses, window
+
+
+def temporal_join(partials, moments, window):
+    """
+    Sort-merge join of partial matches with one clause's moments.
+
+    A moment is {"video_id", "timestamp", "score", ...} with an optional
+    "end" for text seen over a span. A partial is {"video_id", "lo", "hi",
+    "start", "end", "score", "parts"}, where lo is the latest start and hi
+    the earliest end of its parts. A moment extends a partial when they
+    share a video and some `window`-second interval touches every part,
+    i.e. max(starts) - min(ends) <= window. For point moments this is
+    "all timestamps within `window`". Partials are sorted by lo per video,
+    so every moment only scans the partials that can still match.
+    """
+    from bisect import bisect_left, bisect_right
+
+    by_video = {}
+    for p in partials:
+        if "lo" not in p:
+            # Point-only partial: the latest start is its end, the earliest end its start
+            p = dict(p, lo=p["end"], hi=p["start"])
+        by_video.setdefault(p["video_id"], []).append(p)
+    index = {}
+    for vid, plist in by_video.items():
+        plist.sort(key=lambda p: p["lo"])
+        # hi - lo bounds how far below a moment a matching partial's lo can be
+        spread = max(0.0, max(p["hi"] - p["lo"] for p in plist))
+        index[vid] = ([p["lo"] for p in plist], spread)
+
+    joined = []
+    for m in moments:
+        plist = by_video.get(m["video_id"])
+        if not plist:
+            continue
+        los, spread = index[m["video_id"]]
+        ms = m["timestamp"]
+        me = m.get("end", ms)
+        first = bisect_left(los, ms - window - spread)
+        last = bisect_right(los, me + window)
+
+        for p in plist[first:last]:
+            lo, hi = max(p["lo"], ms), min(p["hi"], me)
+            if lo - hi <= window:
+                joined.append({
+                    "video_id": p["video_id"],
+                    "lo": lo,
+                    "hi": hi,
+                    "start": min(lo, hi),
+                    "end": max(lo, hi),
+                    "score": p["score"] + m["score"],
+                    "parts": p["parts"] + [m],
+                })
+    return joined
+
+
 class SearchEngine:
-    def __init__(self, collection_suffix="1"):
+    def __init__(self, collection_suffix="1", embedder=None, vector_store=None, db=None):
         # Lazy imports — avoid loading CLIP/qdrant at app startup
-        from src.ai.embedder import ClipEmbedder
-        from src.data.vector_store import VectorStore
+        if embedder is None:
+            from src.ai.model_registry import get_clip
+            embedder = get_clip()
+        if vector_store is None:
+            from src.data.vector_store import VectorStore
+            vector_store = VectorStore(collection_suffix=str(collection_suffix))
 
-        self.embedder = ClipEmbedder()
-        self.vector_store = VectorStore(collection_suffix=str(collection_suffix))
-        self.db = DatabaseManager()
+        self.embedder = embedder
+        self.vector_store = vector_store
+        self.db = db or DatabaseManager()
         self.video_id = int(collection_suffix) if str(collection_suffix).isdigit() else None
 
     def search(self, text_query, limit=10):
+        # Compound queries ("person AND bicycle within 2 seconds") go through the planner
+        clauses, window = parse_compound_query(text_query)
+        if len(clauses) > 1:
+            return self.search_compound(text_query, limit=limit)
+
         # 1. Convert text to vector and search Qdrant
         query_vector = self.embedder.embed_text(text_query)
         vector_results = self.vector_store.search(query_vector, limit=limit)
-        
+
         # 2. Search Text Detections via SQL
         text_results = self._search_internal_text(text_query)
 
         # 3. Format & Merge results
         formatted_results = []
-        
+
         # Add Text Matches first (High Priority)
         for t in text_results:
             formatted_results.append({
                 "score": 1.0, # Exact/Partial text match is high confidence
                 "video_id": t.video_id,
                 "timestamp": t.timestamp,
+                "end": t.last_seen if t.last_seen is not None else t.timestamp,
                 "class_name": f"TEXT: {t.text_content}",
                 "frame_idx": t.frame_index
             })
@@ -41,26 +147,165 @@ class SearchEngine:
                 "video_id": payload.get("video_id"),
                 "timestamp": payload.get("timestamp"),
                 "class_name": payload.get("class_name"),
-                "frame_idx": payload.get("frame_idx")
+                "frame_idx": payload.get("frame_idx"),
+                "crop": payload.get("crop")
             })
-            
+
         return formatted_results[:limit*2] # Return slightly more if mixed
 
-    def _search_internal_text(self, query):
+    def search_compound(self, text_query, limit=10, window=None, clause_limit=200):
         """
-        Simple SQL LIKE search for text detections.
+        Co-occurrence search: every clause must match within `window` seconds
+        in the same video.
+
+        Plan: text clauses run first (SQL, cheap and selective), vector clauses
+        after. The first clause takes its global top `clause_limit`; every
+        later clause runs once per time window the partials so far leave open
+        (see _candidate_windows), with `clause_limit` per window, so a moment
+        next to a partial is found however many better matches the
+        collection has elsewhere. The survivors are joined with a sort-merge
+        over timestamps. An empty intermediate result stops early.
         """
-        if not self.video_id:
+        clauses, parsed_window = parse_compound_query(text_query)
+        window = parsed_window if window is None else window
+        if not clauses:
             return []
-            
+
+        clauses = sorted(clauses, key=lambda c: 0 if c["kind"] == "text" else 1)
+        partials = None
+        for clause in clauses:
+            if partials is None:
+                moments = self._run_clause(clause, None, clause_limit)
+            else:
+                moments, seen = [], set()
+                for video_id, lo, hi in self._candidate_windows(partials, window):
+                    candidates = {"video_id": [video_id], "timestamp": {"gte": lo, "lte": hi}}
+                    for m in self._run_clause(clause, candidates, clause_limit):
+                        key = (m["video_id"], m["timestamp"], m.get("frame_idx"), m["label"])
+                        if key not in seen:  # a text span can overlap two windows
+                            seen.add(key)
+                            moments.append(m)
+            if partials is None:
+                partials = [{
+                    "video_id": m["video_id"],
+                    "lo": m["timestamp"],
+                    "hi": m.get("end", m["timestamp"]),
+                    "start": m["timestamp"],
+                    "end": m.get("end", m["timestamp"]),
+                    "score": m["score"],
+                    "parts": [m],
+                } for m in moments]
+            else:
+                partials = temporal_join(partials, moments, window)
+            if not partials:
+                return []
+
+        return self._format_compound(partials, len(clauses), window, limit)
+
+    @staticmethod
+    def _candidate_windows(partials, window):
+        """
+        [(video_id, gte, lte)] time ranges still in play. A moment [s, e] can
+        join a partial iff e >= lo - window and s <= hi + window; overlapping
+        ranges of a video are merged.
+        """
+        ranges = sorted(((p["video_id"], p["lo"] - window, p["hi"] + window) for p in partials),
+                        key=lambda r: (str(r[0]), r[1]))
+        merged = []
+        for video_id, lo, hi in ranges:
+            if merged and merged[-1][0] == video_id and lo <= merged[-1][2]:
+                merged[-1][2] = max(merged[-1][2], hi)
+            else:
+                merged.append([video_id, lo, hi])
+        return [tuple(r) for r in merged]
+
+    def _run_clause(self, clause, candidates, clause_limit):
+        """Runs one clause and returns its moments."""
+        if clause["kind"] == "text":
+            rows = self._search_internal_text(
+                clause["query"],
+                video_ids=candidates["video_id"] if candidates else None,
+                time_range=candidates.get("timestamp") if candidates else None,
+                limit=clause_limit
+            )
+            return [{
+                "video_id": t.video_id,
+                "timestamp": t.timestamp,
+                "end": t.last_seen if t.last_seen is not None else t.timestamp,
+                "frame_idx": t.frame_index,
+                "score": 1.0,
+                "label": f"TEXT: {t.text_content}",
+            } for t in rows]
+
+        query_vector = self.embedder.embed_text(clause["query"])
+        hits = self.vector_store.search(query_vector, limit=clause_limit, filters=candidates)
+        moments = []
+        for hit in hits:
+            payload = hit.payload or {}
+            if payload.get("timestamp") is None:
+                continue
+            moments.append({
+                "video_id": payload.get("video_id"),
+                "timestamp": payload.get("timestamp"),
+                "frame_idx": payload.get("frame_idx"),
+                "score": hit.score,
+                "label": payload.get("class_name") or clause["query"],
+                "crop": payload.get("crop"),
+            })
+        return moments
+
+    @staticmethod
+    def _format_compound(partials, n_clauses, window, limit):
+        # Best match first; drop matches overlapping an already kept moment
+        partials.sort(key=lambda p: -p["score"])
+        kept = []
+        for p in partials:
+            if any(k["video_id"] == p["video_id"] and abs(k["start"] - p["start"]) < window for k in kept):
+                continue
+            kept.append(p)
+            if len(kept) >= limit:
+                break
+
+        results = []
+        for p in kept:
+            first = min(p["parts"], key=lambda m: m["timestamp"])
+            results.append({
+                "score": p["score"] / n_clauses,
+                "video_id": p["video_id"],
+                "timestamp": p["start"],
+                "end": p["end"],
+                "class_name": " + ".join(m["label"] for m in p["parts"]),
+                "frame_idx": first.get("frame_idx"),
+                "crop": next((m["crop"] for m in p["parts"] if m.get("crop")), None),
+                "parts": p["parts"],
+            })
+        return results
+
+    def _search_internal_text(self, query, video_ids=None, time_range=None, limit=20):
+        """
+        Simple SQL LIKE search for text detections.
+        Scoped to this engine's video unless video_ids is given.
+        """
+        if video_ids is None:
+            if not self.video_id:
+                return []
+            video_ids = [self.video_id]
+
         session = self.db.get_session()
         try:
             # Case-insensitive search using ilike or equivalent in logic
             # SQLite default is case-insensitive for ASCII, usually.
-            results = session.query(TextDetection).filter(
-                TextDetection.video_id == self.video_id,
+            q = session.query(TextDetection).filter(
+                TextDetection.video_id.in_(video_ids),
                 TextDetection.text_content.ilike(f"%{query}%")
-            ).limit(20).all()
+            )
+            if time_range:
+                # Rows cover [timestamp, last_seen]; keep those overlapping the range
+                q = q.filter(
+                    func.coalesce(TextDetection.last_seen, TextDetection.timestamp) >= time_range["gte"],
+                    TextDetection.timestamp <= time_range["lte"]
+                )
+            results = q.order_by(TextDetection.timestamp).limit(limit).all()
             return results
         except Exception as e:
             print(f"Text Search Error: {e}")
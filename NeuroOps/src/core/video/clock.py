@@ -0,0 +1,34 @@
+import time
+
+
+class PlaybackClock:
+    """
+    Presentation clock: maps a frame's PTS (seconds) to the monotonic time
+    it is due on screen at the current playback rate. Anchored on the first
+    frame asked about after a reset (play, seek, rate change), so decode
+    cost never accumulates into drift.
+    """
+    def __init__(self, rate=1.0, now=time.monotonic):
+        self.rate = rate
+        self.now = now
+        self.origin = None  # (wall time, pts) of the anchor frame
+
+    def reset(self):
+        self.origin = None
+
+    def anchor(self, pts):
+        self.origin = (self.now(), pts)
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.reset()
+
+    def due(self, pts):
+        if self.origin is None:
+            self.anchor(pts)
+        wall, origin_pts = self.origin
+        return wall + (pts - origin_pts) / self.rate
+
+    def lateness(self, pts):
+        """Seconds the frame at `pts` is overdue (negative: early)."""
+        return self.now() - self.due(pts)
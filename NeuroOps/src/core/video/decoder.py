@@ -2,6 +2,14 @@ import av
 import math
 from PyQt6.QtGui import QImage
 from PyQt6.QtCore import QMutex, QMutexLocker
+from .keyframe_index import KeyframeIndex
+
+
+def fit_size(width, height, max_w, max_h):
+    """Largest even size within (max_w, max_h) with the frame's aspect ratio; never upscales."""
+    scale = min(1.0, max_w / width, max_h / height)
+    return max(2, int(width * scale) & ~1), max(2, int(height * scale) & ~1)
+
 
 class VideoDecoder:
     """
@@ -9,12 +17,27 @@ class VideoDecoder:
     Handles container opening, seeking, and frame conversion to QImage.
     Thread-safe (locks on critical container access).
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, display_size=None, use_index=True, index_dir=None):
+        """
+        display_size: (width, height) box frames are scaled into during
+                      conversion (None = native resolution).
+        use_index: seek through the persisted keyframe index (built on the
+                   first seek if missing, see KeyframeIndex).
+        """
         self.file_path = file_path
         self.container = None
         self.stream = None
         self.video_stream_index = -1
         self.mutex = QMutex()
+        self.display_size = display_size
+        self.use_index = use_index
+        self.index_dir = index_dir
+        self.keyframes = None
+
+        # Decoded-frame stream shared by seek() and decode_frames()
+        self._frames = None
+        self._pending = []      # frames decoded ahead (seek target first)
+        self._last_pts = None   # pts of the last frame handed out
         
         # Metadata
         self.duration_sec = 0.0
@@ -65,34 +88,133 @@ class VideoDecoder:
             "height": self.height
         }
 
+    def _keyframe_index(self):
+        if self.keyframes is None and self.use_index:
+            try:
+                self.keyframes = KeyframeIndex.load_or_build(self.file_path, self.index_dir)
+            except Exception as e:
+                print(f"[DECODER] Keyframe index unavailable, seeking without it: {e}")
+                self.use_index = False
+        return self.keyframes
+
+    def _decoded(self):
+        try:
+            for packet in self.container.demux(self.stream):
+                for frame in packet.decode():
+                    if frame.pts is not None:
+                        yield frame
+        except Exception as e:
+            print(f"[DECODER] Decode Loop Error: {e}")
+
+    def _next_frame(self):
+        if self._pending:
+            return self._pending.pop(0)
+        if self._frames is None:
+            self._frames = self._decoded()
+        return next(self._frames, None)
+
+    def _decode_to(self, target_pts):
+        """
+        Decodes forward to the frame on screen at target_pts (the last one
+        with pts <= target) and leaves it at the head of the pending frames.
+        Returns it, or None if the first frame is already past the target.
+        """
+        prev = None
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                break
+            if frame.pts > target_pts:
+                self._pending.insert(0, frame)
+                break
+            prev = frame
+        if prev is not None:
+            self._pending.insert(0, prev)
+        return prev
+
     def seek(self, timestamp_sec):
         """
-        Seek to a specific timestamp in seconds.
-        Returns the iterator positioned at the keyframe.
+        Frame-accurate seek: positions the decoder so decode_frames() starts
+        with the frame displayed at timestamp_sec. Jumps to the preceding
+        keyframe from the index and decodes forward to the target PTS; a
+        forward seek within the current GOP just keeps decoding.
+        Returns the timestamp of the frame landed on, or None.
         """
         locker = QMutexLocker(self.mutex)
         if not self.container:
-            return
-            
+            return None
+
         # Convert seconds to time_base units
-        target_pts = int(timestamp_sec / self.time_base)
-        
-        # Seek (backward logic ensures we land before target)
-        self.container.seek(target_pts, stream=self.stream, any_frame=False, backward=True)
-        
-        # Flush buffers to avoid stale frames
-        for packet in self.container.demux(self.stream):
-            if packet.dts is None: continue
-            for frame in packet.decode():
-                frame_pts = frame.pts * self.time_base
-                # Decode until we reach or pass target (primitive seek-then-decode loop)
-                # For basic player, just returning the first keyframe is often acceptable feel.
-                # But for precision, we'd loop here. For now, returning generator state.
-                return # Puts decoder in fresh state
+        target_pts = int(round(timestamp_sec / self.time_base))
+        index = self._keyframe_index()
+        current = self._pending[0].pts if self._pending else self._last_pts
+
+        frame = None
+        if (index and index.pts and current is not None and self._frames is not None
+                and current <= target_pts and index.position(current) == index.position(target_pts)):
+            # None when the target frame was already handed out; re-seek then
+            frame = self._decode_to(target_pts)
+        if frame is None:
+            i = index.position(target_pts) if index and index.pts else None
+            while True:
+                # Seek (backward logic ensures we land on a keyframe at/before the offset)
+                offset = index.pts[i] if i is not None else target_pts
+                self.container.seek(offset, stream=self.stream, any_frame=False, backward=True)
+                self._frames = self._decoded()
+                self._pending = []
+                frame = self._decode_to(target_pts)
+                if frame is not None or not i:
+                    break
+                i -= 1  # the demuxer landed past the target; start one keyframe earlier
+
+        if frame is None and self._pending:
+            frame = self._pending[0]  # target precedes the first frame
+        self._last_pts = None
+        return frame.pts * self.time_base if frame is not None else None
+
+    def set_skip_frame(self, mode):
+        """
+        Frames the codec skips from now on: "DEFAULT" (none), "NONREF" (frames
+        nothing references; safe to toggle mid-stream) or "NONKEY" (keyframes
+        only; leaving it mid-GOP needs a seek, P-frames would lack references).
+        """
+        locker = QMutexLocker(self.mutex)
+        if self.stream:
+            self.stream.codec_context.skip_frame = mode
+
+    def set_display_size(self, size):
+        """(width, height) of the target view, or None for native resolution."""
+        self.display_size = size
+
+    def output_size(self):
+        if not self.display_size:
+            return self.width, self.height
+        w, h = fit_size(self.width, self.height, *self.display_size)
+        # swscale's fractional downscale costs more than a smaller frame saves
+        # until the frame is at least halved; otherwise the view scales it
+        if w * 2 > self.width:
+            return self.width, self.height
+        return w, h
+
+    def to_qimage(self, frame):
+        """
+        One swscale pass straight to RGB24 at the display size. The QImage
+        wraps the converted frame's plane without copying. Only the Python
+        QImage object keeps that plane alive: a C++ copy of it (a queued
+        signal argument, a QImage made from it in C++) shares the pixels
+        without owning them, so anything that crosses a thread or outlives
+        the Python object must be an owned copy (QImage.copy()).
+        """
+        w, h = self.output_size()
+        rgb = frame.reformat(width=w, height=h, format="rgb24", interpolation="FAST_BILINEAR")
+        plane = rgb.planes[0]
+        return QImage(plane, w, h, plane.line_size, QImage.Format.Format_RGB888)
 
     def decode_frames(self):
         """
-        Generator yielding (QImage, timestamp_sec).
+        Generator yielding (QImage, timestamp_sec). Each QImage wraps its own
+        converted frame, valid while the Python QImage object is referenced
+        (see to_qimage).
         """
         # Note: 'mutex' locking entire generator is tricky.
         # Ideally, outer loop holds lock per-packet demux if highly concurrent.
@@ -101,23 +223,13 @@ class VideoDecoder:
         if not self.container:
             return
 
-        try:
-            for packet in self.container.demux(self.stream):
-                for frame in packet.decode():
-                    # Convert to QImage
-                    img = frame.to_image() # PIL Image
-                    
-                    # Optimization: Use QImage constructor from buffer if possible, 
-                    # but to_qimage via PIL is safer for various pixel formats.
-                    # QImage(data, w, h, fmt) needs strict lifetime management.
-                    # Simplest robust way:
-                    data = img.tobytes("raw", "RGBA")
-                    qimg = QImage(data, img.width, img.height, QImage.Format.Format_RGBA8888).copy()
-                    
-                    timestamp = frame.pts * self.time_base
-                    yield qimg, timestamp
-        except Exception as e:
-            print(f"[DECODER] Decode Loop Error: {e}")
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            self._last_pts = frame.pts
+            timestamp = frame.pts * self.time_base
+            yield self.to_qimage(frame), timestamp
             
     def close(self):
         locker = QMutexLocker(self.mutex)
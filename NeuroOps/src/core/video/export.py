@@ -0,0 +1,344 @@
+import av
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QThread, pyqtSignal
+from .keyframe_index import KeyframeIndex
+
+# Codecs whose GOPs can be stream-copied between re-encoded boundary frames
+SMART_CODECS = ("h264",)
+
+_START_CODE = re.compile(b"\x00\x00\x00\x01|\x00\x00\x01")
+
+
+def _parameter_sets(extradata):
+    """SPS and PPS NAL units of an avcC record."""
+    sets, pos = [], 5
+    for mask in (0x1f, 0xff):
+        count = extradata[pos] & mask
+        pos += 1
+        for _ in range(count):
+            size = int.from_bytes(extradata[pos:pos + 2], "big")
+            sets.append(extradata[pos + 2:pos + 2 + size])
+            pos += 2 + size
+    return sets
+
+
+class _NalFormat:
+    """
+    Converts the boundary encoder's Annex B output to the layout of the
+    copied packets: length-prefixed when the source carries an avcC record
+    (MP4/MKV), unchanged for Annex B sources (TS). The encoder repeats its
+    SPS/PPS in band, so the source's own parameter sets are put back in
+    front of the first copied keyframe.
+    """
+    def __init__(self, extradata):
+        extradata = bytes(extradata or b"")
+        self.avcc = extradata[:1] == b"\x01"
+        if self.avcc:
+            self.length_size = (extradata[4] & 3) + 1
+            self.headers = self.pack(_parameter_sets(extradata))
+        else:
+            self.headers = extradata
+
+    def pack(self, nals):
+        return b"".join(len(nal).to_bytes(self.length_size, "big") + nal for nal in nals)
+
+    def convert(self, data):
+        if not self.avcc:
+            return data
+        return self.pack([nal for nal in _START_CODE.split(data) if nal])
+
+
+def _boundary_encoder(stream):
+    ctx = stream.codec_context
+    enc = av.CodecContext.create("libx264", "w")
+    enc.width, enc.height = ctx.width, ctx.height
+    enc.pix_fmt = ctx.pix_fmt if ctx.pix_fmt in ("yuv420p", "yuvj420p") else "yuv420p"
+    enc.time_base = stream.time_base
+    enc.framerate = stream.average_rate or 30
+    # No B-frames: packets come out in presentation order, so dts can be set freely
+    enc.options = {"bf": "0", "crf": "18", "preset": "veryfast"}
+    return enc
+
+
+def _seek_keyframe(source, stream, index, j):
+    """
+    Seeks so that demuxing resumes at keyframe j of the index (or earlier).
+    MP4/MKV seek to the keyframe at or before a pts; MPEG-TS seeks by dts to
+    whatever packet follows, so there the keyframe's dts is the target, and
+    the start of the file the last resort.
+    """
+    for target in (index.pts[j], index.dts[j]):
+        if target is None:
+            continue
+        source.seek(target, stream=stream)
+        first = next((p for p in source.demux(stream) if p.pts is not None), None)
+        if first is not None and first.is_keyframe and first.pts <= index.pts[j]:
+            source.seek(target, stream=stream)
+            return
+    source.seek(0, stream=stream)
+
+
+def _frames(source, stream, index, j, lo, hi, on_screen=False):
+    """
+    Decoded frames with lo <= pts < hi, decoding from keyframe j. With
+    on_screen the frame already showing at lo (the last with pts <= lo) is
+    the first one, as the workbench shows it.
+    """
+    _seek_keyframe(source, stream, index, j)
+    held = None
+    for frame in source.decode(stream):
+        if frame.pts is None:
+            continue
+        if frame.pts < lo or (on_screen and frame.pts == lo):
+            held = frame if on_screen else None
+            continue
+        if held is not None:
+            yield held
+            held = None
+        if frame.pts >= hi:
+            return
+        yield frame
+    if held is not None:
+        yield held
+
+
+def smart_cut(file_path, out_path, start, end, progress=None, index_dir=None, should_stop=None):
+    """
+    Frame-accurate clip of [start, end) seconds (stream timestamps, as the
+    workbench shows them) written in process with PyAV. For H.264 the GOPs
+    that lie wholly inside the clip are stream-copied and only the partial
+    GOPs at the two cuts are re-encoded; other codecs, and clips inside a
+    single GOP, are re-encoded whole. Audio is stream-copied.
+
+    progress(fraction) is called as the video is written. Returns
+    {"mode", "copied", "encoded"} (packets copied, frames encoded), or None
+    if should_stop() turned true (nothing is left behind).
+    """
+    directory, name = os.path.split(os.path.abspath(out_path))
+    tmp = os.path.join(directory, f".tmp_{name}")
+    try:
+        with av.open(file_path) as source:
+            stats = _cut(source, file_path, tmp, start, end, progress, index_dir, should_stop)
+        if stats is None:
+            os.remove(tmp)
+            return None
+        os.replace(tmp, out_path)
+        return stats
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _cut(source, file_path, tmp, start, end, progress, index_dir, should_stop):
+    vin = source.streams.video[0]
+    ain = source.streams.audio[0] if source.streams.audio else None
+    tb = vin.time_base
+    start_pts, end_pts = int(round(start / tb)), int(round(end / tb))
+    if end_pts <= start_pts:
+        raise ValueError(f"empty clip: {start:.3f}s to {end:.3f}s")
+
+    index = KeyframeIndex.load_or_build(file_path, index_dir)
+    keyframes = index.pts
+    before = max(0, bisect_right(keyframes, start_pts) - 1)  # the keyframe decoding starts from
+    i = bisect_left(keyframes, start_pts)
+    k1 = keyframes[i] if i < len(keyframes) else None
+    k2 = keyframes[bisect_right(keyframes, end_pts) - 1] if keyframes else None
+    smart = vin.codec_context.name in SMART_CODECS and k1 is not None and k2 > k1
+
+    stats = {"mode": "smart" if smart else "reencode", "copied": 0, "encoded": 0}
+    span = end_pts - start_pts
+    reported = -1
+    origin = None  # pts of the clip's first frame, its time zero
+    last_dts = None
+
+    def report(pts):
+        nonlocal reported
+        step = int(100 * min(1.0, max(0.0, (pts - start_pts) / span)))
+        if progress and step != reported:
+            reported = step
+            progress(step / 100)
+
+    with av.open(tmp, "w") as output:
+        if smart:
+            vout = output.add_stream_from_template(vin)
+            if output.format.name == "mp4" and (k1 > start_pts or k2 < end_pts):
+                vout.codec_context.codec_tag = "avc3"  # parameter sets change in band at the joins
+        else:
+            vout = output.add_stream("libx264", rate=vin.average_rate or 30)
+            vout.width, vout.height = vin.codec_context.width, vin.codec_context.height
+            vout.pix_fmt = "yuv420p"
+            vout.time_base = tb
+            vout.options = {"crf": "18", "preset": "veryfast"}
+        aout = None
+        if ain is not None:
+            try:
+                aout = output.add_stream_from_template(ain)
+            except Exception as e:
+                print(f"[EXPORT] Dropping audio ({ain.codec_context.name}): {e}")
+
+        def mux(data, pts, dts, keyframe):
+            nonlocal origin, last_dts
+            if origin is None:
+                origin = pts
+            if dts is None:  # MKV leaves some unset after a seek
+                dts = min(pts, last_dts + 1) if last_dts is not None else pts - delay
+            last_dts = dts
+            packet = av.Packet(data)
+            packet.pts, packet.dts = pts - origin, dts - origin
+            packet.time_base = tb
+            packet.is_keyframe = keyframe
+            packet.stream = vout
+            output.mux(packet)
+
+        if not smart:
+            for frame in _frames(source, vin, index, before, start_pts, end_pts, on_screen=True):
+                if should_stop and should_stop():
+                    return None
+                if origin is None:
+                    origin = frame.pts
+                report(frame.pts)
+                frame.pts -= origin
+                frame.pict_type = av.video.frame.PictureType.NONE
+                for packet in vout.encode(frame):
+                    output.mux(packet)
+                stats["encoded"] += 1
+            for packet in vout.encode():
+                output.mux(packet)
+        else:
+            nal = _NalFormat(vin.codec_context.extradata)
+            # Decode delay of the copied GOPs (B-frames); the re-encoded frames' dts lag their pts by as much
+            delay = max((p - d for p, d in zip(index.pts, index.dts) if d is not None), default=0)
+
+            def encode(frames):
+                enc = _boundary_encoder(vin)
+                for frame in frames:
+                    if should_stop and should_stop():
+                        return False
+                    frame.pict_type = av.video.frame.PictureType.NONE
+                    for packet in enc.encode(frame):
+                        mux(nal.convert(bytes(packet)), packet.pts, packet.pts - delay, packet.is_keyframe)
+                    stats["encoded"] += 1
+                    report(frame.pts)
+                for packet in enc.encode(None):
+                    mux(nal.convert(bytes(packet)), packet.pts, packet.pts - delay, packet.is_keyframe)
+                return True
+
+            # Head: the partial GOP before the first keyframe inside the clip
+            if k1 > start_pts and not encode(_frames(source, vin, index, before, start_pts, k1, on_screen=True)):
+                return None
+
+            # Middle: whole GOPs, stream-copied
+            last_copied = None
+            _seek_keyframe(source, vin, index, i)
+            for packet in source.demux(vin):
+                if packet.pts is None:
+                    continue
+                if last_copied is None and not (packet.is_keyframe and packet.pts >= k1):
+                    continue
+                if packet.is_keyframe and packet.pts >= k2:
+                    break
+                if packet.pts < k1:
+                    continue  # leading pictures of an open GOP, they reference the previous GOP
+                if should_stop and should_stop():
+                    return None
+                data = bytes(packet)
+                if last_copied is None:
+                    data = nal.headers + data
+                mux(data, packet.pts, packet.dts, packet.is_keyframe)
+                last_copied = max(last_copied or packet.pts, packet.pts)
+                stats["copied"] += 1
+                report(packet.pts)
+
+            # Tail: after the copied GOPs up to the end cut, decoded from the last copied keyframe (open GOPs)
+            last_gop = bisect_right(keyframes, last_copied) - 1
+            if not encode(_frames(source, vin, index, last_gop, last_copied + 1, end_pts)):
+                return None
+
+        if stats["encoded"] + stats["copied"] == 0:
+            raise ValueError(f"no video frames between {start:.3f}s and {end:.3f}s")
+
+        if aout is not None:
+            atb = ain.time_base
+            a_start, a_end = int(round(origin * tb / atb)), int(round(end_pts * tb / atb))
+            _seek_keyframe(source, vin, index, max(0, before - 1))
+            for packet in source.demux(ain):
+                if packet.pts is None or packet.pts < a_start:
+                    continue
+                if packet.pts >= a_end:
+                    break
+                packet.dts = (packet.dts if packet.dts is not None else packet.pts) - a_start
+                packet.pts -= a_start
+                packet.stream = aout
+                output.mux(packet)
+
+    if progress:
+        progress(1.0)
+    return stats
+
+
+def hit_clips(hits, out_dir, pad=None):
+    """
+    (file_path, out_path, start, end) for search hits: each hit's moment
+    (its [timestamp, end] for compound hits) padded by `pad` seconds,
+    default $NEUROOPS_EXPORT_PAD (2.0). Hits need 'file_path' set.
+    """
+    pad = float(os.environ.get("NEUROOPS_EXPORT_PAD", 2.0)) if pad is None else pad
+    clips = []
+    for n, hit in enumerate(hits):
+        start = max(0.0, hit["timestamp"] - pad)
+        end = (hit.get("end") or hit["timestamp"]) + pad
+        base = os.path.splitext(os.path.basename(hit["file_path"]))[0]
+        name = f"{n + 1:03d}_{base}_{hit.get('class_name', 'hit')}_{int(hit['timestamp'] * 1000)}.mp4"
+        clips.append((hit["file_path"], os.path.join(out_dir, re.sub(r"[^\w\-_.+]", "_", name)), start, end))
+    return clips
+
+
+def export_clips(clips, workers=None, progress=None, should_stop=None, index_dir=None):
+    """
+    smart_cut over many (file_path, out_path, start, end) clips on a thread
+    pool (PyAV releases the GIL in the codecs and I/O). progress(i,
+    fraction) reports clip i. Returns one stats dict, None (stopped) or
+    "error: ..." string per clip.
+    """
+    workers = workers or int(os.environ.get("NEUROOPS_EXPORT_WORKERS", min(4, os.cpu_count() or 2)))
+
+    def run(i, clip):
+        if should_stop and should_stop():
+            return None
+        try:
+            return smart_cut(*clip, progress=(lambda f: progress(i, f)) if progress else None,
+                             index_dir=index_dir, should_stop=should_stop)
+        except Exception as e:
+            return f"error: {e}"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, range(len(clips)), clips))
+
+
+class ClipExportJob(QThread):
+    """Exports clips in the background (see export_clips)."""
+    progress = pyqtSignal(int, float)  # clip index, fraction done
+    log_message = pyqtSignal(str)
+    finished_exporting = pyqtSignal(list)
+
+    def __init__(self, clips, workers=None, parent=None):
+        super().__init__(parent)
+        self.clips = list(clips)
+        self.workers = workers
+        self.is_running = True
+
+    def run(self):
+        results = export_clips(self.clips, self.workers, self.progress.emit, lambda: not self.is_running)
+        done = sum(1 for r in results if isinstance(r, dict))
+        self.log_message.emit(f"[EXPORT] {done}/{len(self.clips)} clips exported")
+        for clip, r in zip(self.clips, results):
+            if isinstance(r, str):
+                self.log_message.emit(f"[EXPORT] {os.path.basename(clip[1])}: {r}")
+        self.finished_exporting.emit(results)
+
+    def stop(self):
+        self.is_running = False
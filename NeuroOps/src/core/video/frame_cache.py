@@ -0,0 +1,289 @@
+import os
+import threading
+from bisect import bisect_right, insort
+
+EPS = 1e-6
+
+
+class _Entry:
+    __slots__ = ("image", "prev", "next", "gapped", "nbytes")
+
+    def __init__(self, image, prev):
+        self.image = image
+        self.prev = prev    # timestamp of the frame decoded just before, if known
+        self.next = None    # timestamp of the frame decoded just after (inf at EOF)
+        self.gapped = False # frames may have been skipped between this one and next
+        self.nbytes = image.sizeInBytes()
+
+
+class FrameCache:
+    """
+    Memory-bounded cache of decoded frames (display-resolution QImages),
+    keyed by timestamp. Frames remember their decode-order neighbours, so a
+    lookup knows whether a cached frame is really the one on screen at a
+    given time. When over budget, the frame farthest from the playhead is
+    evicted, which keeps both the read-ahead window and the recent past.
+
+    Frames decoded with skipping (keyframe-only scan, dropped non-reference
+    frames) are linked as gapped: playback follows those links, but they
+    don't stand in for the frames in between, so stepping and seeks decode.
+
+    Each entry holds the decoder's QImage object, which owns its pixels
+    (see VideoDecoder.to_qimage), so no frame is copied on the way in.
+    Eviction frees those pixels, so whatever leaves the worker thread is an
+    owned copy (VideoWorker._show). `cond` guards all state and is notified
+    on every insert.
+    """
+    def __init__(self, max_mb=None):
+        if max_mb is None:
+            max_mb = float(os.environ.get("NEUROOPS_FRAME_CACHE_MB", 256))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.cond = threading.Condition()
+        self.entries = {}
+        self.keys = []       # sorted timestamps
+        self.bytes = 0
+        self.playhead = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, timestamp, image, prev=None, gapped=False):
+        with self.cond:
+            before = self.entries.get(prev) if prev is not None else None
+            # A gapped link never replaces a link the cache already has
+            if before is not None and not (gapped and before.next is not None):
+                before.next, before.gapped = timestamp, gapped
+            entry = self.entries.get(timestamp)
+            if entry is not None:
+                # Re-decoded after a seek: only fill in the missing link
+                if prev is not None and not (gapped and entry.prev is not None):
+                    entry.prev = prev
+            else:
+                entry = self.entries[timestamp] = _Entry(image, prev)
+                insort(self.keys, timestamp)
+                self.bytes += entry.nbytes
+                self._evict()
+            self.cond.notify_all()
+
+    def mark_end(self, last):
+        """The stream ended after `last`: it stays on screen for any later time."""
+        with self.cond:
+            if last in self.entries:
+                self.entries[last].next = float("inf")
+                self.entries[last].gapped = False
+            self.cond.notify_all()
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and len(self.keys) > 1:
+            first, last = self.keys[0], self.keys[-1]
+            victim = first if self.playhead - first > last - self.playhead else last
+            self.keys.remove(victim)
+            self.bytes -= self.entries.pop(victim).nbytes
+
+    def frame_at(self, timestamp):
+        """(timestamp, image) of the cached frame on screen at `timestamp`, or None."""
+        with self.cond:
+            i = bisect_right(self.keys, timestamp + EPS) - 1
+            if i < 0:
+                return None
+            key = self.keys[i]
+            entry = self.entries[key]
+            if timestamp - key <= EPS or (entry.next is not None and not entry.gapped
+                                          and timestamp < entry.next - EPS):
+                return key, entry.image
+            return None
+
+    def neighbour(self, timestamp, step, contiguous=False):
+        """
+        The cached frame `step` (+1/-1) frames away from `timestamp` in
+        decode order, or None. contiguous=True refuses gapped links (frame
+        stepping); playback follows them.
+        """
+        with self.cond:
+            entry = self.entries.get(timestamp)
+            if entry is None:
+                return None
+            if step > 0:
+                key = entry.next
+                if contiguous and entry.gapped:
+                    return None
+            else:
+                key = entry.prev
+                before = self.entries.get(key) if key is not None else None
+                if contiguous and before is not None and (before.gapped or before.next != timestamp):
+                    return None
+            if key is None or key not in self.entries:
+                return None
+            return key, self.entries[key].image
+
+    def is_end(self, timestamp):
+        with self.cond:
+            entry = self.entries.get(timestamp)
+            return entry is not None and entry.next == float("inf")
+
+    def discard_after(self, timestamp):
+        """Drops every frame after `timestamp` (decoded for another playback mode)."""
+        with self.cond:
+            i = bisect_right(self.keys, timestamp + EPS)
+            for key in self.keys[i:]:
+                self.bytes -= self.entries.pop(key).nbytes
+            del self.keys[i:]
+            entry = self.entries.get(timestamp)
+            if entry is not None:
+                entry.next, entry.gapped = None, False
+
+    def ahead_bytes(self):
+        with self.cond:
+            i = bisect_right(self.keys, self.playhead + EPS)
+            return sum(self.entries[k].nbytes for k in self.keys[i:])
+
+    def record(self, hit):
+        with self.cond:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self.cond:
+            self.entries.clear()
+            self.keys.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.cond:
+            lookups = self.hits + self.misses
+            return {
+                "frames": len(self.keys),
+                "mb": self.bytes / (1024 * 1024),
+                "max_mb": self.max_bytes / (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "ahead_s": (self.keys[-1] - self.playhead) if self.keys else 0.0,
+            }
+
+
+class ReadAhead(threading.Thread):
+    """
+    Owns the decoder: decodes forward from the last requested position into
+    the FrameCache until it is `ahead_s` seconds of playback (or half the
+    cache budget) past the playhead, then idles until the playhead moves on.
+
+    `skip` is the decoder's skip_frame mode ("DEFAULT", "NONREF" while
+    playback is behind, "NONKEY" for fast scan); frames decoded while
+    skipping are linked as gapped in the cache.
+    """
+    def __init__(self, decoder, cache, ahead_s=3.0):
+        super().__init__(daemon=True)
+        self.decoder = decoder
+        self.cache = cache
+        self.ahead_s = ahead_s
+        self.rate = 1.0          # playback rate: the window is ahead_s of wall time
+        self.skip = "DEFAULT"
+        self.restart_at = None
+        self.restart_after = None
+        self.run_start = 0.0     # where the current contiguous decode run started
+        self.decoded = None      # timestamp of the last decoded frame of this run
+        self.tail = None         # the frame the next decoded one will be linked from
+        self.eof = False
+        self.stopped = False
+
+    def request(self, timestamp, after=None):
+        """
+        Restart decoding (frame-accurate seek) at `timestamp`. With `after`
+        (a cached frame), frames up to it are skipped and the first one past
+        it is linked to it, so playback continues from there.
+        """
+        with self.cache.cond:
+            self.restart_at = timestamp
+            self.restart_after = after
+            self.cache.cond.notify_all()
+
+    def set_skip(self, mode, rate=None):
+        with self.cache.cond:
+            self.skip = mode
+            if rate is not None:
+                self.rate = rate
+            self.cache.cond.notify_all()
+
+    def reaches(self, timestamp):
+        """True if the current run will decode `timestamp` soon without a seek."""
+        with self.cache.cond:
+            ahead = self.ahead_s * self.rate
+            if self.restart_at is not None:
+                return self.restart_at <= timestamp + EPS and timestamp - self.restart_at <= ahead
+            if timestamp < self.run_start - EPS:
+                return False
+            if self.decoded is None:
+                return True
+            if timestamp <= self.decoded + EPS:
+                return False  # already decoded: a cache miss means it was skipped or evicted
+            return self.eof or timestamp - self.decoded <= ahead
+
+    def continues_from(self, timestamp):
+        """True if the next frame this run decodes will be linked after `timestamp`."""
+        with self.cache.cond:
+            if self.restart_at is not None:
+                return self.restart_after is not None and abs(self.restart_after - timestamp) <= EPS
+            return self.tail is not None and abs(self.tail - timestamp) <= EPS
+
+    def stop(self):
+        with self.cache.cond:
+            self.stopped = True
+            self.cache.cond.notify_all()
+
+    def _wanted(self):
+        if self.eof:
+            return False
+        if self.decoded is None:
+            return True
+        return (self.decoded - self.cache.playhead < self.ahead_s * self.rate
+                and self.cache.ahead_bytes() < self.cache.max_bytes // 2)
+
+    def run(self):
+        frames = self.decoder.decode_frames()
+        prev = None
+        applied = "DEFAULT"
+        gap = False  # the next link spans frames skipped before a mode change
+        while True:
+            with self.cache.cond:
+                while not self.stopped and self.restart_at is None and not self._wanted():
+                    self.cache.cond.wait(0.05)
+                if self.stopped:
+                    return
+                target, after = self.restart_at, self.restart_after
+                self.restart_at = self.restart_after = None
+                skip = self.skip
+                if target is not None:
+                    self.run_start, self.decoded, self.eof, self.tail = target, None, False, after
+
+            if skip != applied:
+                self.decoder.set_skip_frame(skip)
+                gap = gap or applied != "DEFAULT"
+                applied = skip
+                with self.cache.cond:
+                    if self.decoded is not None:
+                        self.run_start = self.decoded  # frames before this may be missing
+
+            if target is not None:
+                landed = self.decoder.seek(target)
+                with self.cache.cond:
+                    self.run_start = landed if landed is not None else target
+                frames = self.decoder.decode_frames()
+                prev, gap = after, False
+                continue
+
+            item = next(frames, None)
+            if item is None:
+                with self.cache.cond:
+                    self.eof = True
+                self.cache.mark_end(prev)
+                continue
+            image, timestamp = item
+            if prev is not None and timestamp <= prev + EPS:
+                continue  # restarted `after` a cached frame: already there
+            # The decoder's QImage owns its converted frame: cached as is, freed on eviction
+            self.cache.put(timestamp, image, prev, gapped=gap or applied != "DEFAULT")
+            prev, gap = timestamp, False
+            with self.cache.cond:
+                self.decoded = self.tail = timestamp
@@ -0,0 +1,88 @@
+import av
+import hashlib
+import json
+import os
+import threading
+from bisect import bisect_right
+
+# Default: <project>/database/keyframes, next to neuroops.db
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+INDEX_DIR = os.path.join(_base_dir, 'database', 'keyframes')
+
+INDEX_VERSION = 1
+
+
+def index_key(file_path):
+    """Index files are keyed by path, size and mtime, so a replaced video is re-indexed."""
+    st = os.stat(file_path)
+    ident = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()[:16]
+
+
+class KeyframeIndex:
+    """
+    Keyframe positions of a video's first video stream, in stream time_base
+    units. Built by demuxing packets only (no decoding) and stored as JSON
+    under database/keyframes, so each video is scanned once.
+    """
+    def __init__(self, pts, dts, time_base, packets=0):
+        order = sorted(range(len(pts)), key=lambda i: pts[i])
+        self.pts = [pts[i] for i in order]
+        self.dts = [dts[i] for i in order]
+        self.time_base = time_base
+        self.packets = packets
+
+    @classmethod
+    def build(cls, file_path):
+        pts, dts = [], []
+        packets = 0
+        with av.open(file_path) as container:
+            stream = container.streams.video[0]
+            time_base = stream.time_base
+            for packet in container.demux(stream):
+                if packet.size == 0:
+                    continue  # flush packet
+                packets += 1
+                if packet.is_keyframe and packet.pts is not None:
+                    pts.append(packet.pts)
+                    dts.append(packet.dts if packet.dts is not None else packet.pts)
+        return cls(pts, dts, (time_base.numerator, time_base.denominator), packets)
+
+    @classmethod
+    def load_or_build(cls, file_path, index_dir=None):
+        index_dir = index_dir or INDEX_DIR
+        path = os.path.join(index_dir, f"{index_key(file_path)}.json")
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    return cls(data["pts"], data["dts"], tuple(data["time_base"]), data.get("packets", 0))
+            except Exception as e:
+                print(f"[DECODER] Ignoring unreadable keyframe index {path}: {e}")
+
+        index = cls.build(file_path)
+        os.makedirs(index_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # parallel exports may build the same index
+        with open(tmp, 'w') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "file": os.path.abspath(file_path),
+                "time_base": list(index.time_base),
+                "packets": index.packets,
+                "pts": index.pts,
+                "dts": index.dts,
+            }, f)
+        os.replace(tmp, path)
+        return index
+
+    def position(self, target_pts):
+        """Position in the index of the last keyframe at or before target_pts (0 if none)."""
+        return max(0, bisect_right(self.pts, target_pts) - 1)
+
+    def keyframe_before(self, target_pts):
+        """(pts, dts) of the last keyframe at or before target_pts, or None for an empty index."""
+        if not self.pts:
+            return None
+        i = self.position(target_pts)
+        return self.pts[i], self.dts[i]
@@ -0,0 +1,228 @@
+import av
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty
+from PyQt6.QtCore import QThread, pyqtSignal
+from .keyframe_index import index_key
+
+# Default: <project>/database/proxies, next to neuroops.db
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+PROXY_DIR = os.path.join(_base_dir, 'database', 'proxies')
+
+
+def proxy_height():
+    """$NEUROOPS_PROXY_HEIGHT: proxy resolution (default 480; 360 for very weak machines)."""
+    return int(os.environ.get("NEUROOPS_PROXY_HEIGHT", 480))
+
+
+def proxies_enabled():
+    """$NEUROOPS_PROXY=0 turns proxy generation (and proxy playback) off."""
+    return os.environ.get("NEUROOPS_PROXY", "1") != "0"
+
+
+def proxy_path(file_path, proxy_dir=None):
+    """database/proxies/<video key>.mp4; the key changes when the source file does."""
+    return os.path.join(proxy_dir or PROXY_DIR, f"{index_key(file_path)}.mp4")
+
+
+def _duration(container):
+    stream = container.streams.video[0]
+    if stream.duration:
+        return float(stream.duration * stream.time_base)
+    if container.duration:
+        return container.duration / 1000000.0
+    return 0.0
+
+
+def needs_proxy(file_path, height=None):
+    """Only sources taller than the proxy gain anything from one."""
+    with av.open(file_path) as container:
+        return container.streams.video[0].height > (height or proxy_height())
+
+
+def has_valid_proxy(file_path, proxy_dir=None):
+    """The proxy exists (it's only renamed into place once complete) and covers the source."""
+    path = proxy_path(file_path, proxy_dir)
+    if not os.path.exists(path):
+        return False
+    try:
+        with av.open(path) as proxy, av.open(file_path) as source:
+            if not proxy.streams.video:
+                return False
+            expected = _duration(source)
+            return abs(_duration(proxy) - expected) <= max(0.5, 0.01 * expected)
+    except Exception:
+        return False
+
+
+def playback_source(file_path, proxy_dir=None):
+    """What the workbench decodes for playback and scrubbing: the proxy if there is a valid one."""
+    if proxies_enabled() and has_valid_proxy(file_path, proxy_dir):
+        return proxy_path(file_path, proxy_dir)
+    return file_path
+
+
+def transcode_proxy(file_path, out_path, height=None, gop=12, progress=None, should_stop=None):
+    """
+    Video-only H.264 proxy at `height` (aspect kept), `gop` frames per GOP
+    (1 = all-intra), no B-frames. Frames keep their source PTS and time base,
+    so a timestamp in the proxy is the same moment in the original: the
+    workbench scrubs the proxy and exports still cut the original.
+    progress(fraction) is called about once a second of video. Returns
+    None, leaving no file behind, if should_stop() turns true.
+    """
+    height = height or proxy_height()
+    tmp = out_path + ".tmp.mp4"
+    with av.open(file_path) as source:
+        src = source.streams.video[0]
+        src.thread_type = "AUTO"
+        duration = _duration(source) or 1.0
+        width = max(2, int(src.width * height / src.height) & ~1)
+        rate = src.average_rate or 30
+
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with av.open(tmp, "w") as output:
+            dst = output.add_stream("libx264", rate=rate)
+            dst.width, dst.height, dst.pix_fmt = width, height, "yuv420p"
+            dst.time_base = src.time_base
+            # Fixed GOP: no scene-cut keyframes, so seek cost is bounded by `gop`
+            dst.options = {"g": str(gop), "bf": "0", "sc_threshold": "0", "preset": "veryfast",
+                           "crf": "23", "tune": "fastdecode", "threads": "2"}
+            start = src.start_time or 0
+            last_report = -1
+            for frame in source.decode(src):
+                if should_stop and should_stop():
+                    break
+                if frame.pts is None:
+                    continue
+                out = frame.reformat(width=width, height=height, format="yuv420p")
+                out.pts, out.time_base = frame.pts, src.time_base
+                out.pict_type = av.video.frame.PictureType.NONE  # let the encoder place keyframes
+                for packet in dst.encode(out):
+                    output.mux(packet)
+                second = int((frame.pts - start) * src.time_base)
+                if progress and second != last_report:
+                    last_report = second
+                    progress(min(1.0, second / duration))
+            for packet in dst.encode():
+                output.mux(packet)
+    if should_stop and should_stop():
+        os.remove(tmp)
+        return None
+    os.replace(tmp, out_path)
+    if progress:
+        progress(1.0)
+    return out_path
+
+
+# --- Process pool ---
+
+_progress_queue = None
+_stop_event = None
+
+
+def _init_pool(queue, stop):
+    global _progress_queue, _stop_event
+    _progress_queue, _stop_event = queue, stop
+
+
+def _build_one(file_path, out_path, height, gop):
+    def report(fraction):
+        _progress_queue.put((file_path, fraction))
+    try:
+        done = transcode_proxy(file_path, out_path, height, gop, report, should_stop=_stop_event.is_set)
+        return file_path, "built" if done else "stopped"
+    except Exception as e:
+        try:
+            os.remove(out_path + ".tmp.mp4")
+        except OSError:
+            pass
+        return file_path, f"error: {e}"
+
+
+def build_proxies(paths, proxy_dir=None, height=None, gop=12, workers=None, progress=None, should_stop=None):
+    """
+    Transcodes proxies for `paths` in a process pool, skipping videos that
+    already have a valid proxy or are no taller than it. progress(path,
+    fraction) is called from this thread as workers report. When
+    should_stop() turns true, queued videos are cancelled and running
+    transcodes stop at their next frame. Returns
+    {path: "built" | "skipped" | "stopped" | "error: ..."}; cancelled
+    videos are left out.
+    """
+    height = height or proxy_height()
+    status, todo = {}, []
+    for path in paths:
+        try:
+            if has_valid_proxy(path, proxy_dir) or not needs_proxy(path, height):
+                status[path] = "skipped"
+            else:
+                todo.append(path)
+        except Exception as e:
+            status[path] = f"error: {e}"
+    if not todo:
+        return status
+
+    workers = workers or int(os.environ.get("NEUROOPS_PROXY_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+    # spawn: workers must not inherit the GUI's Qt threads
+    ctx = multiprocessing.get_context("spawn")
+    queue, stop = ctx.Queue(), ctx.Event()
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx,
+                               initializer=_init_pool, initargs=(queue, stop))
+    try:
+        futures = [pool.submit(_build_one, path, proxy_path(path, proxy_dir), height, gop) for path in todo]
+        pending = set(futures)
+        while pending:
+            if should_stop and should_stop():
+                stop.set()  # running transcodes return at their next frame
+                break
+            try:
+                path, fraction = queue.get(timeout=0.1)
+                if progress:
+                    progress(path, fraction)
+            except Empty:
+                pass
+            pending = {f for f in pending if not f.done()}
+    finally:
+        # Queued videos never start; the wait only covers transcodes winding down
+        pool.shutdown(wait=True, cancel_futures=True)
+    while not queue.empty():
+        path, fraction = queue.get()
+        if progress:
+            progress(path, fraction)
+    for future in futures:
+        if future.done() and not future.cancelled():
+            path, result = future.result()
+            status[path] = result
+    return status
+
+
+class ProxyJob(QThread):
+    """Builds proxies for a list of videos in the background (see build_proxies)."""
+    progress = pyqtSignal(str, float)  # video path, fraction done
+    log_message = pyqtSignal(str)
+    finished_building = pyqtSignal(dict)
+
+    def __init__(self, paths, proxy_dir=None, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+        self.proxy_dir = proxy_dir
+        self.is_running = True
+
+    def run(self):
+        try:
+            status = build_proxies(self.paths, self.proxy_dir, progress=self.progress.emit,
+                                   should_stop=lambda: not self.is_running)
+            built = sum(1 for s in status.values() if s == "built")
+            self.log_message.emit(f"[PROXY] {built} built, {len(status) - built} skipped/failed")
+            for path, s in status.items():
+                if s.startswith("error"):
+                    self.log_message.emit(f"[PROXY] {os.path.basename(path)}: {s}")
+            self.finished_building.emit(status)
+        except Exception as e:
+            self.log_message.emit(f"[PROXY] Error: {e}")
+            self.finished_building.emit({})
+
+    def stop(self):
+        self.is_running = False
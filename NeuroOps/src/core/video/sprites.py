@@ -0,0 +1,157 @@
+import av
+import json
+import os
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import QPoint, QRect
+from PyQt6.QtGui import QImage, QPainter
+from .keyframe_index import index_key
+from .thumbnails import keyframe_thumbnails, video_duration
+
+# Default: <project>/database/sprites, next to neuroops.db
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SPRITE_DIR = os.path.join(_base_dir, 'database', 'sprites')
+
+SPRITE_VERSION = 1
+
+# Decoded sheets shared by every atlas in the process (reopening a result is free)
+_SHEETS = OrderedDict()
+_MAX_SHEETS = 8
+_sheets_lock = threading.Lock()  # search tasks read tiles off the GUI thread
+
+
+def sprite_interval():
+    """$NEUROOPS_SPRITE_INTERVAL: seconds between atlas thumbnails (default 1, the filmstrip's slot)."""
+    return float(os.environ.get("NEUROOPS_SPRITE_INTERVAL", 1.0))
+
+
+def sprite_format():
+    """$NEUROOPS_SPRITE_FORMAT: jpg (default) or webp."""
+    return os.environ.get("NEUROOPS_SPRITE_FORMAT", "jpg").lower()
+
+
+class SpriteAtlas:
+    """
+    Thumbnails of a whole video, one every `interval` seconds, tiled into
+    sprite sheets of cols x rows under database/sprites/<video key>/.
+    index.json holds only the grid geometry, so thumbnail i lives on sheet
+    i // (cols * rows) at a computed offset: a filmstrip window or a page of
+    search results costs one or two sheet reads. Built once at ingest.
+    """
+    def __init__(self, directory, meta):
+        self.dir = directory
+        self.interval = meta["interval"]
+        self.duration = meta["duration"]
+        self.tile_w, self.tile_h = meta["tile"]
+        self.cols = meta["cols"]
+        self.rows = meta["rows"]
+        self.count = meta["count"]
+        self.sheets = meta["sheets"]
+
+    @staticmethod
+    def directory(file_path, sprite_dir=None):
+        return os.path.join(sprite_dir or SPRITE_DIR, index_key(file_path))
+
+    @classmethod
+    def load(cls, file_path, sprite_dir=None):
+        """The video's atlas, or None if it hasn't been built (or the video changed)."""
+        directory = cls.directory(file_path, sprite_dir)
+        path = os.path.join(directory, "index.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                meta = json.load(f)
+            if meta.get("version") != SPRITE_VERSION:
+                return None
+            return cls(directory, meta)
+        except Exception as e:
+            print(f"[SPRITES] Ignoring unreadable atlas index {path}: {e}")
+            return None
+
+    @classmethod
+    def build(cls, file_path, interval=None, tile=(160, 90), cols=10, rows=10, fmt=None,
+              sprite_dir=None, index_dir=None, should_stop=None):
+        """
+        Decodes one keyframe thumbnail per slot (see keyframe_thumbnails),
+        writing each sheet as soon as it is full. Returns the atlas, or None
+        if stopped early (a partial atlas is never indexed).
+        """
+        interval = interval or sprite_interval()
+        fmt = fmt or sprite_format()
+        tile_w, tile_h = tile
+        with av.open(file_path) as container:
+            duration = video_duration(container)
+        times = [i * interval for i in range(max(1, int(duration / interval + 0.999)))]
+
+        directory = cls.directory(file_path, sprite_dir)
+        os.makedirs(directory, exist_ok=True)
+        per_sheet = cols * rows
+        sheets = []
+        sheet = painter = None
+        count = 0
+
+        def flush():
+            painter.end()
+            name = f"sheet_{len(sheets):04d}.{fmt}"
+            tmp = os.path.join(directory, name + ".tmp")
+            if not sheet.save(tmp, fmt.upper(), 80):
+                raise IOError(f"could not write sprite sheet {name}")
+            os.replace(tmp, os.path.join(directory, name))
+            sheets.append(name)
+
+        for i, image in keyframe_thumbnails(file_path, times, tile_w, tile_h, index_dir, should_stop):
+            slot = i % per_sheet
+            if slot == 0:
+                if sheet is not None:
+                    flush()
+                sheet = QImage(cols * tile_w, rows * tile_h, QImage.Format.Format_RGB888)
+                sheet.fill(0)
+                painter = QPainter(sheet)
+            painter.drawImage(QPoint((slot % cols) * tile_w, (slot // cols) * tile_h), image)
+            count = i + 1
+        if sheet is None or (should_stop and should_stop()):
+            if painter is not None:
+                painter.end()
+            return None
+        flush()
+
+        meta = {
+            "version": SPRITE_VERSION,
+            "file": os.path.abspath(file_path),
+            "interval": interval,
+            "duration": duration,
+            "tile": [tile_w, tile_h],
+            "cols": cols,
+            "rows": rows,
+            "count": count,
+            "sheets": sheets,
+        }
+        tmp = os.path.join(directory, "index.json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(directory, "index.json"))
+        return cls(directory, meta)
+
+    def _sheet(self, n):
+        path = os.path.join(self.dir, self.sheets[n])
+        with _sheets_lock:
+            sheet = _SHEETS.pop(path, None)
+            if sheet is None:
+                sheet = QImage(path)
+            _SHEETS[path] = sheet
+            while len(_SHEETS) > _MAX_SHEETS:
+                _SHEETS.popitem(last=False)
+            return sheet
+
+    def tile(self, i):
+        """Thumbnail i as an owned QImage."""
+        i = min(max(0, i), self.count - 1)
+        per_sheet = self.cols * self.rows
+        slot = i % per_sheet
+        rect = QRect((slot % self.cols) * self.tile_w, (slot // self.cols) * self.tile_h, self.tile_w, self.tile_h)
+        return self._sheet(i // per_sheet).copy(rect)
+
+    def thumbnail_at(self, timestamp):
+        """The thumbnail of the last slot at or before `timestamp`."""
+        return self.tile(int(timestamp / self.interval + 1e-6))
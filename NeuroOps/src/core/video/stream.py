@@ -0,0 +1,229 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+# Reconnect backoff: BACKOFF_BASE_S doubling per failed attempt, capped at BACKOFF_MAX_S
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 30.0
+
+
+def stall_timeout():
+    """$NEUROOPS_STREAM_STALL_S: seconds without a frame before a stream counts as stalled (default 5)."""
+    return float(os.environ.get("NEUROOPS_STREAM_STALL_S", 5.0))
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_S, cap=BACKOFF_MAX_S, rand=random.random):
+    """
+    Wait before reconnect attempt `attempt` (0-based): the exponential delay
+    with jitter drawn from its upper half, so cameras that dropped together
+    don't all retry at the same moment.
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + rand() * delay / 2
+
+
+def redact(url):
+    """The URL without its user:password@ part, for logs."""
+    return re.sub(r"//[^/@]*@", "//", url)
+
+
+class LatestFrame:
+    """
+    Single-slot, latest-frame-wins buffer between a stream reader and its
+    consumer. put() replaces a frame nobody took yet (counted in
+    `dropped`); get() waits for a frame newer than the last one taken.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None  # (frame, frame_idx, timestamp)
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame, frame_idx, timestamp):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = (frame, frame_idx, timestamp)
+            self.received += 1
+            self._cond.notify_all()
+
+    @property
+    def pending(self):
+        """A frame is waiting to be taken."""
+        return self._item is not None
+
+    def get(self, timeout=None):
+        """The newest frame as (frame, frame_idx, timestamp), or None on timeout / close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._item is not None or self.closed, timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class StreamReader(threading.Thread):
+    """
+    Feeds a LatestFrame (BGR frames, wall-clock timestamps) from an OpenCV
+    stream until stopped, and keeps it fed when the stream misbehaves:
+
+    - a failed open or read reconnects after backoff_delay(), reset once
+      frames flow again;
+    - a watchdog thread forces a reconnect when no frame arrived for
+      `stall_s`; the FFmpeg backend's open/read timeouts are set to the
+      same value so a dead connection can't block a read for longer;
+    - every frame is grab()bed, so decoding keeps pace with the stream
+      instead of falling behind it, but at most `max_fps` of them are
+      retrieve()d (converted) into the slot; the rest count as `skipped`.
+
+    A local file stands in for a camera: it is looped and paced at its own
+    frame rate. stats() returns the counters shown in the health panel.
+    `open_capture(url)` replaces cv2.VideoCapture (tests).
+    """
+    WINDOW_S = 5.0  # fps is measured over this window
+
+    def __init__(self, url, slot, log=print, label=None, max_fps=None, stall_s=None, open_capture=None):
+        super().__init__(name=f"stream-{label or redact(url)}", daemon=True)
+        self.url = url
+        self.slot = slot
+        self.log = log
+        self.label = label or redact(url)
+        self.max_fps = max_fps
+        self.stall_s = stall_s or stall_timeout()
+        self.open_capture = open_capture or self._open
+        self.is_file = os.path.exists(url)
+        self.is_running = True
+        self._wake = threading.Event()  # set on stop: ends backoff waits and the watchdog
+        self._stalled = threading.Event()
+
+        self.state = "connecting"  # connecting | streaming | stalled | backoff | stopped
+        self.frame_idx = 0
+        self.grabbed = 0
+        self.skipped = 0
+        self.read_errors = 0
+        self.reconnects = 0
+        self.stalls = 0
+        self.last_error = None
+        self.last_frame_at = time.monotonic()
+        self.started_at = time.monotonic()
+        self.delivered_at = deque()  # monotonic times within WINDOW_S
+        # grab() + retrieve() per delivered frame (on a live stream grab() also waits for the frame)
+        self.decode_s = deque(maxlen=100)
+
+    def _open(self, url):
+        import cv2
+        timeout_ms = int(self.stall_s * 1000)
+        return cv2.VideoCapture(url, cv2.CAP_ANY, [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+                                                   cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms])
+
+    def run(self):
+        threading.Thread(target=self._watchdog, name=f"watchdog-{self.label}", daemon=True).start()
+        attempt = 0
+        try:
+            while self.is_running:
+                self.state = "connecting"
+                cap = self.open_capture(self.url)
+                if cap is not None and cap.isOpened():
+                    try:
+                        if self._read(cap):
+                            attempt = 0
+                    finally:
+                        cap.release()
+                else:
+                    self.last_error = "Failed to connect to stream URL."
+                if not self.is_running:
+                    break
+                delay = backoff_delay(attempt)
+                attempt += 1
+                self.reconnects += 1
+                self.state = "backoff"
+                self.log(f"[STREAM] {self.label}: {self.last_error} Reconnecting in {delay:.1f}s")
+                self._wake.wait(delay)
+        finally:
+            self.state = "stopped"
+            self.slot.close()
+
+    def _read(self, cap):
+        """Reads until the stream fails, stalls or the reader stops; returns the frames delivered."""
+        import cv2
+        period = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 25.0) if self.is_file else 0.0
+        min_gap = 1.0 / self.max_fps if self.max_fps else 0.0
+        delivered = 0
+        last_delivery = None
+        next_at = time.monotonic()
+        self.last_frame_at = time.monotonic()  # the watchdog counts from the (re)connect
+        self._stalled.clear()
+        while self.is_running:
+            t0 = time.perf_counter()
+            if not cap.grab():
+                if self.is_file and delivered:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # loop the stand-in
+                    continue
+                self.read_errors += 1
+                self.last_error = "Stream read failed." if delivered else "Connected, but no frames received."
+                return delivered
+            if self._stalled.is_set():
+                return delivered  # the read that stalled finally returned: reconnect anyway
+
+            self.state = "streaming"
+            now = time.monotonic()
+            self.last_frame_at = now
+            self.grabbed += 1
+            if last_delivery is None or now - last_delivery >= min_gap:
+                ok, frame = cap.retrieve()
+                if ok:
+                    self.decode_s.append(time.perf_counter() - t0)
+                    self.slot.put(frame, self.frame_idx, time.time())
+                    self.delivered_at.append(now)
+                    last_delivery = now
+                    delivered += 1
+            else:
+                self.skipped += 1
+            self.frame_idx += 1
+
+            if period:
+                next_at += period
+                self._wake.wait(max(0.0, next_at - time.monotonic()))
+        return delivered
+
+    def _watchdog(self):
+        while not self._wake.wait(min(1.0, self.stall_s / 2)):
+            if self.state == "streaming" and time.monotonic() - self.last_frame_at > self.stall_s:
+                self.stalls += 1
+                self.last_error = f"No frame for {self.stall_s:g}s."
+                self.state = "stalled"
+                self.log(f"[STREAM] {self.label}: stalled")
+                self._stalled.set()
+
+    def fps(self):
+        now = time.monotonic()
+        while self.delivered_at and self.delivered_at[0] < now - self.WINDOW_S:
+            self.delivered_at.popleft()
+        return len(self.delivered_at) / max(1e-6, min(self.WINDOW_S, now - self.started_at))
+
+    def stats(self):
+        decode = list(self.decode_s)
+        return {
+            "stream": self.label,
+            "state": self.state,
+            "fps": round(self.fps(), 2),
+            "received": self.slot.received,
+            "dropped": self.slot.dropped,
+            "skipped": self.skipped,
+            "reconnects": self.reconnects,
+            "stalls": self.stalls,
+            "read_errors": self.read_errors,
+            "decode_ms": round(1000 * sum(decode) / len(decode), 2) if decode else None,
+            "last_error": self.last_error,
+        }
+
+    def stop(self):
+        self.is_running = False
+        self._wake.set()
@@ -0,0 +1,89 @@
+import av
+import os
+from PyQt6.QtGui import QImage
+from .keyframe_index import KeyframeIndex, index_key
+
+# Default: <project>/database/thumbnails, next to neuroops.db
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+THUMB_DIR = os.path.join(_base_dir, 'database', 'thumbnails')
+
+
+class ThumbnailCache:
+    """
+    On-disk thumbnails of one video at one size: one JPEG per slot under
+    database/thumbnails/<video key>/<ms>_<w>x<h>.jpg. The video key is the
+    keyframe index's (path, size, mtime) hash, so a replaced video misses.
+    """
+    def __init__(self, file_path, width, height, thumb_dir=None):
+        self.dir = os.path.join(thumb_dir or THUMB_DIR, index_key(file_path))
+        self.width = width
+        self.height = height
+
+    def path(self, timestamp):
+        return os.path.join(self.dir, f"{int(round(timestamp * 1000))}_{self.width}x{self.height}.jpg")
+
+    def load(self, timestamp):
+        path = self.path(timestamp)
+        if not os.path.exists(path):
+            return None
+        image = QImage(path)
+        return None if image.isNull() else image
+
+    def save(self, timestamp, image):
+        os.makedirs(self.dir, exist_ok=True)
+        path = self.path(timestamp)
+        tmp = path + ".tmp"
+        if image.save(tmp, "JPG", 85):
+            os.replace(tmp, path)
+
+
+def video_duration(container):
+    stream = container.streams.video[0]
+    if stream.duration:
+        return float(stream.duration * stream.time_base)
+    if container.duration:
+        return container.duration / 1000000.0
+    return 0.0
+
+
+def frame_to_qimage(frame, width, height):
+    """Scales with swscale straight to RGB24 at the thumbnail size (an owned QImage)."""
+    rgb = frame.to_ndarray(width=width, height=height, format="rgb24", interpolation="AREA")
+    return QImage(rgb.data, width, height, rgb.strides[0], QImage.Format.Format_RGB888).copy()
+
+
+def keyframe_thumbnails(file_path, times, width, height, index_dir=None, should_stop=None):
+    """
+    Yields (i, QImage) for each timestamp in `times`, showing the last
+    keyframe at or before it. The decoder skips every non-key frame
+    (skip_frame='NONKEY'), so each thumbnail costs one seek and one
+    intra-frame decode; slots sharing a keyframe decode it once.
+    """
+    if not times:
+        return
+    try:
+        index = KeyframeIndex.load_or_build(file_path, index_dir)
+    except Exception as e:
+        print(f"[THUMBNAIL] Keyframe index unavailable, seeking by time: {e}")
+        index = None
+
+    with av.open(file_path) as container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = "NONKEY"
+        time_base = stream.time_base
+        decoded = {}  # keyframe pts -> QImage
+        for i, t in enumerate(times):
+            if should_stop and should_stop():
+                return
+            target = int(t / time_base)
+            key = index.keyframe_before(target) if index else None
+            offset = key[0] if key else target
+            if offset not in decoded:
+                container.seek(offset, stream=stream, any_frame=False, backward=True)
+                image = None
+                for frame in container.decode(stream):
+                    image = frame_to_qimage(frame, width, height)
+                    break
+                decoded[offset] = image
+            if decoded[offset] is not None:
+                yield i, decoded[offset]
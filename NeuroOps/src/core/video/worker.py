@@ -1,86 +1,288 @@
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QThread, QMutex
 from PyQt6.QtGui import QImage
 import time
+from .clock import PlaybackClock
 from .decoder import VideoDecoder
+from .frame_cache import FrameCache, ReadAhead
+
+SCAN_RATES = (1.0, 2.0, 4.0, 8.0)
+BEHIND_S = 0.25   # this late at 1x: decoder stops decoding non-reference frames
+RESYNC_S = 1.0    # this late: re-anchor the clock instead of dropping on
+MAX_HOLD_S = 0.25 # never drop frames for longer than this in a row
 
 class VideoWorker(QObject):
     """
     Manages the video decoding loop in a background thread.
     Emits frame_ready signals for the GUI to render.
+
+    Decoding runs in a ReadAhead thread that fills a FrameCache a few
+    seconds past the playhead; playback, seeks and frame steps are served
+    from the cache and only wait for the decoder on a miss.
+
+    Playback is paced by a PlaybackClock (monotonic time vs frame PTS):
+    frames that are already late are dropped instead of shown, and when
+    playback falls well behind the decoder skips non-reference frames until
+    it catches up. Rates above 1x are fast scans over keyframes only.
     """
     frame_ready = pyqtSignal(QImage, float) # Image, Timestamp (sec)
     metadata_ready = pyqtSignal(dict)
+    cache_stats = pyqtSignal(dict) # FrameCache.stats(), twice a second
     finished = pyqtSignal()
-    
-    def __init__(self, file_path):
+
+    def __init__(self, file_path, cache_mb=None, read_ahead_s=3.0, index_dir=None):
         super().__init__()
         self.file_path = file_path
+        self.index_dir = index_dir
         self.decoder = None
-        
+        self.cache = FrameCache(cache_mb)
+        self.read_ahead_s = read_ahead_s
+        self.read_ahead = None
+
         # State
         self.is_playing = False
         self.stop_requested = False
         self.seek_requested = None # Timestamp to seek to
-        
+        self.step_requested = 0 # Frames to step (+/-), accumulated
+        self.rate_requested = None # Playback rate to switch to
+        self.rate = 1.0
+        self.clock = PlaybackClock()
+        self.dropped = 0
+        self.behind = False
+        self.last_shown = 0.0 # monotonic time of the last frame emitted
+        self.display_size = None # (w, h) frames are scaled to while decoding
+        self.current = None # Timestamp of the frame on screen
+
         self.mutex = QMutex()
-        
+
+    def _wait_for(self, lookup, timeout=2.0):
+        """Polls a cache lookup until it hits, the stream ends or timeout."""
+        deadline = time.monotonic() + timeout
+        with self.cache.cond:
+            while not self.stop_requested:
+                found = lookup()
+                if found is not None:
+                    return found
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (self.read_ahead.eof and self.read_ahead.restart_at is None):
+                    return lookup()
+                self.cache.cond.wait(min(remaining, 0.05))
+        return None
+
+    def _move_playhead(self, timestamp):
+        with self.cache.cond:
+            self.cache.playhead = timestamp
+            self.cache.cond.notify_all()
+
+    def _decode_to(self, timestamp):
+        """Cache miss: let the read-ahead reach `timestamp` (seeking if it's off the current run)."""
+        self._move_playhead(timestamp)
+        if not self.read_ahead.reaches(timestamp):
+            self.read_ahead.request(timestamp)
+        return self._wait_for(lambda: self.cache.frame_at(timestamp))
+
+    def _frame_at(self, timestamp):
+        found = self.cache.frame_at(timestamp)
+        self.cache.record(found is not None)
+        if found is None:
+            found = self._decode_to(timestamp)
+        return found
+
+    def _step(self, steps):
+        """Moves `steps` frames from the current one, from memory when cached."""
+        found = (self.current, None)
+        direction = 1 if steps > 0 else -1
+        for _ in range(abs(steps)):
+            nxt = self.cache.neighbour(found[0], direction, contiguous=True)
+            if nxt is None:
+                break
+            found = nxt
+        else:
+            self.cache.record(True)
+            return found
+        # Off the cached run: fall back to a timed seek
+        self.cache.record(False)
+        return self._decode_to(max(0.0, self.current + steps / self.decoder.fps))
+
+    def _next(self):
+        if self.current is None:
+            return self._frame_at(0.0)
+        found = self.cache.neighbour(self.current, 1)
+        self.cache.record(found is not None)
+        if found is None:
+            if not self.read_ahead.continues_from(self.current):
+                self.read_ahead.request(self.current, after=self.current)
+            found = self._wait_for(lambda: self.cache.neighbour(self.current, 1))
+        return found
+
+    def _set_rate(self, rate, restart_at=None):
+        """
+        Switches between 1x (every frame) and keyframe-only fast scan. Frames
+        cached past the current one were decoded for the old mode, so they
+        are dropped and the read-ahead restarts: from the current frame, or
+        at `restart_at` when a seek follows.
+        """
+        self.rate = rate
+        self.clock.set_rate(rate)
+        self.behind = False
+        self.read_ahead.set_skip("NONKEY" if rate > 1.0 else "DEFAULT", rate)
+        if self.current is not None:
+            self.cache.discard_after(self.current)
+        if restart_at is not None:
+            self.read_ahead.request(restart_at)
+        elif self.current is not None:
+            self.read_ahead.request(self.current, after=self.current)
+
+    def _request_pending(self):
+        return (self.stop_requested or not self.is_playing or self.seek_requested is not None
+                or self.step_requested or self.rate_requested is not None)
+
+    def _wait_until(self, due):
+        """Sleeps until monotonic time `due`; False if a request cut it short."""
+        while True:
+            remaining = due - time.monotonic()
+            if remaining <= 0:
+                return True
+            if self._request_pending():
+                return False
+            time.sleep(min(remaining, 0.01))
+
+    def _present(self, found):
+        """Shows the frame when it's due, or drops it if it's already late."""
+        timestamp = found[0]
+        late = self.clock.lateness(timestamp)
+        if late < 0:
+            if not self._wait_until(time.monotonic() - late):
+                return  # seek/step/pause/rate arrived first: handle it, frame stays unshown
+            late = 0.0
+
+        frame_time = 1.0 / self.decoder.fps
+        if late > RESYNC_S:
+            self.clock.anchor(timestamp)  # hopelessly behind: continue from here
+        elif (late > frame_time and time.monotonic() - self.last_shown < MAX_HOLD_S
+              and not self.cache.is_end(timestamp)):
+            # Late: skip presenting it, keep the position moving
+            self.dropped += 1
+            self.current = timestamp
+            self._move_playhead(timestamp)
+            self._update_behind(late, frame_time)
+            return
+        self._show(found)
+        self._update_behind(late, frame_time)
+
+    def _update_behind(self, late, frame_time):
+        if self.rate != 1.0:
+            return
+        behind = late > frame_time if self.behind else late > BEHIND_S
+        if behind != self.behind:
+            self.behind = behind
+            self.read_ahead.set_skip("NONREF" if behind else "DEFAULT")
+
+    def _show(self, found):
+        if found is None:
+            return
+        timestamp, image = found
+        self.current = timestamp
+        self._move_playhead(timestamp)
+        self.last_shown = time.monotonic()
+        # Cached images wrap decoder-owned planes that eviction frees; the
+        # queued signal gets an owned copy (one per displayed frame)
+        self.frame_ready.emit(image.copy(), timestamp)
+
     def run(self):
         """Main Thread Loop"""
         try:
-            self.decoder = VideoDecoder(self.file_path)
+            self.decoder = VideoDecoder(self.file_path, display_size=self.display_size, index_dir=self.index_dir)
             self.metadata_ready.emit(self.decoder.get_metadata())
-            
-            frame_gen = self.decoder.decode_frames()
-            
+
+            self.read_ahead = ReadAhead(self.decoder, self.cache, self.read_ahead_s)
+            self.read_ahead.start()
+            last_stats = 0.0
+            was_playing = False
+
             while not self.stop_requested:
-                
-                # Check Seek
-                if self.seek_requested is not None:
-                    self.mutex.lock()
-                    ts = self.seek_requested
-                    self.seek_requested = None
-                    self.mutex.unlock()
-                    
-                    self.decoder.seek(ts)
-                    frame_gen = self.decoder.decode_frames() # Reset generator
-                    
+                now = time.monotonic()
+                if now - last_stats >= 0.5:
+                    last_stats = now
+                    stats = self.cache.stats()
+                    stats.update(rate=self.rate, dropped=self.dropped, behind=self.behind)
+                    self.cache_stats.emit(stats)
+
+                # Check Seek / Step / Rate
+                self.mutex.lock()
+                ts, steps, rate = self.seek_requested, self.step_requested, self.rate_requested
+                self.seek_requested, self.step_requested, self.rate_requested = None, 0, None
+                self.mutex.unlock()
+
+                if ts is not None or steps:
+                    # Seeks and steps are frame-accurate: leave fast scan first
+                    if self.rate != 1.0:
+                        self._set_rate(1.0, restart_at=ts)
+                    self.clock.reset()
+                if ts is not None:
+                    self._show(self._frame_at(ts))
+                    continue
+                if steps and self.current is not None:
+                    self._show(self._step(steps))
+                    continue
+                if rate is not None and rate != self.rate:
+                    self._set_rate(rate)
+
                 if not self.is_playing:
+                    was_playing = False
                     time.sleep(0.01) # Idle wait
                     continue
-                    
-                try:
-                    # Get Next Frame
-                    frame, timestamp = next(frame_gen)
-                    
-                    # Pace Control (Simple Sleep - Production needs Audio Sync or QElapsedTimer)
-                    # For "Workbench" trimming, visual scanning speed is often preferred over realtime audio sync.
-                    # We will implement a basic FPS limiter.
-                    target_delay = 1.0 / self.decoder.fps
-                    time.sleep(target_delay * 0.9) # Slightly faster processing, let GUI catch up
-                    
-                    self.frame_ready.emit(frame, timestamp)
-                    
-                except StopIteration:
-                    self.is_playing = False
-                    # End of stream
-                    
+                if not was_playing:
+                    was_playing = True
+                    self.clock.reset() # Resume: the next frame is due now
+
+                # Get Next Frame
+                found = self._next()
+                if found is None:
+                    if self.current is None or self.cache.is_end(self.current):
+                        self.is_playing = False # End of stream
+                    continue
+
+                self._present(found)
+
         except Exception as e:
             print(f"[WORKER] Critical Error: {e}")
         finally:
+            if self.read_ahead:
+                self.read_ahead.stop()
+                self.read_ahead.join()
             if self.decoder:
                 self.decoder.close()
             self.finished.emit()
 
     def play(self):
         self.is_playing = True
-        
+
     def pause(self):
         self.is_playing = False
-        
+
     def seek(self, timestamp):
         self.mutex.lock()
         self.seek_requested = timestamp
         self.mutex.unlock()
-        
+
+    def set_rate(self, rate):
+        """1x plays every frame; 2x/4x/8x scan keyframes only."""
+        self.mutex.lock()
+        self.rate_requested = rate
+        self.mutex.unlock()
+
+    def step(self, frames):
+        """Steps +/- frames from the frame on screen (pauses playback)."""
+        self.is_playing = False
+        self.mutex.lock()
+        self.step_requested += frames
+        self.mutex.unlock()
+
+    def set_display_size(self, width, height):
+        """Decode straight to the view's pixel size instead of full resolution."""
+        self.display_size = (width, height)
+        if self.decoder:
+            self.decoder.set_display_size(self.display_size)
+
     def stop(self):
         self.stop_requested = True
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import time
+
+import cv2
+
+# Default: <project>/database/crops, next to neuroops.db
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CROP_DIR = os.path.join(_base_dir, 'database', 'crops')
+
+_store = None
+
+
+def get_crop_store():
+    """Process-wide store at database/crops, budget from $NEUROOPS_CROP_STORE_MB (default 2048)."""
+    global _store
+    if _store is None:
+        _store = CropStore(max_mb=float(os.environ.get("NEUROOPS_CROP_STORE_MB", 2048)))
+    return _store
+
+
+class CropStore:
+    """
+    Content-addressed JPEG crops of embedded detections, stored as
+    <root>/<ab>/<cd>/<sha1>.jpg. Identical crops share one file, and the key
+    (the hash) goes into the vector point's payload as "crop", so a search
+    hit's thumbnail is a plain file read.
+
+    A file's mtime is its last use (put or open), and when the store grows
+    past max_mb the least recently used crops are evicted down to 90% of the
+    budget. compact() also drops crops no vector point references anymore.
+    """
+    def __init__(self, root=None, max_mb=2048, max_side=128, quality=80):
+        self.root = root or CROP_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_side = max_side
+        self.quality = quality
+        self.bytes = None  # total size, scanned on the first put
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key[2:4], f"{key}.jpg")
+
+    def encode(self, crop):
+        """RGB crop -> JPEG bytes, longest side scaled down to max_side."""
+        h, w = crop.shape[:2]
+        scale = self.max_side / max(h, w)
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        ok, data = cv2.imencode(".jpg", cv2.cvtColor(crop, cv2.COLOR_RGB2BGR),
+                                [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return data.tobytes()
+
+    def put(self, crop):
+        """Stores an RGB crop and returns its key."""
+        data = self.encode(crop)
+        key = hashlib.sha1(data).hexdigest()
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path)
+            return key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        if self.bytes is None:
+            self.bytes = sum(size for _, size, _ in self._files())
+        else:
+            self.bytes += len(data)
+        if self.bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+        return key
+
+    def put_many(self, crops):
+        keys = []
+        for crop in crops:
+            try:
+                keys.append(self.put(crop))
+            except Exception as e:
+                print(f"[CROPS] Could not store crop: {e}")
+                keys.append(None)
+        return keys
+
+    def open(self, key):
+        """Path of the crop for `key` (marking it used), or None if evicted."""
+        if not key:
+            return None
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def _files(self):
+        """(mtime, size, path) of every stored crop."""
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".jpg"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def evict(self, target_bytes):
+        """Deletes least recently used crops until the store fits in target_bytes."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in files:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.bytes = total
+        return removed
+
+    def compact(self, referenced=None, grace=3600):
+        """
+        Removes leftover temp files, crops not in `referenced` (a set of
+        keys, when given), then LRU-evicts down to the budget and deletes
+        empty shard directories. Returns counts of what was removed.
+
+        Temp files and unreferenced crops used within the last `grace`
+        seconds are kept: a running ingest put()s its crops before it
+        upserts the points that reference them.
+        """
+        stats = {"temp": 0, "unreferenced": 0, "evicted": 0, "dirs": 0}
+        cutoff = time.time() - grace
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.stat(path).st_mtime > cutoff:
+                        continue
+                except OSError:
+                    continue
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    stats["temp"] += 1
+                elif referenced is not None and name.endswith(".jpg") and name[:-4] not in referenced:
+                    os.remove(path)
+                    stats["unreferenced"] += 1
+        stats["evicted"] = self.evict(self.max_bytes)
+        for dirpath, dirnames, names in os.walk(self.root, topdown=False):
+            if dirpath != self.root and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+                stats["dirs"] += 1
+        stats["crops"] = sum(1 for _ in self._files())
+        stats["mb"] = round(self.bytes / (1024 * 1024), 2)
+        return stats
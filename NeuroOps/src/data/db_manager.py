@@ -1,5 +1,5 @@
 import os
-from .models import init_db, Video, Detection
+from .models import init_db, Video, Detection, Camera
 
 class DatabaseManager:
     def __init__(self, db_path=None):
@@ -56,3 +56,61 @@ class DatabaseManager:
             return video.file_path if video else None
         finally:
             session.close()
+
+    def get_all_paths(self):
+        session = self.get_session()
+        try:
+            return [video.file_path for video in session.query(Video).order_by(Video.id).all()]
+        finally:
+            session.close()
+
+    def save_camera(self, name, url, **settings):
+        """
+        Adds or updates the camera called `name`, and gives it the video row
+        its live detections are stored under. Returns the camera as a dict.
+        """
+        session = self.get_session()
+        try:
+            camera = session.query(Camera).filter_by(name=name).first()
+            if camera is None:
+                video = Video(file_path=f"camera://{name}", filename=name, status="LIVE")
+                session.add(video)
+                session.flush()
+                camera = Camera(name=name, url=url, video_id=video.id)
+                session.add(camera)
+            camera.url = url
+            for key, value in settings.items():
+                setattr(camera, key, value)
+            session.commit()
+            return self._camera_dict(camera)
+        except Exception as e:
+            session.rollback()
+            print(f"DB Error saving camera: {e}")
+            return None
+        finally:
+            session.close()
+
+    def get_cameras(self, ai_only=False):
+        session = self.get_session()
+        try:
+            query = session.query(Camera)
+            if ai_only:
+                query = query.filter_by(ai_enabled=True)
+            return [self._camera_dict(c) for c in query.order_by(Camera.id).all()]
+        finally:
+            session.close()
+
+    @staticmethod
+    def _camera_dict(camera):
+        return {
+            "id": camera.id,
+            "name": camera.name,
+            "location": camera.location,
+            "category": camera.category,
+            "url": camera.url,
+            "fps_limit": camera.fps_limit,
+            "ai_enabled": bool(camera.ai_enabled),
+            "detection_types": camera.detection_types or [],
+            "priority": camera.priority or 2,
+            "video_id": camera.video_id,
+        }
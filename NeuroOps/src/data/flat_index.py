@@ -0,0 +1,468 @@
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# Same shape as the qdrant ScoredPoint fields the rest of the app reads
+ScoredHit = namedtuple("ScoredHit", ["id", "score", "payload"])
+Record = namedtuple("Record", ["id", "payload", "vector"])
+
+
+class FlatIndex:
+    """
+    Exact cosine index for a single collection, kept as normalized rows in
+    memory-mapped .npy segments.
+
+    On-disk layout (one directory per collection):
+        meta.json        dim, dtype, the list of sealed segments and the
+                         payload log / delete bitmap they go with
+        seg_00000.npy    sealed, read-only segments (memory-mapped on load)
+        tail_<k>.bin     raw rows appended since the k-th segment was sealed
+        payloads.jsonl   one {"id", "payload"} line per row, append-only
+        deleted.npy      delete bitmap over all rows
+
+    Rows are never rewritten in place: an upsert of an existing id marks the
+    old row deleted and appends a new one. Search is a matmul per segment
+    plus an argpartition top-k, so results are exact.
+
+    Every flush() seals the tail, however small, into a segment. Once more
+    than `max_small_segments` segments are below `segment_rows`, flush()
+    merges them into one and drops their deleted rows (see _compact).
+    """
+    def __init__(self, path, dim, dtype="float32", segment_rows=32768, max_small_segments=8):
+        self.path = path
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.segment_rows = segment_rows
+        self.max_small_segments = max_small_segments
+        self.lock = threading.RLock()
+
+        self._segments = []       # list of (file_name, mmap array)
+        self._next_segment = 0    # number of the next segment file (names are never reused)
+        self._payloads_name = "payloads.jsonl"
+        self._deleted_name = "deleted.npy"
+        self._tail_chunks = []    # in-memory copies of the rows in the tail file
+        self._tail_cache = None
+        self._ids = []
+        self._row_of = {}
+        self._columns = {}        # payload key -> list of values (None = missing)
+        self._column_cache = {}   # (key, kind) -> (n_rows, np.ndarray)
+        self._deleted = np.zeros(0, dtype=bool)
+
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    # --- Persistence ---
+
+    def _meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def _tail_path(self):
+        return os.path.join(self.path, f"tail_{len(self._segments)}.bin")
+
+    def _write_meta(self):
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "segments": [name for name, _ in self._segments],
+            "next_segment": self._next_segment,
+            "payloads": self._payloads_name,
+            "deleted": self._deleted_name,
+        }
+        tmp = self._meta_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path())
+
+    def _load(self):
+        if not os.path.exists(self._meta_path()):
+            self._write_meta()
+            return
+
+        with open(self._meta_path(), "r") as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self.dtype = np.dtype(meta["dtype"])
+
+        self._payloads_name = meta.get("payloads", self._payloads_name)
+        self._deleted_name = meta.get("deleted", self._deleted_name)
+        for name in meta.get("segments", []):
+            arr = np.load(os.path.join(self.path, name), mmap_mode="r")
+            self._segments.append((name, arr))
+        self._next_segment = meta.get("next_segment", len(self._segments))
+        sealed_rows = sum(len(arr) for _, arr in self._segments)
+
+        # Payload lines are written after the vectors, so they decide how many rows really exist
+        payload_path = os.path.join(self.path, self._payloads_name)
+        rows = []
+        if os.path.exists(payload_path):
+            with open(payload_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            rows.append(json.loads(line))
+                        except ValueError:
+                            break  # Torn last line after a crash
+
+        tail_rows = max(0, len(rows) - sealed_rows)
+        tail_path = self._tail_path()
+        if os.path.exists(tail_path):
+            row_bytes = self.dim * self.dtype.itemsize
+            complete = os.path.getsize(tail_path) // row_bytes  # Ignore a torn last row
+            tail = np.fromfile(tail_path, dtype=self.dtype, count=complete * self.dim)
+            tail = tail.reshape(-1, self.dim)[:tail_rows]
+            if len(tail):
+                self._tail_chunks.append(tail)
+            tail_rows = len(tail)
+        else:
+            tail_rows = 0
+
+        # Drop files meta.json doesn't reference: stale tails of an interrupted
+        # seal, and the old or half-written files of an interrupted compaction
+        current = {name for name, _ in self._segments} | {self._payloads_name, self._deleted_name}
+        for name in os.listdir(self.path):
+            stale_tail = name.startswith("tail_") and os.path.join(self.path, name) != tail_path
+            stale = name.startswith(("seg_", "payloads", "deleted")) and name not in current
+            if stale_tail or stale:
+                os.remove(os.path.join(self.path, name))
+
+        for row in rows[:sealed_rows + tail_rows]:
+            self._append_payload(row["id"], row.get("payload") or {})
+
+        deleted_path = os.path.join(self.path, self._deleted_name)
+        self._deleted = np.zeros(len(self._ids), dtype=bool)
+        if os.path.exists(deleted_path):
+            saved = np.load(deleted_path)
+            n = min(len(saved), len(self._deleted))
+            self._deleted[:n] = saved[:n]
+
+        # Rewrite the payload log if it had rows without vectors
+        if len(rows) != len(self._ids):
+            self._rewrite_payloads()
+
+    def _rewrite_payloads(self, name=None):
+        payload_path = os.path.join(self.path, name or self._payloads_name)
+        tmp = payload_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in range(len(self._ids)):
+                f.write(json.dumps({"id": self._ids[row], "payload": self._payload(row)}) + "\n")
+        os.replace(tmp, payload_path)
+
+    def _save_deleted(self, name=None):
+        deleted_path = os.path.join(self.path, name or self._deleted_name)
+        tmp = deleted_path + ".tmp.npy"
+        np.save(tmp, self._deleted)
+        os.replace(tmp, deleted_path)
+
+    def _save_segment(self, rows):
+        """Writes rows as the next segment file; returns (file_name, mmap array)."""
+        name = f"seg_{self._next_segment:05d}.npy"
+        self._next_segment += 1
+        seg_path = os.path.join(self.path, name)
+        np.save(seg_path + ".tmp.npy", rows)
+        os.replace(seg_path + ".tmp.npy", seg_path)
+        return name, np.load(seg_path, mmap_mode="r")
+
+    def _seal_tail(self):
+        """Turns the tail into a new read-only segment."""
+        tail = self._tail()
+        if tail is None or not len(tail):
+            return
+        old_tail_path = self._tail_path()
+        self._segments.append(self._save_segment(tail))
+        self._write_meta()
+        self._tail_chunks = []
+        self._tail_cache = None
+        if os.path.exists(old_tail_path):
+            os.remove(old_tail_path)
+
+    def _compact(self):
+        """
+        Merges the segments smaller than segment_rows into one, without
+        their deleted rows, once there are more than max_small_segments.
+        Call with an empty tail. Row numbers change, so the payload log and
+        delete bitmap are rewritten under new names; meta.json switches to
+        the new files in one replace, and _load() removes the old ones.
+        """
+        small = {i for i, (_, arr) in enumerate(self._segments) if len(arr) < self.segment_rows}
+        if len(small) <= self.max_small_segments or self._tail() is not None:
+            return
+
+        kept, merged, parts, offset = [], [], [], 0
+        for i, (name, arr) in enumerate(self._segments):
+            rows = np.arange(offset, offset + len(arr))
+            if i in small:
+                live = ~self._deleted[offset:offset + len(arr)]
+                merged.append(rows[live])
+                parts.append(np.asarray(arr[live]))
+            else:
+                kept.append(rows)
+            offset += len(arr)
+        order = np.concatenate(kept + merged)
+        segments = [seg for i, seg in enumerate(self._segments) if i not in small]
+        old_names = [name for i, (name, _) in enumerate(self._segments) if i in small]
+        old_files = old_names + [self._payloads_name, self._deleted_name]
+
+        new_segment = self._save_segment(np.concatenate(parts)) if sum(len(p) for p in parts) else None
+        row_of = {}
+        for new, old in enumerate(order):
+            point_id = self._ids[old]
+            if self._row_of.get(point_id) == old:
+                row_of[point_id] = new
+        self._ids = [self._ids[old] for old in order]
+        self._columns = {key: [col[old] for old in order] for key, col in self._columns.items()}
+        self._column_cache = {}
+        self._row_of = row_of
+        self._deleted = self._deleted[order]
+        number = self._next_segment
+        self._rewrite_payloads(f"payloads_{number:05d}.jsonl")
+        self._save_deleted(f"deleted_{number:05d}.npy")
+
+        self._segments = segments + ([new_segment] if new_segment is not None else [])
+        self._payloads_name = f"payloads_{number:05d}.jsonl"
+        self._deleted_name = f"deleted_{number:05d}.npy"
+        self._write_meta()
+        for name in old_files:
+            path = os.path.join(self.path, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # --- Rows & payload columns ---
+
+    def _append_payload(self, point_id, payload):
+        """Returns True if the id replaced an existing row."""
+        row = len(self._ids)
+        old = self._row_of.get(point_id)
+        replaced = old is not None and old < len(self._deleted)
+        if replaced:
+            self._deleted[old] = True
+        self._ids.append(point_id)
+        self._row_of[point_id] = row
+        for key in payload:
+            if key not in self._columns:
+                self._columns[key] = [None] * row
+        for key, col in self._columns.items():
+            col.append(payload.get(key))
+        return replaced
+
+    def _payload(self, row):
+        return {k: col[row] for k, col in self._columns.items() if col[row] is not None}
+
+    def _tail(self):
+        if not self._tail_chunks:
+            return None
+        if self._tail_cache is None:
+            self._tail_cache = np.concatenate(self._tail_chunks)
+            self._tail_chunks = [self._tail_cache]
+        return self._tail_cache
+
+    def _blocks(self):
+        for _, arr in self._segments:
+            yield arr
+        tail = self._tail()
+        if tail is not None:
+            yield tail
+
+    def _column(self, key, kind):
+        """Cached numpy view of a payload column ('obj' for matching, 'num' for ranges)."""
+        values = self._columns.get(key)
+        if values is None:
+            return None
+        cached = self._column_cache.get((key, kind))
+        if cached is not None and cached[0] == len(values):
+            return cached[1]
+        if kind == "num":
+            arr = np.array([v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+                            for v in values], dtype=np.float64)
+        else:
+            arr = None
+            if len({type(v) for v in values}) == 1:
+                # Homogeneous ints/strings get a native dtype, which makes == and isin much faster
+                typed = np.asarray(values)
+                if typed.dtype.kind in "iufUS" and typed.ndim == 1:
+                    arr = typed
+            if arr is None:
+                arr = np.empty(len(values), dtype=object)
+                arr[:] = values
+        self._column_cache[(key, kind)] = (len(values), arr)
+        return arr
+
+    def _filter_mask(self, filters):
+        """
+        filters: {key: value}              exact match
+                 {key: [v1, v2, ...]}      match any
+                 {key: {"gte": a, "lt": b}} numeric range (gt/gte/lt/lte)
+        """
+        n = len(self._ids)
+        mask = ~self._deleted
+        for key, cond in (filters or {}).items():
+            if isinstance(cond, dict):
+                col = self._column(key, "num")
+                if col is None:
+                    return np.zeros(n, dtype=bool)
+                with np.errstate(invalid="ignore"):
+                    if "gt" in cond:
+                        mask &= col > cond["gt"]
+                    if "gte" in cond:
+                        mask &= col >= cond["gte"]
+                    if "lt" in cond:
+                        mask &= col < cond["lt"]
+                    if "lte" in cond:
+                        mask &= col <= cond["lte"]
+            else:
+                col = self._column(key, "obj")
+                if col is None:
+                    return np.zeros(n, dtype=bool)
+                if isinstance(cond, (list, tuple, set)):
+                    mask &= np.isin(col, list(cond))
+                else:
+                    mask &= col == cond
+        return mask
+
+    # --- Public API ---
+
+    def __len__(self):
+        return int(len(self._ids) - self._deleted.sum())
+
+    def upsert(self, ids, vectors, payloads):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(vectors) != len(ids) or len(ids) != len(payloads):
+            raise ValueError("ids, vectors and payloads must have the same length")
+        if not len(ids):
+            return
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        rows = (vectors / norms).astype(self.dtype)
+
+        with self.lock:
+            # Vectors first, payloads second: _load() trusts the payload log as the row count
+            with open(self._tail_path(), "ab") as f:
+                f.write(rows.tobytes())
+            with open(os.path.join(self.path, self._payloads_name), "a", encoding="utf-8") as f:
+                for pid, payload in zip(ids, payloads):
+                    f.write(json.dumps({"id": pid, "payload": payload}) + "\n")
+
+            self._tail_chunks.append(rows)
+            self._tail_cache = None
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(ids), dtype=bool)])
+            replaced = False
+            for pid, payload in zip(ids, payloads):
+                replaced |= self._append_payload(pid, payload or {})
+            # Rows appended since the last save load as live, so only replacements need persisting
+            if replaced:
+                self._save_deleted()
+
+            tail = self._tail()
+            if tail is not None and len(tail) >= self.segment_rows:
+                self._seal_tail()
+
+    def delete(self, ids):
+        with self.lock:
+            changed = False
+            for pid in ids:
+                row = self._row_of.pop(pid, None)
+                if row is not None and not self._deleted[row]:
+                    self._deleted[row] = True
+                    changed = True
+            if changed:
+                self._save_deleted()
+
+    def search(self, query_vector, limit=5, score_threshold=None, filters=None):
+        q = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(q)
+        if norm == 0 or limit <= 0:
+            return []
+        q = q / norm
+
+        with self.lock:
+            mask = None
+            if filters or self._deleted.any():
+                mask = self._filter_mask(filters)
+                if not mask.any():
+                    return []
+
+            cand_scores, cand_rows = [], []
+            offset = 0
+            for block in self._blocks():
+                n = len(block)
+                rows = None
+                if mask is not None:
+                    block_mask = mask[offset:offset + n]
+                    if not block_mask.any():
+                        offset += n
+                        continue
+                    if block_mask.sum() * 8 < n:
+                        # Selective filter: only score the matching rows
+                        rows = np.flatnonzero(block_mask)
+                if rows is not None:
+                    scores = self._scores(block[rows], q)
+                else:
+                    scores = self._scores(block, q)
+                    if mask is not None:
+                        scores = np.where(block_mask, scores, -np.inf)
+                m = len(scores)
+                k = min(limit, m)
+                top = np.argpartition(-scores, k - 1)[:k] if k < m else np.arange(m)
+                cand_scores.append(scores[top])
+                cand_rows.append((rows[top] if rows is not None else top) + offset)
+                offset += n
+
+            if not cand_scores:
+                return []
+            scores = np.concatenate(cand_scores)
+            rows = np.concatenate(cand_rows)
+            order = np.argsort(-scores, kind="stable")[:limit]
+
+            hits = []
+            for i in order:
+                score = float(scores[i])
+                if score == -np.inf:
+                    break
+                if score_threshold is not None and score < score_threshold:
+                    break
+                row = int(rows[i])
+                hits.append(ScoredHit(self._ids[row], score, self._payload(row)))
+            return hits
+
+    @staticmethod
+    def _scores(block, q):
+        if block.dtype == np.float32:
+            return block @ q
+        # No BLAS for float16: upcast in slices to keep the temporary small
+        scores = np.empty(len(block), dtype=np.float32)
+        step = 65536
+        for i in range(0, len(block), step):
+            scores[i:i + step] = np.asarray(block[i:i + step], dtype=np.float32) @ q
+        return scores
+
+    def iter_points(self, filters=None, with_vectors=False):
+        """Yields a Record (vector is None unless requested) for every live row matching the filters."""
+        with self.lock:
+            mask = self._filter_mask(filters)
+            offset = 0
+            blocks = list(self._blocks())
+        for block in blocks:
+            n = len(block)
+            for row in np.flatnonzero(mask[offset:offset + n]):
+                vector = np.asarray(block[row], dtype=np.float32) if with_vectors else None
+                yield Record(self._ids[offset + row], self._payload(offset + row), vector)
+            offset += n
+
+    def flush(self):
+        """
+        Seals the tail into a segment so the next load can memory-map it,
+        then merges small segments past the threshold (see _compact).
+        """
+        with self.lock:
+            self._seal_tail()
+            self._compact()
+
+    def close(self):
+        """Releases the memory maps. The index must not be used afterwards."""
+        with self.lock:
+            self._segments = []
+            self._tail_chunks = []
+            self._tail_cache = None
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Text, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, Text, JSON, Boolean
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.orm import sessionmaker
 import os
@@ -54,12 +54,31 @@ class TextDetection(Base):
     video_id = Column(Integer, ForeignKey('videos.id'), nullable=False)
     frame_index = Column(Integer, nullable=False)
     timestamp = Column(Float, nullable=False)
-    text_content = Column(String, nullable=False)
+    text_content = Column(String, nullable=False) # Best-confidence reading
     confidence = Column(Float, nullable=False)
     bbox_xyxy = Column(JSON, nullable=False) # [x1, y1, x2, y2]
+    # A row covers every consolidated sighting: timestamp/frame_index are the
+    # first one, last_seen the latest (NULL on rows written before consolidation)
+    last_seen = Column(Float, nullable=True)
+    observations = Column(Integer, default=1)
 
     video = relationship("Video", back_populates="text_detections")
 
+class Camera(Base):
+    __tablename__ = 'cameras'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    location = Column(String)
+    category = Column(String)
+    url = Column(String, nullable=False) # Stream URL (rtsp://, http://) or a local file looped as a stand-in
+    fps_limit = Column(Integer, default=15)
+    ai_enabled = Column(Boolean, default=False)
+    detection_types = Column(JSON) # e.g. ["Person", "Vehicle"]
+    priority = Column(Integer, default=2) # 1 low, 2 normal, 3 high: live analysis degrades low first
+    # Live detections and embeddings are stored under this video row, timestamps in wall-clock seconds
+    video_id = Column(Integer, ForeignKey('videos.id'))
+
 def init_db(db_path):
     # Ensure usage of absolute path and forward slashes for Windows compatibility
     db_path = os.path.abspath(db_path).replace('\\', '/')
@@ -71,4 +90,17 @@ def init_db(db_path):
         
     engine = create_engine(f'sqlite:///{db_path}')
     Base.metadata.create_all(engine)
+    _add_missing_columns(engine)
     return sessionmaker(bind=engine)
+
+def _add_missing_columns(engine):
+    """create_all doesn't alter existing tables; add new nullable columns to older databases."""
+    from sqlalchemy import inspect, text
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    col_type = column.type.compile(engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
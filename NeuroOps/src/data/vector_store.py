@@ -5,6 +5,7 @@ import uuid
 
 # Singleton instance
 _client_instance = None
+_backends = {}
 
 def get_qdrant_client(path="./qdrant_storage"):
     global _client_instance
@@ -12,25 +13,60 @@ def get_qdrant_client(path="./qdrant_storage"):
         _client_instance = QdrantClient(path=path)
     return _client_instance
 
-class VectorStore:
-    def __init__(self, collection_suffix="default"):
-        self.client = get_qdrant_client()
-        self.collection_name = f"neuroops_{collection_suffix}"
-        self.identity_collection = "neuroops_identities"
-        self.vector_size = 512 
-        
-        self._init_collection(self.collection_name)
-        self._init_collection(self.identity_collection)
+def _as_list(vector):
+    return vector.tolist() if hasattr(vector, "tolist") else vector
 
-    def _init_collection(self, name):
+
+class VectorBackend:
+    """
+    Storage engine behind VectorStore. Search hits expose .id, .score and
+    .payload, matching qdrant's ScoredPoint.
+
+    Filters are plain dicts shared by every backend:
+        {"video_id": 3}                       exact match
+        {"class_name": ["person", "car"]}     match any
+        {"timestamp": {"gte": 1.0, "lt": 5}}  numeric range
+    """
+    def ensure_collection(self, name, size):
+        raise NotImplementedError
+
+    def upsert(self, name, ids, vectors, payloads):
+        raise NotImplementedError
+
+    def search(self, name, query_vector, limit=5, score_threshold=None, filters=None):
+        raise NotImplementedError
+
+    def scroll(self, name, filters=None, with_vectors=False):
+        """Yields every point matching the filters (.id, .payload, .vector)."""
+        raise NotImplementedError
+
+    def delete(self, name, ids):
+        raise NotImplementedError
+
+    def delete_collection(self, name):
+        raise NotImplementedError
+
+    def list_collections(self):
+        raise NotImplementedError
+
+    def flush(self, name):
+        pass
+
+
+class QdrantBackend(VectorBackend):
+    """Qdrant in local (path=) mode."""
+    def __init__(self, path="./qdrant_storage", client=None):
+        self.client = client if client is not None else get_qdrant_client(path)
+
+    def ensure_collection(self, name, size):
         collections = self.client.get_collections()
         exists = any(c.name == name for c in collections.collections)
-        
+
         if exists:
             # Check for dimension mismatch
             info = self.client.get_collection(name)
-            if info.config.params.vectors.size != self.vector_size:
-                print(f"[VECTOR STORE] Dimension mismatch for {name} (Expected {self.vector_size}, Got {info.config.params.vectors.size}). Recreating...")
+            if info.config.params.vectors.size != size:
+                print(f"[VECTOR STORE] Dimension mismatch for {name} (Expected {size}, Got {info.config.params.vectors.size}). Recreating...")
                 self.client.delete_collection(name)
                 exists = False
 
@@ -38,11 +74,160 @@ class VectorStore:
             self.client.create_collection(
                 collection_name=name,
                 vectors_config=models.VectorParams(
-                    size=self.vector_size,
+                    size=size,
                     distance=models.Distance.COSINE
                 )
             )
 
+    def upsert(self, name, ids, vectors, payloads):
+        points = [
+            models.PointStruct(id=pid, vector=_as_list(vector), payload=payload)
+            for pid, vector, payload in zip(ids, vectors, payloads)
+        ]
+        self.client.upsert(collection_name=name, points=points)
+
+    def search(self, name, query_vector, limit=5, score_threshold=None, filters=None):
+        # Use query_points as it is more robust across versions or local mode
+        return self.client.query_points(
+            collection_name=name,
+            query=_as_list(query_vector),
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=self._to_filter(filters)
+        ).points
+
+    def scroll(self, name, filters=None, with_vectors=False, batch=1000):
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=name,
+                scroll_filter=self._to_filter(filters),
+                limit=batch,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors
+            )
+            yield from records
+            if offset is None:
+                break
+
+    def delete(self, name, ids):
+        self.client.delete(collection_name=name, points_selector=models.PointIdsList(points=list(ids)))
+
+    def delete_collection(self, name):
+        self.client.delete_collection(name)
+
+    def list_collections(self):
+        return [c.name for c in self.client.get_collections().collections]
+
+    @staticmethod
+    def _to_filter(filters):
+        if not filters:
+            return None
+        must = []
+        for key, cond in filters.items():
+            if isinstance(cond, dict):
+                must.append(models.FieldCondition(key=key, range=models.Range(**cond)))
+            elif isinstance(cond, (list, tuple, set)):
+                must.append(models.FieldCondition(key=key, match=models.MatchAny(any=list(cond))))
+            else:
+                must.append(models.FieldCondition(key=key, match=models.MatchValue(value=cond)))
+        return models.Filter(must=must)
+
+
+class FlatBackend(VectorBackend):
+    """
+    Exact in-process index (src.data.flat_index). Faster than qdrant's local
+    mode up to roughly a million vectors per collection.
+    """
+    def __init__(self, path="./flat_storage", dtype="float32"):
+        self.path = path
+        self.dtype = dtype
+        self.indexes = {}
+
+    def _index(self, name):
+        if name not in self.indexes and os.path.exists(os.path.join(self.path, name, "meta.json")):
+            from .flat_index import FlatIndex
+            # Collection written by an earlier run: dim comes from its meta.json
+            self.indexes[name] = FlatIndex(os.path.join(self.path, name), None, dtype=self.dtype)
+        return self.indexes[name]
+
+    def ensure_collection(self, name, size):
+        from .flat_index import FlatIndex
+
+        index = self.indexes.get(name)
+        if index is None:
+            index = FlatIndex(os.path.join(self.path, name), size, dtype=self.dtype)
+            self.indexes[name] = index
+        if index.dim != size:
+            print(f"[VECTOR STORE] Dimension mismatch for {name} (Expected {size}, Got {index.dim}). Recreating...")
+            self.delete_collection(name)
+            self.indexes[name] = FlatIndex(os.path.join(self.path, name), size, dtype=self.dtype)
+
+    def upsert(self, name, ids, vectors, payloads):
+        self._index(name).upsert(ids, vectors, payloads)
+
+    def search(self, name, query_vector, limit=5, score_threshold=None, filters=None):
+        return self._index(name).search(query_vector, limit=limit, score_threshold=score_threshold, filters=filters)
+
+    def scroll(self, name, filters=None, with_vectors=False):
+        return self._index(name).iter_points(filters=filters, with_vectors=with_vectors)
+
+    def delete(self, name, ids):
+        self._index(name).delete(ids)
+
+    def delete_collection(self, name):
+        import shutil
+
+        index = self.indexes.pop(name, None)
+        if index is not None:
+            index.close()
+        shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def list_collections(self):
+        if not os.path.isdir(self.path):
+            return list(self.indexes)
+        # Only finished collections: stray or half-created dirs have no meta.json and _index can't open them
+        on_disk = [d for d in os.listdir(self.path) if os.path.exists(os.path.join(self.path, d, "meta.json"))]
+        return sorted(set(on_disk) | set(self.indexes))
+
+    def flush(self, name):
+        if name in self.indexes:
+            self.indexes[name].flush()
+
+
+def get_backend(kind=None):
+    """
+    Returns the process-wide backend of the given kind ("qdrant" or "flat").
+    Defaults to $NEUROOPS_VECTOR_BACKEND, then qdrant.
+    """
+    kind = (kind or os.environ.get("NEUROOPS_VECTOR_BACKEND", "qdrant")).lower()
+    if kind not in _backends:
+        if kind == "qdrant":
+            _backends[kind] = QdrantBackend()
+        elif kind == "flat":
+            _backends[kind] = FlatBackend(dtype=os.environ.get("NEUROOPS_FLAT_DTYPE", "float32"))
+        else:
+            raise ValueError(f"Unknown vector backend: {kind}")
+    return _backends[kind]
+
+
+class VectorStore:
+    def __init__(self, collection_suffix="default", backend=None):
+        if backend is None or isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend = backend
+        self.client = getattr(backend, "client", None)
+        self.collection_name = f"neuroops_{collection_suffix}"
+        self.identity_collection = "neuroops_identities"
+        self.vector_size = 512
+
+        self._init_collection(self.collection_name)
+        self._init_collection(self.identity_collection)
+
+    def _init_collection(self, name):
+        self.backend.ensure_collection(name, self.vector_size)
+
     def add_embedding(self, vector, metadata):
         return self._add_point(self.collection_name, vector, metadata)
 
@@ -51,42 +236,58 @@ class VectorStore:
 
     def _add_point(self, collection, vector, metadata):
         point_id = str(uuid.uuid4())
-        self.client.upsert(
-            collection_name=collection,
-            points=[
-                models.PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload=metadata
-                )
-            ]
-        )
+        self.backend.upsert(collection, [point_id], [vector], [metadata])
         return point_id
 
     def add_embeddings_batch(self, items):
         """Batch upsert: items is a list of (vector, metadata) tuples."""
+        return self._add_points(self.collection_name, items)
+
+    def _add_points(self, collection, items, ids=None):
         if not items:
             return []
-        points = []
-        ids = []
-        for vector, metadata in items:
-            pid = str(uuid.uuid4())
-            ids.append(pid)
-            points.append(models.PointStruct(id=pid, vector=vector, payload=metadata))
-        self.client.upsert(collection_name=self.collection_name, points=points)
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in items]
+        self.backend.upsert(
+            collection,
+            ids,
+            [vector for vector, _ in items],
+            [metadata for _, metadata in items]
+        )
         return ids
 
-    def search(self, query_vector, limit=5, score_threshold=0.2):
-        # Use query_points as it is more robust across versions or local mode
-        results = self.client.query_points(
-            collection_name=self.collection_name,
-            query=query_vector,
+    def search(self, query_vector, limit=5, score_threshold=0.2, filters=None):
+        return self.backend.search(
+            self.collection_name,
+            query_vector,
             limit=limit,
-            score_threshold=score_threshold
-        ).points
-        return results
+            score_threshold=score_threshold,
+            filters=filters
+        )
+
+    def add_identities_batch(self, items, ids=None):
+        """Batch upsert into the shared identity collection."""
+        return self._add_points(self.identity_collection, items, ids=ids)
+
+    def search_identities(self, query_vector, limit=100, score_threshold=0.35, filters=None):
+        """Searches the identity (AdaFace) collection across all videos."""
+        return self.backend.search(
+            self.identity_collection,
+            query_vector,
+            limit=limit,
+            score_threshold=score_threshold,
+            filters=filters
+        )
+
+    def iter_identities(self, filters=None, with_vectors=False):
+        return self.backend.scroll(self.identity_collection, filters=filters, with_vectors=with_vectors)
+
+    def flush(self):
+        """Lets the backend compact what was written since the last flush (no-op for qdrant)."""
+        self.backend.flush(self.collection_name)
+        self.backend.flush(self.identity_collection)
 
     def clear_collection(self):
         """Deletes and recreates the collection to wipe data."""
-        self.client.delete_collection(self.collection_name)
+        self.backend.delete_collection(self.collection_name)
         self._init_collection(self.collection_name)
@@ -1,14 +1,17 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, 
     QCheckBox, QPushButton, QSlider, QScrollArea, QFrame, QGroupBox, 
-    QMessageBox
+    QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QImage, QPixmap, QColor
 import cv2
-import time
+import os
+
+from src.core.video.stream import LatestFrame, StreamReader
 
 class VideoThread(QThread):
+    """Preview of a stream; drops and stalls are reconnected by the StreamReader."""
     change_pixmap_signal = pyqtSignal(QImage)
     connection_status_signal = pyqtSignal(bool, str)
 
@@ -16,44 +19,39 @@ class VideoThread(QThread):
         super().__init__()
         self.url = url
         self._run_flag = True
+        self.slot = LatestFrame()
+        # Limit fps to ~30 for preview to save resources (extra frames are grabbed, not converted)
+        self.reader = StreamReader(url, self.slot, label="Preview", max_fps=30)
 
     def run(self):
-        # Attempt to open the stream
-        cap = cv2.VideoCapture(self.url)
-        
-        if not cap.isOpened():
-            self.connection_status_signal.emit(False, "Failed to connect to stream URL.")
-            return
-        
-        # Read one frame to confirm
-        ret, frame = cap.read()
-        if not ret:
-            self.connection_status_signal.emit(False, "Connected, but no frames received.")
-            cap.release()
-            return
+        self.reader.start()
+        connected = False
+        while self._run_flag:
+            item = self.slot.get(timeout=0.5)
+            if item is None:
+                if not connected and self.reader.reconnects:
+                    # Test Connection: report the first failure instead of retrying silently
+                    self.connection_status_signal.emit(False, self.reader.last_error or "Failed to connect to stream URL.")
+                    break
+                if self.slot.closed:
+                    break
+                continue
+            if not connected:
+                connected = True
+                self.connection_status_signal.emit(True, "Connection Successful!")
 
-        self.connection_status_signal.emit(True, "Connection Successful!")
+            rgb_image = cv2.cvtColor(item[0], cv2.COLOR_BGR2RGB)
+            h, w, ch = rgb_image.shape
+            bytes_per_line = ch * w
+            convert_to_Qt_format = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+            p = convert_to_Qt_format.scaled(640, 360, Qt.AspectRatioMode.KeepAspectRatio)
+            self.change_pixmap_signal.emit(p)
 
-        while self._run_flag:
-            ret, frame = cap.read()
-            if ret:
-                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_image.shape
-                bytes_per_line = ch * w
-                convert_to_Qt_format = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                p = convert_to_Qt_format.scaled(640, 360, Qt.AspectRatioMode.KeepAspectRatio)
-                self.change_pixmap_signal.emit(p)
-            else:
-                # If stream drops, try to reconnect or just stop? For preview, we stop.
-                break
-            
-            # Limit fps to ~30 for preview to save resources
-            time.sleep(0.03) 
-            
-        cap.release()
+        self.reader.stop()
 
     def stop(self):
         self._run_flag = False
+        self.reader.stop()
         self.wait()
 
 class CamerasWidget(QWidget):
@@ -102,6 +100,9 @@ class CamerasWidget(QWidget):
         
         # --- 6. Permissions ---
         self.setup_permissions()
+
+        # --- 7. Stream Health ---
+        self.setup_health_panel()
         
         # --- Footer Actions ---
         footer_layout = QHBoxLayout()
@@ -275,10 +276,18 @@ class CamerasWidget(QWidget):
         layout.addWidget(det_lbl)
         
         types_layout = QHBoxLayout()
+        self.detection_checks = []
         for t in ["Person", "Vehicle", "Motion", "Intrusion Zone"]:
-            types_layout.addWidget(QCheckBox(t))
+            chk = QCheckBox(t)
+            self.detection_checks.append(chk)
+            types_layout.addWidget(chk)
         types_layout.addStretch()
         layout.addLayout(types_layout)
+
+        # Under load, live analysis slows low-priority cameras first
+        self.combo_priority = self.create_combo_field("Analysis Priority", ["Low", "Normal", "High"])
+        self.combo_priority.itemAt(1).widget().setCurrentIndex(1)
+        layout.addLayout(self.combo_priority)
         
         self.content_layout.addWidget(group)
 
@@ -293,6 +302,53 @@ class CamerasWidget(QWidget):
         
         self.content_layout.addWidget(group)
 
+    HEALTH_COLUMNS = [
+        ("Camera", "camera"), ("State", "state"), ("Stream FPS", "stream_fps"), ("Dropped", "dropped"),
+        ("Reconnects", "reconnects"), ("Stalls", "stalls"), ("Decode ms", "decode_ms"),
+        ("Analysis FPS", "fps"), ("Latency ms", "latency_ms"),
+    ]
+
+    def setup_health_panel(self):
+        group = self.create_section("Stream Health")
+        layout = group.layout()
+
+        self.health_table = QTableWidget(0, len(self.HEALTH_COLUMNS))
+        self.health_table.setHorizontalHeaderLabels([title for title, _ in self.HEALTH_COLUMNS])
+        self.health_table.setStyleSheet("QTableWidget { background: #111; border: none; color: #E0E0E0; }"
+                                        "QHeaderView::section { background: #1A1A1A; color: #AAA; border: none; padding: 6px; }")
+        self.health_table.verticalHeader().setVisible(False)
+        self.health_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.health_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.health_table.setMinimumHeight(160)
+        layout.addWidget(self.health_table)
+
+        # Live cameras and the preview stream, refreshed every second while the page is shown
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self.refresh_health)
+        self.health_timer.start(1000)
+
+        self.content_layout.addWidget(group)
+
+    def refresh_health(self):
+        if not self.isVisible():
+            return
+        from src.ai.live import get_live_service
+        rows = get_live_service().status()["cameras"]
+        if self.video_thread:
+            stream = self.video_thread.reader.stats()
+            rows = rows + [dict(stream, camera=stream["stream"], stream_fps=stream["fps"], fps=None)]
+
+        self.health_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.HEALTH_COLUMNS):
+                value = row.get(key)
+                item = QTableWidgetItem("-" if value is None else str(value))
+                if key == "state" and value != "streaming":
+                    item.setForeground(QColor("#FF5555" if value in ("backoff", "stalled") else "#AAA"))
+                if key == "state" and row.get("last_error"):
+                    item.setToolTip(row["last_error"])
+                self.health_table.setItem(r, c, item)
+
     # --- Helpers ---
     def create_section(self, title):
         group = QFrame()
@@ -338,7 +394,8 @@ class CamerasWidget(QWidget):
         return layout
 
     # --- Actions ---
-    def test_connection(self):
+    def build_url(self):
+        """Stream URL from the connection fields, or None without an IP."""
         # 1. Gather Info
         protocol = self.combo_protocol.itemAt(1).widget().currentText().lower()
         ip = self.get_input_text(self.field_ip).strip()
@@ -348,8 +405,9 @@ class CamerasWidget(QWidget):
         path = self.get_input_text(self.field_path).strip()
         
         if not ip:
-            QMessageBox.warning(self, "Missing Info", "Please enter at least an IP address.")
-            return
+            return None
+        if os.path.exists(ip):
+            return ip  # a local video file stands in for a camera (looped)
 
         # 2. Construct URL
         # Logic: If 'ip' already has a port, don't append the 'Port' field.
@@ -374,7 +432,14 @@ class CamerasWidget(QWidget):
                 path = "/" + path
                 
             url = f"{protocol}://{auth_part}{final_ip}{path}"
-            
+        return url
+
+    def test_connection(self):
+        url = self.build_url()
+        if not url:
+            QMessageBox.warning(self, "Missing Info", "Please enter at least an IP address.")
+            return
+
         print(f"Testing Stream URL: {url}")
         
         self.btn_test.setText("Connecting...")
@@ -409,7 +474,34 @@ class CamerasWidget(QWidget):
             self.btn_test.setStyleSheet("padding: 8px 16px; background: #007BFF; color: white; border: none;")
 
     def save_camera(self):
+        url = self.build_url()
+        name = self.get_input_text(self.entry_name).strip()
+        if not url or not name:
+            QMessageBox.warning(self, "Missing Info", "Please enter a camera name and an IP address.")
+            return
         self.stop_stream()
+
+        from src.data.db_manager import DatabaseManager
+        camera = DatabaseManager().save_camera(
+            name, url,
+            location=self.get_input_text(self.entry_location).strip(),
+            category=self.combo_category.itemAt(1).widget().currentText(),
+            fps_limit=self.fps_slider.value(),
+            ai_enabled=self.chk_ai.isChecked(),
+            detection_types=[chk.text() for chk in self.detection_checks if chk.isChecked()],
+            priority=self.combo_priority.itemAt(1).widget().currentIndex() + 1,
+        )
+        if camera is None:
+            QMessageBox.warning(self, "Error", "Could not save the camera.")
+            return
+
+        # Live analysis: detections of this camera become searchable like ingested videos
+        from src.ai.live import get_live_service
+        service = get_live_service()
+        if camera["ai_enabled"]:
+            service.start(camera)
+        else:
+            service.stop(camera["name"])
         QMessageBox.information(self, "Success", "Camera saved successfully to the system.")
     
     def closeEvent(self, event):
@@ -61,6 +61,14 @@ class MainWindow(QMainWindow):
         self.cameras_widget = CamerasWidget()
         self.page_stack.addWidget(self.cameras_widget) # Real Cameras Widget
 
+        # Live analysis of saved AI-enabled cameras ($NEUROOPS_LIVE=0 disables autostart)
+        from src.ai.live import get_live_service
+        self.live_service = get_live_service()
+        self.live_service.alert_triggered.connect(self.dashboard_widget.add_alert)
+        self.live_service.log_message.connect(print)
+        if os.environ.get("NEUROOPS_LIVE", "1") != "0":
+            self.live_service.start_saved()
+
     def on_search_jump(self, video_id, timestamp):
         # Switch to player and seek
         # Note: In a full app, we need to handle loading the specific video_id.
@@ -177,6 +185,18 @@ class MainWindow(QMainWindow):
             btn.setChecked(False)
         sender_btn.setChecked(True)
 
+    def closeEvent(self, event):
+        self.live_service.stop_all()
+        # Background proxy builds / clip exports are parented to the application
+        from src.core.video.export import ClipExportJob
+        from src.core.video.proxy import ProxyJob
+        jobs = QApplication.instance().findChildren(ProxyJob) + QApplication.instance().findChildren(ClipExportJob)
+        for job in jobs:
+            job.stop()
+        for job in jobs:
+            job.wait()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
@@ -246,8 +246,22 @@ class PlayerWidget(QWidget):
                  except AttributeError:
                      pass
             
+            # Workbench proxy once analysis is done, so the two don't compete for the CPU
+            self.worker.finished.connect(lambda: self.start_proxy_job(file_path))
             self.worker.start()
 
+    def start_proxy_job(self, file_path):
+        from src.core.video.proxy import ProxyJob, proxies_enabled
+        if not proxies_enabled():
+            return
+        from PyQt6.QtWidgets import QApplication
+        # Owned by the application, so a later ingest can't drop a running job;
+        # MainWindow.closeEvent stops it
+        job = ProxyJob([file_path], parent=QApplication.instance())
+        job.log_message.connect(lambda msg: print(msg))
+        job.finished.connect(job.deleteLater)
+        job.start()
+
     def play_video(self):
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.media_player.pause()
@@ -320,8 +334,6 @@ class PlayerWidget(QWidget):
         
         try:
             import os
-            import subprocess
-            import imageio_ffmpeg
             from datetime import datetime
             
             # Normalize Input Path
@@ -359,44 +371,22 @@ class PlayerWidget(QWidget):
             
             print(f"Saving to: {output_path}")
             
-            ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-            
-            cmd = [
-                ffmpeg_exe,
-                '-y',
-                '-ss', f"{s_sec:.3f}",
-                '-i', input_path,
-                '-t', f"{duration:.3f}",
-                '-c', 'copy',
-                output_path
-            ]
-            
-            print(f"Executing: {cmd}")
-            
-            result = subprocess.run(
-                cmd, 
-                check=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=False
-            )
-            
-            print(f"Save Success: {output_path}")
-            
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.information(self, "Clip Saved", f"Saved to:\n{output_path}")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"FFmpeg Error Code: {e.returncode}")
-            try:
-                stderr_output = e.stderr.decode('utf-8', errors='replace')
-                print(f"FFmpeg Output: {stderr_output}")
-            except:
-                print(f"FFmpeg Output (raw): {e.stderr}")
-                stderr_output = str(e.stderr)
-                
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Save Error", f"FFmpeg Failed:\n{stderr_output[:200]}...")
+            # Frame-accurate: whole GOPs are copied, only the cut GOPs re-encoded.
+            # Runs in the background; the dialog shows its progress and can cancel it.
+            from PyQt6.QtWidgets import QApplication, QProgressDialog
+            from src.core.video.export import ClipExportJob
+            self.save_dialog = QProgressDialog("Saving clip...", "Cancel", 0, 100, self)
+            self.save_dialog.setWindowTitle("Save Clip")
+            self.save_dialog.setMinimumDuration(0)
+            self.save_job = ClipExportJob([(input_path, output_path, s_sec, e_sec)], workers=1,
+                                          parent=QApplication.instance())
+            self.save_job.progress.connect(lambda i, fraction: self.save_dialog.setValue(int(fraction * 100)))
+            self.save_job.log_message.connect(print)
+            self.save_job.finished_exporting.connect(lambda results: self.save_finished(output_path, results[0]))
+            self.save_job.finished.connect(self.save_job.deleteLater)
+            self.save_dialog.canceled.connect(self.save_job.stop)
+            self.btn_save.setEnabled(False)
+            self.save_job.start()
             
         except Exception as e:
             print(f"Error saving clip: {e}")
@@ -404,3 +394,14 @@ class PlayerWidget(QWidget):
             traceback.print_exc()
             from PyQt6.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Save Error", f"Failed to save clip:\n{str(e)}")
+
+    def save_finished(self, output_path, result):
+        from PyQt6.QtWidgets import QMessageBox
+        self.save_dialog.reset()
+        self.btn_save.setEnabled(True)
+        if isinstance(result, dict):
+            print(f"Save Success: {output_path} ({result['mode']}: {result['copied']} packets copied, {result['encoded']} frames encoded)")
+            QMessageBox.information(self, "Clip Saved", f"Saved to:\n{output_path}")
+        elif result is not None:
+            print(f"Error saving clip: {result}")
+            QMessageBox.critical(self, "Save Error", f"Failed to save clip:\n{result}")
@@ -5,47 +5,60 @@ from PyQt6.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsPixmapItem,
                              QGraphicsObject, QApplication, QWidget, QVBoxLayout)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QRectF, QPointF
 from PyQt6.QtGui import QPixmap, QImage, QColor, QPen, QBrush, QPainter, QPainterPath
+from src.core.video.proxy import playback_source
+from src.core.video.sprites import SpriteAtlas
+from src.core.video.thumbnails import ThumbnailCache, keyframe_thumbnails, video_duration
 
 # -----------------------------------------------------------------------------
 # WORKER: Extracts Thumbnails (Optimized for Segments)
 # -----------------------------------------------------------------------------
 class ThumbnailWorker(QThread):
+    """
+    One thumbnail per `interval` seconds, from keyframes only (see
+    keyframe_thumbnails). Slots already in the on-disk ThumbnailCache are
+    emitted straight from disk; the rest are decoded and saved. decode_path
+    (e.g. the video's proxy) is decoded instead of file_path when given.
+    """
     thumbnail_ready = pyqtSignal(int, QImage) # index, image
     
-    def __init__(self, file_path, start_time=0.0, end_time=None, interval=1.0, width=160, height=90):
+    def __init__(self, file_path, start_time=0.0, end_time=None, interval=1.0, width=160, height=90,
+                 thumb_dir=None, index_dir=None, decode_path=None):
         super().__init__()
         self.file_path = file_path
+        self.decode_path = decode_path or file_path
         self.start_time = start_time
         self.end_time = end_time
         self.interval = interval
         self.thumb_w = width
         self.thumb_h = height
+        self.thumb_dir = thumb_dir
+        self.index_dir = index_dir
         self._is_running = True
         
     def run(self):
         try:
-            container = av.open(self.file_path)
-            stream = container.streams.video[0]
-            stream.thread_type = 'AUTO'
-            
-            duration = float(stream.duration * stream.time_base)
+            with av.open(self.decode_path) as container:
+                duration = video_duration(container)
             final_end = self.end_time if self.end_time else duration
             if final_end > duration: final_end = duration
-            
-            # Iterate
-            for i, time_sec in enumerate(np.arange(self.start_time, final_end, self.interval)):
-                if not self._is_running: break
-                
-                timestamp = int(time_sec / stream.time_base)
-                container.seek(timestamp, stream=stream)
-                
-                for frame in container.decode(stream):
-                    img = frame.to_image()
-                    img = img.resize((self.thumb_w, self.thumb_h))
-                    data = img.tobytes("raw", "RGB")
-                    qimg = QImage(data, img.width, img.height, QImage.Format.Format_RGB888)
+            times = [float(t) for t in np.arange(self.start_time, final_end, self.interval)]
+
+            # Cached slots first, straight from disk
+            cache = ThumbnailCache(self.file_path, self.thumb_w, self.thumb_h, self.thumb_dir)
+            missing = []
+            for i, time_sec in enumerate(times):
+                if not self._is_running: return
+                qimg = cache.load(time_sec)
+                if qimg is not None:
                     self.thumbnail_ready.emit(i, qimg)
-                    break 
+                else:
+                    missing.append(i)
+
+            slots = [times[i] for i in missing]
+            for j, qimg in keyframe_thumbnails(self.decode_path, slots, self.thumb_w, self.thumb_h,
+                                               self.index_dir, lambda: not self._is_running):
+                cache.save(slots[j], qimg)
+                self.thumbnail_ready.emit(missing[j], qimg)
         except Exception as e:
             print(f"[THUMBNAIL] Error: {e}")
 
@@ -227,9 +240,22 @@ class FilmstripTimeline(QGraphicsView):
         self.worker_duration = duration_sec + 10.0 # total loaded duration
         
         self.cleanup()
+
+        # Ingested videos have a sprite atlas: the strip is one or two sheet reads
+        atlas = SpriteAtlas.load(file_path)
+        if atlas:
+            end = min(self.worker_start_time + self.worker_duration, atlas.duration)
+            for i, time_sec in enumerate(np.arange(self.worker_start_time, end, 1.0)):
+                qimg = atlas.thumbnail_at(time_sec)
+                if (qimg.width(), qimg.height()) != (self.thumb_w, self.thumb_h):
+                    qimg = qimg.scaled(self.thumb_w, self.thumb_h)
+                self.add_thumbnail(i, qimg)
+            return
             
+        # Thumbnails are cached under the original's key but decoded from its proxy
         self.worker = ThumbnailWorker(
             file_path,
+            decode_path=playback_source(file_path),
             start_time=self.worker_start_time,
             end_time=self.worker_start_time + self.worker_duration,
             width=self.thumb_w,
@@ -1,10 +1,13 @@
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QPushButton, QHBoxLayout, QLabel, QMessageBox, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem)
+import os
+from PyQt6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QPushButton, QHBoxLayout, QLabel, QMessageBox, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QProgressDialog)
 # ... imports ...
 from PyQt6.QtCore import Qt, QUrl, QThread, QRectF
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtGui import QPixmap, QImage, QKeySequence, QShortcut
 
 from .filmstrip import FilmstripTimeline
-from src.core.video.worker import VideoWorker
+from src.core.video.export import ClipExportJob
+from src.core.video.proxy import playback_source
+from src.core.video.worker import VideoWorker, SCAN_RATES
 from src.ui.graphics.overlay_box import OverlayBox
 
 class PrecisionEditorModal(QDialog):
@@ -99,6 +102,23 @@ class PrecisionEditorModal(QDialog):
         self.view.setScene(self.scene)
         self.view.setMinimumHeight(400)
         layout.addWidget(self.view)
+
+        # Frame-cache debug overlay (toggle with D)
+        self.cache_label = QLabel(self.view)
+        self.cache_label.setStyleSheet("background: rgba(0, 0, 0, 160); color: #00FF88; font-family: monospace; padding: 4px;")
+        self.cache_label.move(8, 8)
+        self.cache_label.hide()
+
+        # Stepping: arrows = 1 frame, Shift+arrows = 10 frames (served from the frame cache)
+        for key, frames in ((Qt.Key.Key_Right, 1), (Qt.Key.Key_Left, -1)):
+            QShortcut(QKeySequence(key), self, activated=lambda f=frames: self.step(f))
+            QShortcut(QKeySequence(Qt.KeyboardModifier.ShiftModifier | key), self,
+                      activated=lambda f=frames: self.step(10 * f))
+        QShortcut(QKeySequence(Qt.Key.Key_Space), self, activated=self.toggle_play)
+        # Fast scan: L = faster (2x/4x/8x, keyframes only), J = slower (back to 1x)
+        QShortcut(QKeySequence(Qt.Key.Key_L), self, activated=lambda: self.change_rate(1))
+        QShortcut(QKeySequence(Qt.Key.Key_J), self, activated=lambda: self.change_rate(-1))
+        QShortcut(QKeySequence(Qt.Key.Key_D), self, activated=lambda: self.cache_label.setVisible(not self.cache_label.isVisible()))
         
         # Filmstrip Area
         self.filmstrip = FilmstripTimeline()
@@ -107,9 +127,9 @@ class PrecisionEditorModal(QDialog):
         
         # Footer / Controls
         footer = QHBoxLayout()
-        btn_save = QPushButton("SAVE CLIP")
-        btn_save.setStyleSheet("background-color: #00FF88; color: #000; padding: 10px; font-weight: bold;")
-        btn_save.clicked.connect(self.export_clip)
+        self.btn_save = QPushButton("SAVE CLIP")
+        self.btn_save.setStyleSheet("background-color: #00FF88; color: #000; padding: 10px; font-weight: bold;")
+        self.btn_save.clicked.connect(self.export_clip)
         
         btn_cancel = QPushButton("CANCEL")
         btn_cancel.setStyleSheet("border: none; padding: 10px;")
@@ -117,22 +137,27 @@ class PrecisionEditorModal(QDialog):
         
         footer.addStretch()
         footer.addWidget(btn_cancel)
-        footer.addWidget(btn_save)
+        footer.addWidget(self.btn_save)
         layout.addLayout(footer)
 
     def setup_player(self):
         # Thread Setup
         self.worker_thread = QThread()
-        self.worker = VideoWorker(self.video_path)
+        # Play and scrub the low-res proxy when there is one; export_clip still cuts self.video_path
+        self.worker = VideoWorker(playback_source(self.video_path))
         self.worker.moveToThread(self.worker_thread)
         
         # Connections
         self.worker.frame_ready.connect(self.update_frame)
+        self.worker.cache_stats.connect(self.update_cache_stats)
         self.worker_thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.worker_thread.finished.connect(self.worker_thread.deleteLater)
         
+        # Frames are scaled to the view while decoding
+        self.update_display_size()
+
         # Start
         self.worker_thread.start()
         
@@ -157,6 +182,43 @@ class PrecisionEditorModal(QDialog):
         # Fit in view (maintain Aspect Ratio)
         self.view.fitInView(self.video_item, Qt.AspectRatioMode.KeepAspectRatio)
 
+    def step(self, frames):
+        if self.worker:
+            self.worker.step(frames)
+
+    def toggle_play(self):
+        if self.worker:
+            if self.worker.is_playing:
+                self.worker.pause()
+            else:
+                self.worker.play()
+
+    def change_rate(self, direction):
+        if self.worker:
+            i = SCAN_RATES.index(self.worker.rate) if self.worker.rate in SCAN_RATES else 0
+            rate = SCAN_RATES[min(max(0, i + direction), len(SCAN_RATES) - 1)]
+            self.worker.set_rate(rate)
+            self.worker.play()
+
+    def update_cache_stats(self, stats):
+        self.cache_label.setText(
+            f"CACHE {stats['mb']:.0f}/{stats['max_mb']:.0f} MB  {stats['frames']} frames\n"
+            f"HITS {stats['hit_rate'] * 100:.1f}% ({stats['hits']}/{stats['hits'] + stats['misses']})  "
+            f"AHEAD {stats['ahead_s']:.1f}s\n"
+            f"RATE {stats['rate']:g}x  DROPPED {stats['dropped']}{'  BEHIND' if stats['behind'] else ''}"
+        )
+        self.cache_label.adjustSize()
+
+    def update_display_size(self):
+        if self.worker:
+            viewport = self.view.viewport().size()
+            dpr = self.devicePixelRatioF()
+            self.worker.set_display_size(int(viewport.width() * dpr), int(viewport.height() * dpr))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_display_size()
+
     def export_clip(self):
         start, end = self.filmstrip.get_selection()
         duration = end - start
@@ -170,28 +232,29 @@ class PrecisionEditorModal(QDialog):
         base, ext = os.path.splitext(self.video_path)
         output_path = f"{base}_cut_{int(start)}_{int(end)}{ext}"
         
-        # Resolve FFmpeg path dynamically
-        import imageio_ffmpeg
-        ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-        
-        cmd = [
-            ffmpeg_exe,
-            '-y', # Overwrite
-            '-ss', str(start),
-            '-i', self.video_path,
-            '-t', str(duration),
-            '-c', 'copy',
-            output_path
-        ]
-        
-        try:
-            subprocess.run(cmd, check=True)
+        # Cuts the original (never the proxy); only the GOPs at the cuts are re-encoded.
+        # Runs in the background so playback stays responsive; the dialog can cancel it.
+        self.export_dialog = QProgressDialog("Exporting clip...", "Cancel", 0, 100, self)
+        self.export_dialog.setWindowTitle("Export Clip")
+        self.export_dialog.setMinimumDuration(0)
+        job = ClipExportJob([(self.video_path, output_path, start, end)], workers=1,
+                            parent=QApplication.instance())
+        job.progress.connect(lambda i, fraction: self.export_dialog.setValue(int(fraction * 100)))
+        job.log_message.connect(print)
+        job.finished_exporting.connect(lambda results: self.export_finished(output_path, results[0]))
+        job.finished.connect(job.deleteLater)
+        self.export_dialog.canceled.connect(job.stop)
+        self.btn_save.setEnabled(False)
+        job.start()
+
+    def export_finished(self, output_path, result):
+        self.export_dialog.reset()
+        self.btn_save.setEnabled(True)
+        if isinstance(result, dict):
             QMessageBox.information(self, "Export Success", f"Clip saved to:\n{output_path}")
             self.accept()
-        except subprocess.CalledProcessError as e:
-            QMessageBox.critical(self, "Export Failed", f"FFmpeg Error:\n{e}")
-        except FileNotFoundError:
-             QMessageBox.critical(self, "Error", "FFmpeg not found in PATH.")
+        elif result is not None:
+            QMessageBox.critical(self, "Export Failed", f"Export Error:\n{result}")
 
     def closeEvent(self, event):
         # Stop Worker
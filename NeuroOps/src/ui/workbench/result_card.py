@@ -1,5 +1,7 @@
 from PyQt6.QtWidgets import (QFrame, QVBoxLayout, QLabel, QProgressBar)
 from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from src.data.crop_store import get_crop_store
 
 class ResultCard(QFrame):
     clicked = pyqtSignal(dict) # emits result data
@@ -47,7 +49,18 @@ class ResultCard(QFrame):
         """)
         self.thumb.setFixedHeight(100)
         self.thumb.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.thumb.setText(self.data.get('class_name', 'OBJ').upper())
+        # Detection crop from the crop store, else the frame from the sprite atlas
+        pixmap = None
+        crop_path = get_crop_store().open(self.data.get('crop'))
+        if crop_path:
+            pixmap = QPixmap(crop_path)
+        elif self.data.get('thumbnail') is not None:
+            pixmap = QPixmap.fromImage(self.data['thumbnail'])
+        if pixmap is not None and not pixmap.isNull():
+            self.thumb.setPixmap(pixmap.scaled(
+                200, 100, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        else:
+            self.thumb.setText(self.data.get('class_name', 'OBJ').upper())
         layout.addWidget(self.thumb)
         
         # 2. Meta Data Container
@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QScrollArea, QPushButton, QFrame, QSizePolicy)
+                             QScrollArea, QPushButton, QFrame, QSizePolicy, QFileDialog, QApplication)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap
 
@@ -14,8 +14,30 @@ def execute_search_task(query, video_id, image_path=None):
     engine = SearchEngine(collection_suffix=str(video_id)) 
     # TODO: Update Engine to support image path
     results = engine.search(query) 
+    attach_thumbnails(results, video_id)
     return results
 
+def attach_thumbnails(results, video_id):
+    """
+    Adds the frame from the video's sprite atlas (built at ingest) as
+    'thumbnail' to results without a stored detection crop.
+    """
+    results = [res for res in results if not res.get('crop')]
+    if not results:
+        return
+    try:
+        from src.data.db_manager import DatabaseManager
+        from src.core.video.sprites import SpriteAtlas
+        path = DatabaseManager().get_path_by_id(video_id)
+        atlas = SpriteAtlas.load(path) if path else None
+        if not atlas:
+            return
+        for res in results:
+            if res.get('timestamp') is not None:
+                res['thumbnail'] = atlas.thumbnail_at(res['timestamp'])
+    except Exception as e:
+        print(f"[SPRITES] Thumbnails unavailable: {e}")
+
 class SearchSection(QWidget):
     """
     A self-contained search row.
@@ -30,6 +52,7 @@ class SearchSection(QWidget):
         self.video_id = video_id
         self.image_path = image_path
         self.controller = None
+        self.results = []
         
         self.setup_ui()
         self.start_search()
@@ -70,6 +93,30 @@ class SearchSection(QWidget):
         
         header_layout.addStretch()
         
+        # Batch export of every hit as a clip
+        self.export_lbl = QLabel("")
+        self.export_lbl.setStyleSheet("color: #888; font-size: 11px; background: transparent;")
+        header_layout.addWidget(self.export_lbl)
+        
+        self.btn_export = QPushButton("⤓")
+        self.btn_export.setFixedSize(24, 24)
+        self.btn_export.setToolTip("Export all hits as clips")
+        self.btn_export.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_export.setEnabled(False)
+        self.btn_export.clicked.connect(self.export_hits)
+        self.btn_export.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                color: #666;
+                border: none;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                color: #5AF;
+            }
+        """)
+        header_layout.addWidget(self.btn_export)
+        
         # Delete Button
         btn_del = QPushButton("✖")
         btn_del.setFixedSize(24, 24)
@@ -142,6 +189,8 @@ class SearchSection(QWidget):
             self.results_layout.addWidget(lbl)
             return
             
+        self.results = results
+        self.btn_export.setEnabled(True)
         for res in results:
             card = ResultCard(res)
             # Add video_id to data for checking later
@@ -149,6 +198,40 @@ class SearchSection(QWidget):
             card.clicked.connect(self.result_clicked.emit)
             self.results_layout.addWidget(card)
             
+    def export_hits(self):
+        out_dir = QFileDialog.getExistingDirectory(self, "Export hits to")
+        if not out_dir:
+            return
+        from src.data.db_manager import DatabaseManager
+        from src.core.video.export import ClipExportJob, hit_clips
+        path = DatabaseManager().get_path_by_id(self.video_id)
+        hits = [dict(res, file_path=path) for res in self.results if res.get('timestamp') is not None]
+        if not path or not hits:
+            self.export_lbl.setText("Nothing to export")
+            return
+
+        self.export_progress = [0.0] * len(hits)
+        # Owned by the application, so the export outlives this (deletable) row
+        job = ClipExportJob(hit_clips(hits, out_dir), parent=QApplication.instance())
+        job.progress.connect(self.update_export_progress)
+        job.log_message.connect(print)
+        job.finished_exporting.connect(self.export_finished)
+        job.finished.connect(job.deleteLater)
+        self.btn_export.setEnabled(False)
+        self.export_lbl.setText(f"Exporting {len(hits)} clips...")
+        job.start()
+
+    def update_export_progress(self, index, fraction):
+        self.export_progress[index] = fraction
+        done = sum(1 for f in self.export_progress if f >= 1.0)
+        total = sum(self.export_progress) / len(self.export_progress)
+        self.export_lbl.setText(f"Exporting {done}/{len(self.export_progress)} · {total:.0%}")
+
+    def export_finished(self, results):
+        ok = sum(1 for r in results if isinstance(r, dict))
+        self.export_lbl.setText(f"Exported {ok}/{len(results)} clips")
+        self.btn_export.setEnabled(True)
+
     def show_error(self, msg):
         self.loading_lbl.setText(msg)
         self.loading_lbl.setStyleSheet("color: #F55;")
@@ -0,0 +1,251 @@
+import bisect
+import threading
+import uuid
+import numpy as np
+
+# Process-wide gallery shared by analysis workers and the search UI
+_gallery_instance = None
+_gallery_lock = threading.Lock()
+
+def get_identity_gallery(vector_store=None):
+    """
+    Returns the shared IdentityGallery, restoring its clusters from the
+    identity collection on first use.
+    """
+    global _gallery_instance
+    with _gallery_lock:
+        if _gallery_instance is None:
+            if vector_store is None:
+                from src.data.vector_store import VectorStore
+                vector_store = VectorStore(collection_suffix="identities")
+            _gallery_instance = IdentityGallery(vector_store)
+            _gallery_instance.rebuild()
+        return _gallery_instance
+
+
+class IdentityClusterer:
+    """
+    Online leader-follower clustering of L2-normalized identity vectors.
+
+    A vector joins the closest cluster if its cosine similarity to the
+    centroid is at least `threshold`, otherwise it starts a new cluster.
+    Centroids are running means, kept as one normalized matrix so lookups
+    are a single matmul. Appearances are also indexed per video on a sorted
+    timeline, which turns "who appeared with this person" into bisects.
+    """
+    def __init__(self, threshold=0.4, dim=512):
+        self.threshold = threshold
+        self.dim = dim
+        self.lock = threading.RLock()
+
+        self._sums = np.zeros((0, dim), dtype=np.float32)
+        self._centroids = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._cluster_ids = []     # row -> cluster id
+        self._row_of = {}          # cluster id -> row
+        self._members = {}         # cluster id -> [appearance dict]
+        self._timeline = {}        # video_id -> sorted [(timestamp, cluster id)]
+        self._next_id = 0
+
+    def __len__(self):
+        return self._size
+
+    def _new_row(self, cluster_id):
+        if self._size == len(self._sums):
+            grow = max(64, len(self._sums))
+            self._sums = np.vstack([self._sums, np.zeros((grow, self.dim), dtype=np.float32)])
+            self._centroids = np.vstack([self._centroids, np.zeros((grow, self.dim), dtype=np.float32)])
+        row = self._size
+        self._size += 1
+        self._cluster_ids.append(cluster_id)
+        self._row_of[cluster_id] = row
+        self._members[cluster_id] = []
+        self._next_id = max(self._next_id, cluster_id + 1)
+        return row
+
+    @staticmethod
+    def _normalize(vector):
+        v = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else None
+
+    def nearest(self, vector, k=1):
+        """Returns up to k (cluster id, cosine similarity) pairs, best first."""
+        v = self._normalize(vector)
+        with self.lock:
+            if v is None or self._size == 0:
+                return []
+            scores = self._centroids[:self._size] @ v
+            top = np.argsort(-scores)[:k]
+            return [(self._cluster_ids[i], float(scores[i])) for i in top]
+
+    def assign(self, vector, appearance=None, cluster_id=None):
+        """
+        Adds a vector to its cluster and returns the cluster id (None for a
+        zero vector, which is what BiometricEngine emits when disabled).
+        Pass cluster_id to restore a previously stored assignment.
+        """
+        v = self._normalize(vector)
+        if v is None:
+            return None
+
+        with self.lock:
+            if cluster_id is None:
+                best = self.nearest(v, k=1)
+                if best and best[0][1] >= self.threshold:
+                    cluster_id = best[0][0]
+                else:
+                    cluster_id = self._next_id
+
+            row = self._row_of.get(cluster_id)
+            if row is None:
+                row = self._new_row(cluster_id)
+
+            self._sums[row] += v
+            self._centroids[row] = self._sums[row] / np.linalg.norm(self._sums[row])
+
+            if appearance is not None:
+                appearance = dict(appearance, person_id=cluster_id)
+                self._members[cluster_id].append(appearance)
+                video_id = appearance.get("video_id")
+                ts = appearance.get("timestamp")
+                if video_id is not None and ts is not None:
+                    bisect.insort(self._timeline.setdefault(video_id, []), (ts, cluster_id))
+            return cluster_id
+
+    def appearances(self, cluster_id):
+        with self.lock:
+            members = list(self._members.get(cluster_id, []))
+        return sorted(members, key=lambda a: (str(a.get("video_id")), a.get("timestamp") or 0.0))
+
+    def companions(self, cluster_id, window=2.0):
+        """
+        Clusters seen in the same video within `window` seconds of any
+        appearance of cluster_id. Returns a list of
+        {"person_id", "count", "videos"} sorted by count.
+        """
+        counts = {}
+        videos = {}
+        with self.lock:
+            for app in self._members.get(cluster_id, []):
+                line = self._timeline.get(app.get("video_id"))
+                ts = app.get("timestamp")
+                if not line or ts is None:
+                    continue
+                lo = bisect.bisect_left(line, (ts - window, -1))
+                hi = bisect.bisect_right(line, (ts + window, float("inf")))
+                for _, other in line[lo:hi]:
+                    if other == cluster_id:
+                        continue
+                    counts[other] = counts.get(other, 0) + 1
+                    videos.setdefault(other, set()).add(app.get("video_id"))
+
+        return sorted(
+            ({"person_id": cid, "count": n, "videos": sorted(videos[cid], key=str)} for cid, n in counts.items()),
+            key=lambda c: -c["count"]
+        )
+
+
+class IdentityGallery:
+    """
+    Query-by-face over the shared `neuroops_identities` collection, with
+    identities grouped into person clusters as they are written.
+    """
+    def __init__(self, vector_store, threshold=0.4, match_threshold=0.35):
+        self.vector_store = vector_store
+        self.clusterer = IdentityClusterer(threshold=threshold, dim=vector_store.vector_size)
+        self.match_threshold = match_threshold
+        self.encoder = None
+
+    def rebuild(self):
+        """Reloads clusters from stored identities, keeping their stored person_id."""
+        count = 0
+        for record in self.vector_store.iter_identities(with_vectors=True):
+            payload = record.payload or {}
+            self.clusterer.assign(
+                record.vector,
+                appearance=self._appearance(record.id, payload),
+                cluster_id=payload.get("person_id")
+            )
+            count += 1
+        print(f"[GALLERY] Restored {len(self.clusterer)} person clusters from {count} identities")
+
+    @staticmethod
+    def _appearance(point_id, payload):
+        return {
+            "point_id": str(point_id),
+            "video_id": payload.get("video_id"),
+            "timestamp": payload.get("timestamp"),
+            "frame_idx": payload.get("frame_idx"),
+        }
+
+    def add_identities(self, items):
+        """
+        Clusters and stores a batch of (vector, metadata) tuples. The cluster id
+        is written to the payload as `person_id`. Returns the point ids.
+        """
+        if not items:
+            return []
+
+        ids, stored = [], []
+        for vector, metadata in items:
+            point_id = str(uuid.uuid4())
+            payload = dict(metadata)
+            person_id = self.clusterer.assign(vector, appearance=self._appearance(point_id, payload))
+            if person_id is not None:
+                payload["person_id"] = person_id
+            ids.append(point_id)
+            stored.append((vector, payload))
+
+        return self.vector_store.add_identities_batch(stored, ids=ids)
+
+    def _query_vector(self, face):
+        """Accepts an embedding (1-D) or an image crop (H x W x 3)."""
+        face = np.asarray(face)
+        if face.ndim == 1:
+            return face.astype(np.float32)
+        if self.encoder is None:
+            from src.ai.model_registry import get_identity_encoder
+            self.encoder = get_identity_encoder()
+        return np.asarray(self.encoder.extract_feature(face), dtype=np.float32)
+
+    def find_appearances(self, face, score_threshold=None, limit=1000, video_id=None):
+        """
+        Every stored appearance that matches the face, across all videos
+        (or one video), ordered by video and time.
+        """
+        query = self._query_vector(face)
+        if not np.any(query):
+            return []
+        filters = {"video_id": video_id} if video_id is not None else None
+        hits = self.vector_store.search_identities(
+            query,
+            limit=limit,
+            score_threshold=self.match_threshold if score_threshold is None else score_threshold,
+            filters=filters
+        )
+        results = []
+        for hit in hits:
+            payload = hit.payload or {}
+            results.append({
+                "score": hit.score,
+                "video_id": payload.get("video_id"),
+                "timestamp": payload.get("timestamp"),
+                "frame_idx": payload.get("frame_idx"),
+                "person_id": payload.get("person_id"),
+            })
+        return sorted(results, key=lambda r: (str(r["video_id"]), r["timestamp"] or 0.0))
+
+    def find_person(self, face):
+        """Closest person cluster as (person_id, similarity), or None below the cluster threshold."""
+        best = self.clusterer.nearest(self._query_vector(face), k=1)
+        if not best or best[0][1] < self.clusterer.threshold:
+            return None
+        return best[0]
+
+    def find_companions(self, face, window=2.0):
+        """People seen within `window` seconds of this face in the same video."""
+        match = self.find_person(face)
+        if match is None:
+            return []
+        return self.clusterer.companions(match[0], window=window)
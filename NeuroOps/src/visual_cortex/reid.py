@@ -18,6 +18,12 @@ class IdentityEncoder:
              # Handle weird case if passed as list
              return [0.0] * 512
              
+        # Align to the detected face when there is one; query crops that are
+        # already tight faces may not trigger the detector, so fall back to the crop
+        detections = self.engine.detect_faces([image_crop])
+        if detections and detections[0]:
+            image_crop = detections[0]["face"]
+
         # BiometricEngine handles numpy arrays directly
         is_real, score, embedding = self.engine.analyze_face(image_crop)
         
@@ -27,3 +33,31 @@ class IdentityEncoder:
              # For now, we return valid vector but maybe downstream logic handles "Fake"
         
         return embedding
+
+    def extract_features(self, image_crops):
+        """
+        Batched extract_feature for all person crops of a frame. Crops go
+        through the face gate first; only those with a usable face reach
+        anti-spoofing and AdaFace.
+        Returns: list with one embedding (list of floats) per crop, or None
+        where no usable face was found.
+        """
+        if not image_crops:
+            return []
+
+        detections = self.engine.detect_faces(image_crops)
+        if detections is None:
+            # No face model available: recognise on the whole crop
+            scores, embeddings = self.engine.analyze_faces(image_crops)
+            return embeddings.tolist()
+
+        keep = [i for i, d in enumerate(detections) if d]
+        features = [None] * len(image_crops)
+        if keep:
+            scores, embeddings = self.engine.analyze_faces(
+                [detections[i]["face"] for i in keep],
+                spoof_crops=[detections[i]["spoof"] for i in keep]
+            )
+            for j, i in enumerate(keep):
+                features[i] = embeddings[j].tolist()
+        return features
@@ -0,0 +1,92 @@
+import sys
+import os
+import numpy as np
+import cv2
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai.biometrics.engine import BiometricEngine
+from src.ai.biometrics.models.adaface import build_model
+from src.ai.biometrics.models.minifasnet import MiniFASNetV2
+
+
+def make_engine(tmp_path):
+    # No weights on disk: attach randomly initialised models directly
+    engine = BiometricEngine(weights_dir=str(tmp_path), quantize=False)
+    torch.manual_seed(0)
+    engine.spoof_model = MiniFASNetV2(conv6_kernel=(5, 5)).eval()
+    engine.adaface_model = build_model('ir_18').eval()
+    engine.device = "cpu"
+    engine.use_biometrics = True
+    return engine
+
+
+def test_analyze_faces_matches_single(tmp_path):
+    engine = make_engine(tmp_path)
+    rng = np.random.default_rng(0)
+    crops = [(rng.random((h, w, 3)) * 255).astype(np.uint8) for h, w in [(120, 90), (64, 64), (200, 150)]]
+
+    scores, embeddings = engine.analyze_faces(crops)
+    assert scores.shape == (3,)
+    assert embeddings.shape == (3, 512)
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+
+    for i, crop in enumerate(crops):
+        _, score, embedding = engine.analyze_face(crop)
+        assert abs(scores[i] - score) < 1e-4
+        assert float(np.dot(embeddings[i], embedding)) > 0.9999
+
+
+def test_analyze_faces_skips_empty_crops(tmp_path):
+    engine = make_engine(tmp_path)
+    crop = np.full((100, 80, 3), 128, dtype=np.uint8)
+
+    scores, embeddings = engine.analyze_faces([crop, np.zeros((0, 0, 3), np.uint8), None])
+    assert scores[1] == 0.0 and scores[2] == 0.0
+    assert not embeddings[1].any() and not embeddings[2].any()
+    assert embeddings[0].any()
+
+
+def test_align_face_maps_landmarks_onto_template():
+    from src.ai.biometrics.face_detector import ARCFACE_TEMPLATE, align_face, is_frontal
+
+    image = np.zeros((200, 200, 3), dtype=np.uint8)
+    # Template scaled 1.5x and shifted: alignment must undo exactly that
+    landmarks = ARCFACE_TEMPLATE * 1.5 + 20
+    for x, y in landmarks.astype(int):
+        cv2.circle(image, (int(x), int(y)), 3, (255, 255, 255), -1)
+
+    face = align_face(image, [20, 20, 188, 188], landmarks)
+    assert face.shape == (112, 112, 3)
+    for x, y in ARCFACE_TEMPLATE.astype(int):
+        assert face[y, x].max() > 0
+    assert is_frontal(landmarks)
+
+    profile = landmarks.copy()
+    profile[2, 0] = profile[1, 0]  # nose over the far eye
+    assert not is_frontal(profile)
+
+
+class StubFaceDetector:
+    """Accepts crops wider than 80 px, rejects the rest."""
+    def detect(self, crops):
+        return [
+            {"face": cv2.resize(c, (112, 112)), "spoof": c} if c.shape[1] > 80 else None
+            for c in crops
+        ]
+
+
+def test_identity_encoder_skips_crops_without_faces(tmp_path):
+    from src.visual_cortex.reid import IdentityEncoder
+
+    engine = make_engine(tmp_path)
+    engine.face_detector = StubFaceDetector()
+    encoder = IdentityEncoder.__new__(IdentityEncoder)
+    encoder.engine = engine
+
+    rng = np.random.default_rng(1)
+    crops = [(rng.random((160, w, 3)) * 255).astype(np.uint8) for w in (120, 40, 100)]
+    features = encoder.extract_features(crops)
+    assert features[1] is None
+    assert len(features[0]) == 512 and len(features[2]) == 512
@@ -0,0 +1,97 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.search_engine import parse_compound_query, temporal_join
+
+
+def test_parse_compound_query():
+    clauses, window = parse_compound_query("person AND bicycle within 2 seconds")
+    assert clauses == [{"kind": "vector", "query": "person"}, {"kind": "vector", "query": "bicycle"}]
+    assert window == 2.0
+
+    clauses, window = parse_compound_query("red car NEAR text 'EXIT' within 1.5s")
+    assert clauses == [{"kind": "vector", "query": "red car"}, {"kind": "text", "query": "EXIT"}]
+    assert window == 1.5
+
+    clauses, _ = parse_compound_query("black and white cat")
+    assert len(clauses) == 1
+
+    clauses, _ = parse_compound_query("car parked near gate")
+    assert clauses == [{"kind": "vector", "query": "car parked near gate"}]
+
+
+def test_temporal_join_respects_video_and_window():
+    partials = [
+        {"video_id": 1, "start": 10.0, "end": 10.0, "score": 0.3, "parts": ["a"]},
+        {"video_id": 1, "start": 20.0, "end": 20.0, "score": 0.3, "parts": ["b"]},
+        {"video_id": 2, "start": 10.0, "end": 10.0, "score": 0.3, "parts": ["c"]},
+    ]
+    moments = [
+        {"video_id": 1, "timestamp": 11.5, "score": 0.2},
+        {"video_id": 1, "timestamp": 25.0, "score": 0.2},
+        {"video_id": 3, "timestamp": 10.0, "score": 0.2},
+    ]
+    joined = temporal_join(partials, moments, window=2.0)
+    assert len(joined) == 1
+    assert joined[0]["video_id"] == 1
+    assert (joined[0]["start"], joined[0]["end"]) == (10.0, 11.5)
+    assert len(joined[0]["parts"]) == 2
+
+
+def test_temporal_join_spans():
+    # A sign read from 0s to 300s overlaps a person seen at 150s
+    partials = [{"video_id": 1, "lo": 0.0, "hi": 300.0, "start": 0.0, "end": 300.0,
+                 "score": 0.5, "parts": ["sign"]}]
+    moments = [
+        {"video_id": 1, "timestamp": 150.0, "score": 0.2},
+        {"video_id": 1, "timestamp": 301.5, "score": 0.2},
+        {"video_id": 1, "timestamp": 305.0, "score": 0.2},
+    ]
+    joined = temporal_join(partials, moments, window=2.0)
+    assert [(j["start"], j["end"]) for j in joined] == [(150.0, 150.0), (300.0, 301.5)]
+
+
+class FlatStore:
+    """VectorStore.search over a FlatIndex."""
+    def __init__(self, index):
+        self.index = index
+
+    def search(self, query_vector, limit=5, score_threshold=0.2, filters=None):
+        return self.index.search(query_vector, limit=limit, score_threshold=score_threshold, filters=filters)
+
+
+class AxisEmbedder:
+    """'person' and 'bicycle' embed to orthogonal axes."""
+    def embed_text(self, text):
+        return [1.0, 0.0, 0.0] if text == "person" else [0.0, 1.0, 0.0]
+
+
+def test_later_clauses_search_the_open_windows_not_the_global_top(tmp_path):
+    from src.core.search_engine import SearchEngine
+    from src.data.db_manager import DatabaseManager
+    from src.data.flat_index import FlatIndex
+
+    index = FlatIndex(str(tmp_path / "frames"), 3)
+    # 300 clear "person" frames far from the only bicycle, which rides past a weak person match
+    # (and a second video with a lone bicycle, so the plan has more than one video in play)
+    ids = [f"p{i}" for i in range(300)] + ["weak", "bike", "bike2"]
+    vectors = [[1.0, 0.0, 0.01]] * 300 + [[0.6, 0.0, 0.8], [0.0, 1.0, 0.0], [0.0, 1.0, 0.0]]
+    times = [float(i) for i in range(300)] + [500.5, 500.0, 100.0]
+    videos = [1] * 302 + [2]
+    index.upsert(ids, vectors, [{"video_id": v, "timestamp": t} for v, t in zip(videos, times)])
+    engine = SearchEngine(1, embedder=AxisEmbedder(), vector_store=FlatStore(index),
+                          db=DatabaseManager(str(tmp_path / "t.db")))
+
+    results = engine.search_compound("bicycle AND person within 2s", clause_limit=200)
+    assert len(results) == 1
+    assert (results[0]["timestamp"], results[0]["end"]) == (500.0, 500.5)
+
+
+def test_candidate_windows_merge_per_video():
+    from src.core.search_engine import SearchEngine
+    partials = [{"video_id": 1, "lo": 10.0, "hi": 10.0}, {"video_id": 1, "lo": 12.0, "hi": 13.0},
+                {"video_id": 1, "lo": 40.0, "hi": 40.0}, {"video_id": 2, "lo": 11.0, "hi": 11.0}]
+    assert SearchEngine._candidate_windows(partials, 2.0) == [(1, 8.0, 15.0), (1, 38.0, 42.0), (2, 9.0, 13.0)]
@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.crop_store import CropStore
+
+
+def crop(value, size=(40, 30)):
+    img = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    img[:, :, 0] = value
+    img[::4, ::4, 1] = 255 - value  # some texture so every crop encodes differently
+    return img
+
+
+def age(store, key, seconds):
+    t = time.time() - seconds
+    os.utime(store.path(key), (t, t))
+
+
+def test_crops_are_content_addressed_and_sharded(tmp_path):
+    store = CropStore(str(tmp_path), max_side=16)
+    a, b = store.put(crop(10)), store.put(crop(10))
+    assert a == b and len(a) == 40
+    assert store.path(a) == os.path.join(str(tmp_path), a[:2], a[2:4], f"{a}.jpg")
+    assert os.path.exists(store.path(a))
+    assert store.put(crop(200)) != a
+    assert store.open(a) == store.path(a) and store.open("0" * 40) is None
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    store = CropStore(str(tmp_path))
+    keys = [store.put(crop(v)) for v in (10, 60, 110)]
+    for i, key in enumerate(keys):
+        age(store, key, 300 - 100 * i)  # oldest first
+    store.open(keys[0])  # reading a crop makes it recent again
+
+    size = os.path.getsize(store.path(keys[2]))
+    store.max_bytes = int(size * 3.5)
+    store.bytes = None
+    store.put(crop(160))  # over budget -> evict to 90%
+    assert os.path.exists(store.path(keys[0]))
+    assert not os.path.exists(store.path(keys[1]))
+
+
+def test_compact_drops_unreferenced_crops_and_empty_shards(tmp_path):
+    store = CropStore(str(tmp_path))
+    keep, drop = store.put(crop(10)), store.put(crop(200))
+    open(store.path(keep) + ".tmp", "wb").close()
+    age(store, keep, 7200)
+    age(store, drop, 7200)
+    os.utime(store.path(keep) + ".tmp", (time.time() - 7200,) * 2)
+    stats = store.compact(referenced={keep})
+    assert stats["unreferenced"] == 1 and stats["temp"] == 1 and stats["crops"] == 1
+    assert os.path.exists(store.path(keep))
+    assert not os.path.exists(os.path.dirname(store.path(drop))) or keep[:4] == drop[:4]
+
+
+def test_compact_spares_crops_a_running_ingest_has_not_referenced_yet(tmp_path):
+    store = CropStore(str(tmp_path))
+    old, fresh = store.put(crop(10)), store.put(crop(200))
+    age(store, old, 7200)
+    stats = store.compact(referenced=set(), grace=3600)
+    assert stats["unreferenced"] == 1 and stats["crops"] == 1
+    assert os.path.exists(store.path(fresh)) and not os.path.exists(store.path(old))
@@ -0,0 +1,50 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import av
+from src.core.video.export import export_clips, hit_clips, smart_cut
+from test_video_decoder import write_clip
+
+H264_GOP5 = {"g": "5", "sc_threshold": "0", "bf": "2"}  # keyframe every 5 frames, with B-frames
+
+
+def reds(path):
+    with av.open(path) as container:
+        return [int(f.to_ndarray(format="rgb24")[120, 160, 0]) for f in container.decode(video=0)]
+
+
+def test_smart_cut_copies_inner_gops_and_is_frame_accurate(tmp_path):
+    src, out = str(tmp_path / "clip.mp4"), str(tmp_path / "cut.mp4")
+    write_clip(src, frames=30, codec="libx264", options=H264_GOP5)
+    # 10 fps: frame 7 is on screen at 0.75s; frames 10-19 are two whole GOPs; 20-22 the tail
+    stats = smart_cut(src, out, 0.75, 2.3, index_dir=str(tmp_path / "kf"))
+    assert stats == {"mode": "smart", "copied": 10, "encoded": 6}
+    got = reds(out)
+    assert len(got) == 16
+    assert all(abs(r - (20 * (7 + n)) % 256) <= 6 for n, r in enumerate(got))
+
+
+def test_other_codecs_are_reencoded(tmp_path):
+    src, out = str(tmp_path / "clip.mp4"), str(tmp_path / "cut.mp4")
+    write_clip(src, frames=20)
+    stats = smart_cut(src, out, 0.5, 1.2, index_dir=str(tmp_path / "kf"))
+    assert stats["mode"] == "reencode" and stats["copied"] == 0
+    assert len(reds(out)) == 7
+
+
+def test_batch_export_of_hits(tmp_path):
+    src = str(tmp_path / "clip.mp4")
+    write_clip(src, frames=30, codec="libx264", options=H264_GOP5)
+    hits = [{"timestamp": 1.0, "class_name": "person", "file_path": src},
+            {"timestamp": 2.0, "end": 2.5, "class_name": "car + person", "file_path": src}]
+    clips = hit_clips(hits, str(tmp_path), pad=0.5)
+    assert [(c[2], c[3]) for c in clips] == [(0.5, 1.5), (1.5, 3.0)]
+
+    progress = {}
+    results = export_clips(clips, workers=2, progress=lambda i, f: progress.__setitem__(i, f),
+                           index_dir=str(tmp_path / "kf"))
+    assert all(isinstance(r, dict) for r in results), results
+    assert progress == {0: 1.0, 1: 1.0}
+    assert [len(reds(c[1])) for c in clips] == [10, 15]
@@ -0,0 +1,124 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai import detector
+from src.ai.detector import ExportedYOLO, cached_export
+
+NAMES = {0: "person", 1: "car"}
+
+
+def raw_head():
+    """(1, 4 + classes, anchors) output in 640x640 letterbox coordinates, like a YOLOv8 head."""
+    anchors = [
+        (320, 320, 80, 40, 0.90, 0.05),   # person
+        (322, 321, 80, 40, 0.80, 0.05),   # same person, suppressed by NMS
+        (100, 300, 40, 40, 0.05, 0.60),   # car, overlaps nothing
+        (500, 300, 40, 40, 0.10, 0.10),   # below conf
+    ]
+    return np.array(anchors, dtype=np.float32).T[None]
+
+
+def write_onnx(path, output):
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper, numpy_helper
+
+    # The graph ignores its input and emits a fixed head, which keeps the test off real weights
+    images = helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, 640, 640])
+    out = helper.make_tensor_value_info("output0", TensorProto.FLOAT, list(output.shape))
+    const = helper.make_node("Constant", [], ["output0"], value=numpy_helper.from_array(output))
+    model = helper.make_model(
+        helper.make_graph([const], "head", [images], [out]),
+        opset_imports=[helper.make_opsetid("", 17)],
+    )
+    model.ir_version = 8
+    for key, value in {"names": str(NAMES), "imgsz": "[640, 640]", "stride": "32"}.items():
+        model.metadata_props.add(key=key, value=value)
+    onnx.save(model, str(path))
+    return str(path)
+
+
+def test_letterbox_pads_and_flips_channels():
+    model = ExportedYOLO.__new__(ExportedYOLO)
+    model.imgsz = [640, 640]
+    frame = np.zeros((240, 480, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # pure blue in BGR
+
+    blob, gain, left, top = model._letterbox(frame)
+    assert blob.shape == (1, 3, 640, 640) and blob.dtype == np.float32
+    assert gain == pytest.approx(640 / 480)
+    assert (left, top) == (0, 160)
+    assert np.allclose(blob[0, :, :top], 114 / 255)
+    assert np.allclose(blob[0, :, top + 320:], 114 / 255)
+    assert np.allclose(blob[0, 2, top:top + 320], 1.0)  # blue lands in the last (RGB) channel
+    assert np.allclose(blob[0, 0, top:top + 320], 0.0)
+
+
+def test_onnx_boxes_are_suppressed_and_mapped_back_to_the_frame(tmp_path):
+    pytest.importorskip("onnxruntime")
+    model = ExportedYOLO(write_onnx(tmp_path / "head.onnx", raw_head()), "onnx")
+    assert model.names == NAMES and model.imgsz == [640, 640] and model.stride == 32
+
+    frame = np.zeros((240, 480, 3), dtype=np.uint8)
+    r = model(frame, conf=0.25, iou=0.7)
+
+    assert r.names == NAMES
+    assert r.boxes.xyxy.shape == (2, 4)
+    order = r.boxes.conf.argsort(descending=True)
+    assert r.boxes.cls[order].tolist() == [0.0, 1.0]
+    assert r.boxes.conf[order].tolist() == pytest.approx([0.90, 0.60])
+    # gain 4/3, 160 px of padding on top
+    person, car = r.boxes.xyxy[order].numpy()
+    assert person == pytest.approx([210, 105, 270, 135])
+    assert car == pytest.approx([60, 90, 90, 120])
+
+
+def test_boxes_are_clipped_to_the_frame():
+    model = ExportedYOLO.__new__(ExportedYOLO)
+    model.imgsz, model.names = [640, 640], NAMES
+    head = np.array([[[20], [170], [80], [40], [0.9], [0.0]]], dtype=np.float32)  # spills into the padding
+    model._forward = lambda blob: head
+
+    r = model(np.zeros((240, 480, 3), dtype=np.uint8))
+    assert r.boxes.xyxy[0].numpy() == pytest.approx([0, 0, 45, 22.5])
+
+
+def test_end_to_end_heads_are_only_thresholded():
+    model = ExportedYOLO.__new__(ExportedYOLO)
+    det = np.array([[[0, 160, 64, 224, 0.9, 1], [0, 160, 64, 224, 0.8, 1], [10, 170, 20, 180, 0.1, 0]]],
+                   dtype=np.float32)
+    out = model._postprocess(det, conf=0.25, iou=0.7, max_det=300)
+    # Overlapping boxes survive: NMS-free heads have already deduplicated
+    assert out.shape == (2, 6)
+    assert model._postprocess(det, conf=0.25, iou=0.7, max_det=1).shape == (1, 6)
+
+
+def test_cached_export_is_keyed_by_the_weights(tmp_path, monkeypatch):
+    exports = []
+
+    class FakeYOLO:
+        def __init__(self, path):
+            self.path = path
+
+        def export(self, format, **kwargs):
+            exports.append(self.path)
+            out = tmp_path / f"export{len(exports)}.onnx"
+            out.write_bytes(b"graph")
+            return out
+
+    monkeypatch.setattr(detector, "YOLO", FakeYOLO)
+    weights = tmp_path / "toy.pt"
+    weights.write_bytes(b"weights v1")
+
+    first = cached_export(str(weights), "onnx")
+    assert cached_export(str(weights), "onnx") == first
+    assert len(exports) == 1 and os.path.exists(first)
+
+    weights.write_bytes(b"weights v2")
+    second = cached_export(str(weights), "onnx")
+    assert second != first and len(exports) == 2
+    assert os.path.basename(second).startswith("toy.") and second.endswith(".onnx")
+    assert cached_export(str(weights), "openvino").endswith("_openvino_model")
@@ -0,0 +1,87 @@
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.flat_index import FlatIndex
+
+
+def _vectors(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def test_search_is_exact_and_filtered(tmp_path):
+    vecs = _vectors(200)
+    index = FlatIndex(str(tmp_path / "col"), 16, segment_rows=64)
+    ids = [f"p{i}" for i in range(200)]
+    payloads = [{"video_id": i % 2, "timestamp": float(i)} for i in range(200)]
+    index.upsert(ids, vecs, payloads)
+
+    q = vecs[17]
+    hits = index.search(q, limit=5)
+    normed = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+    expected = np.argsort(-(normed @ (q / np.linalg.norm(q))))[:5]
+    assert [h.id for h in hits] == [f"p{i}" for i in expected]
+    assert abs(hits[0].score - 1.0) < 1e-5
+
+    hits = index.search(q, limit=10, filters={"video_id": 0, "timestamp": {"gte": 100}})
+    assert hits and all(h.payload["video_id"] == 0 and h.payload["timestamp"] >= 100 for h in hits)
+
+
+def test_delete_upsert_and_reload(tmp_path):
+    path = str(tmp_path / "col")
+    vecs = _vectors(100)
+    index = FlatIndex(path, 16, segment_rows=32)
+    index.upsert([f"p{i}" for i in range(100)], vecs, [{"n": i} for i in range(100)])
+    index.delete(["p5"])
+    index.upsert(["p6"], vecs[7:8], [{"n": 700}])
+    assert len(index) == 99
+
+    reloaded = FlatIndex(path, 16)
+    assert len(reloaded) == 99
+    assert all(h.id != "p5" for h in reloaded.search(vecs[5], limit=3))
+    top = reloaded.search(vecs[7], limit=2)
+    assert {h.id for h in top} == {"p6", "p7"}
+    assert [h.payload["n"] for h in top if h.id == "p6"] == [700]
+
+
+def test_flushes_compact_small_segments_without_deleted_rows(tmp_path):
+    path = str(tmp_path / "col")
+    vecs = _vectors(120)
+    index = FlatIndex(path, 16, segment_rows=64, max_small_segments=3)
+    for batch in range(12):  # one small segment per flush
+        ids = range(batch * 10, batch * 10 + 10)
+        index.upsert([f"p{i}" for i in ids], vecs[batch * 10:batch * 10 + 10], [{"n": i} for i in ids])
+        index.delete([f"p{batch * 10}"])
+        index.flush()
+    index.upsert(["p1"], vecs[2:3], [{"n": 1000}])  # replaces a row of a merged segment
+    index.flush()
+
+    assert len(index._segments) <= 4
+    assert len(index._ids) < 120  # deleted rows were dropped, not just masked
+    assert len(index) == 108
+    files = sorted(os.listdir(path))
+    assert len([f for f in files if f.startswith("seg_")]) == len(index._segments)
+    assert len([f for f in files if f.startswith("payloads")]) == 1
+
+    reloaded = FlatIndex(path, 16, segment_rows=64, max_small_segments=3)
+    assert len(reloaded) == 108
+    assert all(h.id != "p10" for h in reloaded.search(vecs[10], limit=3))
+    assert reloaded.search(vecs[57], limit=1)[0].id == "p57"
+    top = reloaded.search(vecs[2], limit=2)
+    assert {h.id for h in top} == {"p1", "p2"}
+    assert [h.payload["n"] for h in top if h.id == "p1"] == [1000]
+
+
+def test_backend_lists_only_finished_collections(tmp_path):
+    from src.data.vector_store import FlatBackend
+
+    backend = FlatBackend(str(tmp_path))
+    backend.ensure_collection("neuroops_frames", 4)
+    backend.flush("neuroops_frames")
+    os.makedirs(tmp_path / "neuroops_partial")
+    assert backend.list_collections() == ["neuroops_frames"]
+    assert FlatBackend(str(tmp_path)).list_collections() == ["neuroops_frames"]
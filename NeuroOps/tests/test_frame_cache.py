@@ -0,0 +1,77 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+from src.core.video.frame_cache import FrameCache
+from src.core.video.worker import VideoWorker
+from test_video_decoder import write_clip
+
+
+def image(w=100, h=100):
+    return QImage(w, h, QImage.Format.Format_RGB888)
+
+
+def test_lookup_follows_decode_order_and_eviction_keeps_playhead():
+    frame_mb = image().sizeInBytes() / (1024 * 1024)
+    cache = FrameCache(max_mb=frame_mb * 5)
+    prev = None
+    for ts in (0.0, 0.1, 0.2, 0.3):
+        cache.put(ts, image(), prev)
+        prev = ts
+
+    assert cache.frame_at(0.15)[0] == 0.1        # between 0.1 and 0.2 -> 0.1 is on screen
+    assert cache.frame_at(0.35) is None           # after the last decoded frame: unknown
+    assert cache.neighbour(0.2, -1)[0] == 0.1
+    cache.mark_end(0.3)
+    assert cache.frame_at(5.0)[0] == 0.3
+
+    cache.playhead = 0.3
+    for ts in (0.4, 0.5, 0.6, 0.7):
+        cache.put(ts, image(), prev)
+        prev = ts
+    assert cache.stats()["frames"] == 5
+    assert cache.frame_at(0.3) is not None and cache.frame_at(0.0) is None
+
+
+def test_worker_serves_steps_from_cache(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=60)
+    worker = VideoWorker(path, cache_mb=64, read_ahead_s=2.0, index_dir=str(tmp_path / "keyframes"))
+    shown, images = [], []
+    # No event loop here: deliver in the worker thread
+    worker.frame_ready.connect(lambda img, ts: shown.append(ts) or images.append(img),
+                               Qt.ConnectionType.DirectConnection)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    try:
+        worker.seek(3.0)
+        deadline = time.time() + 5
+        while not shown and time.time() < deadline:
+            time.sleep(0.01)
+        assert abs(shown[-1] - 3.0) < 1e-6
+
+        time.sleep(0.3)  # read-ahead fills the next frames
+        hits = worker.cache.hits
+        for _ in range(5):
+            worker.step(1)
+            time.sleep(0.05)
+        for _ in range(3):
+            worker.step(-1)
+            time.sleep(0.05)
+        assert [round(t, 1) for t in shown[-8:]] == [3.1, 3.2, 3.3, 3.4, 3.5, 3.4, 3.3, 3.2]
+        assert worker.cache.hits - hits == 8
+        # What crosses to the GUI owns its pixels: evicting the cache can't free them
+        image = images[-1]
+        cached = worker.cache.frame_at(shown[-1])[1]
+        assert int(image.constBits()) != int(cached.constBits())
+        worker.cache.clear()
+        assert image.pixelColor(10, 10) == cached.pixelColor(10, 10)
+    finally:
+        worker.stop()
+        thread.join(5)
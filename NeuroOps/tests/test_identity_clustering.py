@@ -0,0 +1,78 @@
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.visual_cortex.identity_gallery import IdentityClusterer
+
+
+def _person(rng, center, n):
+    return [center + 0.1 * rng.standard_normal(len(center)) for _ in range(n)]
+
+
+def test_leader_follower_groups_and_companions():
+    rng = np.random.default_rng(1)
+    alice, bob, carol = (rng.standard_normal(64) for _ in range(3))
+    clusterer = IdentityClusterer(threshold=0.6, dim=64)
+
+    ids = set()
+    for i, v in enumerate(_person(rng, alice, 5)):
+        ids.add(clusterer.assign(v, appearance={"video_id": 1, "timestamp": float(i)}))
+    assert len(ids) == 1
+    alice_id = ids.pop()
+
+    bob_id = clusterer.assign(_person(rng, bob, 1)[0], appearance={"video_id": 1, "timestamp": 2.5})
+    carol_id = clusterer.assign(_person(rng, carol, 1)[0], appearance={"video_id": 1, "timestamp": 30.0})
+    assert len({alice_id, bob_id, carol_id}) == 3
+    assert clusterer.assign(np.zeros(64)) is None
+
+    assert clusterer.nearest(alice, k=1)[0][0] == alice_id
+    assert len(clusterer.appearances(alice_id)) == 5
+
+    companions = clusterer.companions(alice_id, window=2.0)
+    assert [c["person_id"] for c in companions] == [bob_id]
+    assert companions[0]["videos"] == [1]
+
+
+def test_gallery_queries_and_rebuild_over_the_flat_store(tmp_path):
+    from src.data.vector_store import FlatBackend, VectorStore
+    from src.visual_cortex.identity_gallery import IdentityGallery
+
+    rng = np.random.default_rng(2)
+    alice, bob, carol, stranger = (rng.standard_normal(512) for _ in range(4))
+    sightings = [(alice, 1, float(t)) for t in range(5)] + [
+        (bob, 1, 2.5), (carol, 1, 30.0), (alice, 2, 10.0), (bob, 2, 10.5)
+    ]
+    items = [
+        (v, {"video_id": vid, "timestamp": ts, "frame_idx": int(ts * 25)})
+        for center, vid, ts in sightings for v in _person(rng, center, 1)
+    ]
+
+    store = VectorStore("gallery", backend=FlatBackend(str(tmp_path)))
+    gallery = IdentityGallery(store, threshold=0.6)
+    assert len(gallery.add_identities(items)) == len(items)
+    store.flush()
+
+    found = gallery.find_appearances(alice)
+    assert [(a["video_id"], a["timestamp"]) for a in found] == [(1, float(t)) for t in range(5)] + [(2, 10.0)]
+    assert len({a["person_id"] for a in found}) == 1
+    assert [a["timestamp"] for a in gallery.find_appearances(alice, video_id=2)] == [10.0]
+    assert gallery.find_appearances(np.zeros(512)) == []
+
+    alice_id, similarity = gallery.find_person(alice)
+    assert alice_id == found[0]["person_id"] and similarity > 0.9
+    assert gallery.find_person(stranger) is None
+    assert gallery.find_companions(stranger) == []
+
+    bob_id = gallery.find_person(bob)[0]
+    companions = gallery.find_companions(alice, window=2.0)  # bob is near alice at t=1..4 and in video 2
+    assert [(c["person_id"], c["count"], c["videos"]) for c in companions] == [(bob_id, 5, [1, 2])]
+
+    # A fresh process restores the same clusters and ids from the stored payloads
+    restored = IdentityGallery(VectorStore("gallery", backend=FlatBackend(str(tmp_path))), threshold=0.6)
+    restored.rebuild()
+    assert len(restored.clusterer) == 3
+    assert restored.find_person(alice)[0] == alice_id and restored.find_person(bob)[0] == bob_id
+    assert restored.find_companions(alice, window=2.0) == companions
@@ -0,0 +1,140 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from src.ai.live import LiveCamera, LiveScheduler
+from test_video_decoder import write_clip
+
+
+class SlowAnalyzer:
+    """Stands in for FrameAnalyzer: slower than the stream, records what it was given."""
+    def __init__(self, delay):
+        self.delay = delay
+        self.seen = []
+
+    def process(self, frame, frame_idx, timestamp, detection=None):
+        self.seen.append((frame_idx, frame.shape, detection))
+        time.sleep(self.delay)
+        return {"detections": 0}
+
+
+class FakeDetector:
+    """Batched YOLO stand-in: the 'detection' of a frame is its shape."""
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, frames):
+        self.batches.append(len(frames))
+        return [frame.shape for frame in frames]
+
+
+class FlakySession:
+    """SQLAlchemy session stand-in whose first commit fails."""
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+        if self.commits == 1:
+            raise RuntimeError("database is locked")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def camera(name, url="unused", priority=2, fps=10, analyzer=None):
+    return LiveCamera({"name": name, "url": url, "priority": priority}, fps=fps,
+                      analyzer=analyzer, log=lambda m: None)
+
+
+def test_scheduler_batches_newest_frames_across_looped_files(tmp_path):
+    analyzers, cameras = [], []
+    for i, (width, height) in enumerate(((320, 240), (160, 120))):
+        src = str(tmp_path / f"cam{i}.mp4")
+        write_clip(src, frames=10, width=width, height=height)  # 1 s at 10 fps, looped
+        analyzers.append(SlowAnalyzer(0.25))
+        cameras.append(camera(f"cam{i}", src, fps=30, analyzer=analyzers[-1]))
+    detector = FakeDetector()
+    scheduler = LiveScheduler(detector=detector, log=lambda m: None)
+    for cam in cameras:
+        cam.start()
+        scheduler.add(cam)
+    while not all(cam.slot.pending and not cam.busy for cam in cameras):
+        time.sleep(0.01)
+    scheduler.start()
+    time.sleep(1.8)
+    scheduler.stop()
+    for cam in cameras:
+        cam.stop()
+        cam.join(5)
+    scheduler.join(5)
+
+    assert max(detector.batches) == 2  # both cameras in one YOLO call
+    for cam, analyzer, shape in zip(cameras, analyzers, ((240, 320, 3), (120, 160, 3))):
+        assert analyzer.seen and all(s == shape and d == shape for _, s, d in analyzer.seen)  # routed back
+        status = cam.status()
+        assert not status["running"] and status["fps"] > 0 and status["latency_ms"] is not None
+        assert status["dropped"] > 0  # frames arriving during inference were replaced, not queued
+        assert status["received"] > 10  # kept reading past the end of the file
+        idx = [i for i, _, _ in analyzer.seen]
+        assert idx == sorted(idx) and len(set(idx)) == len(idx)
+
+
+def test_full_batch_serves_priority_first_then_takes_turns():
+    low, high = camera("low", priority=1), camera("high", priority=3)
+    scheduler = LiveScheduler(detector=FakeDetector(), max_batch=1, log=lambda m: None)
+    for cam in (low, high):
+        cam.busy = False
+        scheduler.add(cam)
+
+    served = []
+    now = 100.0
+    for _ in range(4):
+        for cam in (low, high):
+            cam.slot.put(np.zeros((2, 2, 3), np.uint8), 0, 0.0)
+        served += [cam.camera_name for cam, _ in scheduler.pick(now)]
+        now += 0.15
+    assert served == ["high", "low", "high", "low"]
+
+
+def test_overload_degrades_lowest_priority_first():
+    cams = [camera("low", priority=1), camera("normal", priority=2), camera("high", priority=3)]
+    scheduler = LiveScheduler(detector=FakeDetector(), log=lambda m: None)
+    for cam in cams:
+        scheduler.add(cam)
+
+    for _ in range(4):
+        scheduler._late = [1.0]
+        scheduler.adapt(2.0)
+    assert [c.scale for c in cams] == [0.125, 0.5, 1.0]
+
+    scheduler._late = [0.0]
+    scheduler.adapt(2.0)
+    assert [c.scale for c in cams] == [0.125, 1.0, 1.0]  # restored highest priority first
+
+
+def test_bad_frame_and_failed_commit_do_not_stop_the_camera():
+    analyzer = SlowAnalyzer(0.0)
+    process = analyzer.process
+    analyzer.process = lambda frame, idx, ts, det=None: 1 / 0 if idx == 1 else process(frame, idx, ts, det)
+    cam = camera("flaky", analyzer=analyzer)
+    cam.COMMIT_S = 0.0  # commit after every frame
+    session = FlakySession()
+    loop = threading.Thread(target=cam._loop, args=(session, None))
+    loop.start()
+    for idx in range(3):
+        cam.submit(np.zeros((2, 2, 3), np.uint8), idx, time.time())
+        while cam.busy:
+            time.sleep(0.01)
+    cam.slot.close()
+    loop.join(5)
+
+    assert not loop.is_alive()
+    assert (cam.processed, cam.failed) == (2, 1)
+    assert [idx for idx, _, _ in analyzer.seen] == [0, 2]
+    assert session.rollbacks == 2  # after the failed commit and after the failed frame
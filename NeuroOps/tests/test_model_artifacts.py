@@ -0,0 +1,49 @@
+import sys
+import os
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai.artifacts import build_loaded, cached_state_dict
+
+
+def build():
+    return torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3), torch.nn.BatchNorm2d(8), torch.nn.Flatten(), torch.nn.Linear(288, 4))
+
+
+def test_cached_state_dict_is_reused_and_memory_mapped(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEUROOPS_ARTIFACT_DIR", str(tmp_path / "cache"))
+    ckpt = tmp_path / "model.ckpt"
+    model = build()
+    torch.save({"state_dict": {"module." + k: v for k, v in model.state_dict().items()}}, ckpt)
+
+    calls = []
+
+    def clean():
+        calls.append(1)
+        sd = torch.load(ckpt)["state_dict"]
+        return {k.replace("module.", ""): v for k, v in sd.items()}
+
+    first = cached_state_dict("toy", str(ckpt), clean)
+    second = cached_state_dict("toy", str(ckpt), clean)
+    assert len(calls) == 1
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    warm = build_loaded(build, second)
+    assert warm[0].weight.data_ptr() == second["0.weight"].data_ptr()  # adopted, not copied
+    x = torch.randn(2, 3, 8, 8)
+    with torch.no_grad():
+        assert torch.equal(model.eval()(x), warm.eval()(x))
+    assert all(torch.equal(first[k], second[k]) for k in first)
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEUROOPS_ARTIFACT_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("NEUROOPS_ARTIFACT_CACHE", "0")
+    ckpt = tmp_path / "model.ckpt"
+    ckpt.write_bytes(b"x")
+    calls = []
+    for _ in range(2):
+        cached_state_dict("toy", str(ckpt), lambda: calls.append(1) or {})
+    assert len(calls) == 2
+    assert not os.path.exists(tmp_path / "cache")
@@ -0,0 +1,117 @@
+import sys
+import os
+import threading
+import time
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai.model_registry import BatchingServer, ModelRegistry
+
+
+def test_concurrent_requests_are_batched_and_routed():
+    calls = []
+
+    def square(items):
+        calls.append(len(items))
+        time.sleep(0.01)
+        return [x * x for x in items]
+
+    server = BatchingServer("square", square, max_batch=8, max_wait_ms=20)
+    results = {}
+
+    def client(x):
+        results[x] = server(x)
+
+    threads = [threading.Thread(target=client, args=(x,)) for x in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {x: x * x for x in range(16)}
+    assert max(calls) <= 8
+    assert len(calls) < 16  # at least some requests shared a batch
+
+    stats = server.stats()
+    assert stats["requests"] == 16
+    assert stats["batches"] == len(calls)
+    assert sum(size * n for size, n in stats["batch_hist"].items()) == 16
+    assert stats["queue_depth"] == 0
+
+
+def test_map_keeps_order_and_errors_propagate():
+    server = BatchingServer("neg", lambda items: [-x for x in items], max_batch=4, max_wait_ms=1)
+    assert server.map(list(range(10))) == [-x for x in range(10)]
+
+    def fail(items):
+        raise RuntimeError("boom")
+
+    broken = BatchingServer("broken", fail)
+    with pytest.raises(RuntimeError):
+        broken(1)
+
+
+def test_bad_item_fails_alone_and_short_results_fail_the_rest():
+    def invert(items):
+        return [1 / x for x in items]
+
+    server = BatchingServer("invert", invert, max_batch=4, max_wait_ms=50)
+    futures = server.submit_many([1, 0, 2, 4])
+    with pytest.raises(ZeroDivisionError):
+        futures[1].result(timeout=2)
+    assert [futures[i].result(timeout=2) for i in (0, 2, 3)] == [1.0, 0.5, 0.25]
+    assert server.stats()["retried"] == 4
+
+    short = BatchingServer("short", lambda items: items[:2], max_batch=4, max_wait_ms=50)
+    futures = short.submit_many(["a", "b", "c"])
+    assert [f.result(timeout=2) for f in futures[:2]] == ["a", "b"]
+    with pytest.raises(RuntimeError):
+        futures[2].result(timeout=2)  # resolved, not left hanging
+
+
+def test_registry_loads_each_model_once():
+    registry = ModelRegistry()
+    loads = []
+
+    class Handle:
+        servers = []
+
+        def memory_mb(self):
+            return 0.0
+
+    def factory():
+        loads.append(1)
+        return Handle()
+
+    a = registry.get("clip:test", factory)
+    b = registry.get("clip:test", factory)
+    assert a is b
+    assert len(loads) == 1
+    assert registry.stats() == {"clip:test": {"memory_mb": 0.0, "servers": {}}}
+
+
+def test_registry_loads_different_models_concurrently():
+    registry = ModelRegistry()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        return "slow"
+
+    loader = threading.Thread(target=registry.get, args=("slow", slow))
+    loader.start()
+    started.wait(1)
+    t0 = time.perf_counter()
+    assert registry.get("fast", lambda: "fast") == "fast"
+    assert time.perf_counter() - t0 < 0.25  # not stuck behind the slow load
+    assert registry.get("slow", lambda: "reloaded") == "slow"  # waits for the first load
+    loader.join()
+
+    def broken():
+        raise RuntimeError("no weights")
+
+    with pytest.raises(RuntimeError):
+        registry.get("broken", broken)
+    assert registry.get("broken", lambda: "retried") == "retried"
@@ -0,0 +1,75 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai.ocr_roi import RoiOCR, RoiTracker, DEFAULT_CONFIG
+
+
+class FakeOCR:
+    """Finds one text box in the lower half of each ROI; confidence set per test."""
+    def __init__(self, confidence):
+        self.confidence = confidence
+        self.detect_calls = []
+        self.recognize_calls = []
+
+    def detect_regions(self, frame, rois):
+        self.detect_calls.append(len(rois))
+        return [[[x1 + 5, (y1 + y2) // 2, x2 - 5, y2 - 5]] for x1, y1, x2, y2 in rois]
+
+    def recognize_boxes(self, frame, boxes):
+        self.recognize_calls.append(len(boxes))
+        return [{"bbox": b, "text": "ABC 123", "confidence": self.confidence} for b in boxes]
+
+
+def frame():
+    return np.zeros((720, 1280, 3), dtype=np.uint8)
+
+
+def test_tracker_keeps_ids_for_moving_boxes():
+    tracker = RoiTracker()
+    a = tracker.update([((100, 100, 200, 200), "car"), ((500, 100, 600, 200), "car")], 0.0)
+    b = tracker.update([((510, 105, 610, 205), "car"), ((110, 100, 210, 200), "car")], 0.5)
+    assert b == [a[1], a[0]]
+    assert tracker.update([((110, 100, 210, 200), "truck")], 1.0)[0] not in a
+    assert set(tracker.expire(5.0)) == set(a) | {3}
+
+
+def test_legible_plate_is_read_once():
+    ocr = FakeOCR(confidence=0.9)
+    stage = RoiOCR(ocr, dict(DEFAULT_CONFIG))
+    dets = [((100, 100, 300, 250), "car"), ((700, 300, 900, 450), "truck"), ((0, 0, 50, 50), "person")]
+
+    first = stage.process(frame(), dets, 0.0)
+    assert len(first) == 2 and {r["class_name"] for r in first} == {"car", "truck"}
+    assert ocr.detect_calls == [2] and ocr.recognize_calls == [2]  # one batch per frame
+
+    for t in (0.5, 1.0, 2.0):
+        moved = [((x1 + 4, y1, x2 + 4, y2), c) for (x1, y1, x2, y2), c in dets]
+        cached = stage.process(frame(), moved, t)
+        assert [(r["text"], r["cached"]) for r in cached] == [("ABC 123", True)] * 2
+    assert ocr.recognize_calls == [2]
+    assert stage.cache_hits == 6
+
+
+def test_unreadable_track_is_retried_after_interval():
+    ocr = FakeOCR(confidence=0.5)
+    stage = RoiOCR(ocr, dict(DEFAULT_CONFIG, retry_s=1.0))
+    dets = [((100, 100, 300, 250), "car")]
+
+    stage.process(frame(), dets, 0.0)
+    stage.process(frame(), dets, 0.5)   # too soon
+    stage.process(frame(), dets, 1.0)   # retried
+    assert ocr.recognize_calls == [1, 1]
+
+
+def test_sign_regions_on_their_own_interval():
+    ocr = FakeOCR(confidence=0.9)
+    stage = RoiOCR(ocr, dict(DEFAULT_CONFIG, sign_regions=[[0.0, 0.0, 0.25, 0.1]], sign_interval_s=3.0))
+
+    readings = stage.process(frame(), [], 0.0)
+    assert readings[0]["bbox"] == [0, 0, 320, 72]
+    assert stage.process(frame(), [], 1.0) == []
+    assert len(stage.process(frame(), [], 3.0)) == 1
+    assert ocr.detect_calls == []
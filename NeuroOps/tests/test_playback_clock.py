@@ -0,0 +1,63 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from PyQt6.QtCore import Qt
+
+from src.core.video.clock import PlaybackClock
+from src.core.video.worker import VideoWorker
+from test_video_decoder import write_clip
+from test_thumbnails import GOP5
+
+
+def test_clock_maps_pts_to_wall_time_at_rate():
+    now = [100.0]
+    clock = PlaybackClock(now=lambda: now[0])
+    assert clock.lateness(5.0) == 0.0          # first frame anchors the clock
+    assert clock.due(6.0) == 101.0
+    now[0] = 101.5
+    assert clock.lateness(6.0) == 0.5          # half a second late
+
+    clock.set_rate(4.0)
+    clock.due(6.0)                             # re-anchored at 101.5
+    assert clock.due(10.0) == 102.5
+
+
+def play(path, seconds, rate=1.0, **kwargs):
+    worker = VideoWorker(path, cache_mb=64, **kwargs)
+    shown = []
+    worker.frame_ready.connect(lambda img, ts: shown.append((time.monotonic(), ts)),
+                               Qt.ConnectionType.DirectConnection)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    try:
+        worker.set_rate(rate)
+        worker.play()
+        time.sleep(seconds)
+    finally:
+        worker.stop()
+        thread.join(5)
+    return worker, shown
+
+
+def test_playback_follows_the_clock_without_drift(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=40)  # 10 fps
+    worker, shown = play(path, 2.0, index_dir=str(tmp_path / "keyframes"))
+    assert len(shown) >= 15
+    # Wall time between frames tracks their PTS (no 0.9x sleep speed-up)
+    (w0, t0), (w1, t1) = shown[1], shown[-1]
+    assert abs((w1 - w0) - (t1 - t0)) < 0.1
+
+
+def test_fast_scan_decodes_keyframes_only(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=80, options=GOP5)  # keyframe every 0.5 s
+    worker, shown = play(path, 0.8, rate=4.0, index_dir=str(tmp_path / "keyframes"))
+    scanned = [ts for _, ts in shown[1:]]
+    assert len(scanned) >= 3
+    assert all(abs(ts * 2 - round(ts * 2)) < 1e-6 for ts in scanned)
+    assert worker.rate == 4.0
@@ -0,0 +1,47 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import av
+from src.core.video.proxy import build_proxies, has_valid_proxy, playback_source, proxy_path, transcode_proxy
+from test_video_decoder import write_clip
+
+
+def frames(path):
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        return stream.height, [(f.pts * stream.time_base, f.key_frame) for f in container.decode(stream)]
+
+
+def test_proxy_keeps_source_timestamps(tmp_path):
+    src = str(tmp_path / "clip.mp4")
+    write_clip(src, frames=30)
+    out = transcode_proxy(src, str(tmp_path / "proxy.mp4"), height=120, gop=5)
+    src_height, src_frames = frames(src)
+    height, proxy_frames = frames(out)
+    assert height == 120
+    assert [t for t, _ in proxy_frames] == [t for t, _ in src_frames]
+    assert [i for i, (_, key) in enumerate(proxy_frames) if key] == [0, 5, 10, 15, 20, 25]
+
+
+def test_build_skips_valid_proxies(tmp_path):
+    src = str(tmp_path / "clip.mp4")
+    write_clip(src, frames=20)
+    proxy_dir = str(tmp_path / "proxies")
+    assert playback_source(src, proxy_dir) == src
+
+    assert build_proxies([src], proxy_dir, height=120, workers=1) == {src: "built"}
+    assert has_valid_proxy(src, proxy_dir)
+    assert playback_source(src, proxy_dir) == proxy_path(src, proxy_dir)
+    assert build_proxies([src], proxy_dir, height=120) == {src: "skipped"}
+    assert build_proxies([src], str(tmp_path / "other"), height=240) == {src: "skipped"}  # not taller than the proxy
+
+
+def test_stopped_transcode_leaves_nothing_behind(tmp_path):
+    src = str(tmp_path / "clip.mp4")
+    write_clip(src, frames=30)
+    out = str(tmp_path / "proxies" / "clip.mp4")
+    checks = []
+    assert transcode_proxy(src, out, height=120, should_stop=lambda: checks.append(1) or len(checks) > 5) is None
+    assert os.listdir(tmp_path / "proxies") == []
@@ -0,0 +1,34 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.video.sprites import SpriteAtlas
+from test_video_decoder import write_clip
+from test_thumbnails import GOP5, red
+
+
+def test_atlas_tiles_slots_across_sheets(tmp_path):
+    # 3 s at 10 fps, a keyframe every 0.5 s: 6 slots on 2x2 sheets -> 2 sheets
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=30, options=GOP5)
+    dirs = dict(sprite_dir=str(tmp_path / "sprites"), index_dir=str(tmp_path / "kf"))
+    built = SpriteAtlas.build(path, interval=0.5, tile=(32, 18), cols=2, rows=2, **dirs)
+    assert built.count == 6 and len(built.sheets) == 2
+
+    atlas = SpriteAtlas.load(path, dirs["sprite_dir"])
+    assert atlas.count == 6 and atlas.duration == built.duration
+    tile = atlas.thumbnail_at(2.2)  # slot 4 (2.0 s, frame 20), first tile of sheet 2
+    assert (tile.width(), tile.height()) == (32, 18)
+    for t, frame in ((0.0, 0), (1.2, 10), (2.2, 20), (2.9, 25)):
+        assert abs(red(atlas.thumbnail_at(t)) - (20 * frame) % 256) <= 10
+
+
+def test_missing_or_stopped_atlas_is_not_indexed(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=10)
+    sprite_dir = str(tmp_path / "sprites")
+    assert SpriteAtlas.load(path, sprite_dir) is None
+    assert SpriteAtlas.build(path, sprite_dir=sprite_dir, index_dir=str(tmp_path / "kf"),
+                             should_stop=lambda: True) is None
+    assert SpriteAtlas.load(path, sprite_dir) is None
@@ -0,0 +1,61 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.db_manager import DatabaseManager
+from src.data.models import TextDetection
+from src.ai.text_consolidation import TextConsolidator, normalize_text
+from src.ai.ocr_roi import RoiOCR, DEFAULT_CONFIG
+from test_ocr_roi import FakeOCR, frame
+
+
+def test_normalize_text():
+    assert normalize_text("abc-123 ") == normalize_text("ABC 123") == "ABC123"
+
+
+def test_repeated_readings_become_one_span(tmp_path):
+    db = DatabaseManager(str(tmp_path / "t.db"))
+    session = db.get_session()
+    video_id = db.add_video(str(tmp_path / "v.mp4"), "v.mp4")
+    rows = TextConsolidator(session, video_id)
+
+    box = [100, 100, 200, 140]
+    readings = [("EX1T", 0.5), ("EXIT", 0.9), ("EXIT", 0.8), ("EXlT", 0.6)]
+    for i, (text, conf) in enumerate(readings):
+        rows.add({"bbox": box, "text": text, "confidence": conf}, i * 30, float(i))
+    # Different text in the same place, and the same text after a long gap
+    rows.add({"bbox": box, "text": "ENTRANCE", "confidence": 0.9}, 120, 4.0)
+    rows.add({"bbox": box, "text": "EXIT", "confidence": 0.9}, 900, 30.0)
+    session.commit()
+
+    stored = session.query(TextDetection).order_by(TextDetection.id).all()
+    assert (rows.inserted, rows.merged) == (3, 3)
+    assert len(stored) == 3
+    first = stored[0]
+    assert (first.text_content, first.timestamp, first.last_seen, first.observations) == ("EXIT", 0.0, 3.0, 4)
+    session.close()
+
+
+def test_accepted_track_keeps_extending_its_row(tmp_path):
+    db = DatabaseManager(str(tmp_path / "t.db"))
+    session = db.get_session()
+    video_id = db.add_video(str(tmp_path / "v.mp4"), "v.mp4")
+    rows = TextConsolidator(session, video_id)
+    ocr = FakeOCR(confidence=0.9)
+    stage = RoiOCR(ocr, dict(DEFAULT_CONFIG))
+
+    # The car stays in view for 4 s after its plate was read (as FrameAnalyzer does)
+    for i in range(9):
+        t = i * 0.5
+        for res in stage.process(frame(), [((100 + 4 * i, 100, 300 + 4 * i, 250), "car")], t):
+            if res.get("cached"):
+                rows.touch(res["track_id"], t)
+            else:
+                rows.add(res, i * 15, t)
+    session.commit()
+
+    assert ocr.recognize_calls == [1]  # read once
+    row = session.query(TextDetection).one()
+    assert (row.timestamp, row.last_seen, row.observations) == (0.0, 4.0, 9)
+    session.close()
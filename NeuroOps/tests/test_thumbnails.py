@@ -0,0 +1,51 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from PyQt6.QtCore import Qt
+from src.core.video.thumbnails import ThumbnailCache, keyframe_thumbnails
+from src.ui.workbench.filmstrip import ThumbnailWorker
+from test_video_decoder import write_clip
+
+GOP5 = {"g": "5", "sc_threshold": "1000000000"}  # keyframe every 5 frames, no scene-cut keyframes
+
+
+def red(image):
+    return image.pixelColor(image.width() // 2, image.height() // 2).red()
+
+
+def test_thumbnails_come_from_the_preceding_keyframe(tmp_path):
+    # 10 fps, keyframe every 5 frames: slots at 1.0s and 1.7s show frames 10 and 15
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=30, options=GOP5)
+    thumbs = dict(keyframe_thumbnails(path, [0.0, 1.0, 1.7], 64, 36, index_dir=str(tmp_path / "kf")))
+    assert sorted(thumbs) == [0, 1, 2]
+    assert thumbs[0].size().width() == 64 and thumbs[0].size().height() == 36
+    for i, frame in ((0, 0), (1, 10), (2, 15)):
+        assert abs(red(thumbs[i]) - (20 * frame) % 256) <= 8
+
+
+def test_worker_fills_and_then_reads_the_disk_cache(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path, frames=30, options=GOP5)
+    dirs = dict(thumb_dir=str(tmp_path / "thumbs"), index_dir=str(tmp_path / "kf"))
+
+    def run_worker():
+        got = {}
+        worker = ThumbnailWorker(path, start_time=0.0, end_time=2.0, width=64, height=36, **dirs)
+        worker.thumbnail_ready.connect(lambda i, img: got.__setitem__(i, img),
+                                       Qt.ConnectionType.DirectConnection)
+        worker.run()
+        return got
+
+    first = run_worker()
+    cache = ThumbnailCache(path, 64, 36, dirs["thumb_dir"])
+    assert sorted(first) == [0, 1]
+    assert all(os.path.exists(cache.path(t)) for t in (0.0, 1.0))
+
+    os.remove(os.path.join(dirs["index_dir"], os.listdir(dirs["index_dir"])[0]))
+    second = run_worker()
+    assert sorted(second) == [0, 1]
+    assert not os.listdir(dirs["index_dir"])  # served from disk without touching the video
+    assert abs(red(second[1]) - red(first[1])) <= 8
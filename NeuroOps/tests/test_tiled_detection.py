@@ -0,0 +1,47 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai.tiled_detection import tile_grid, select_tiles, merge_detections, motion_regions
+
+
+def test_tile_grid_covers_frame():
+    tiles = tile_grid(3840, 2160, tile=640, overlap=0.2)
+    covered = np.zeros((2160, 3840), dtype=bool)
+    for x1, y1, x2, y2 in tiles:
+        assert x2 - x1 == 640 and y2 - y1 == 640
+        covered[y1:y2, x1:x2] = True
+    assert covered.all()
+    assert tile_grid(500, 400) == [(0, 0, 500, 400)]
+
+
+def test_select_tiles_only_near_regions():
+    tiles = tile_grid(3840, 2160)
+    chosen = select_tiles(tiles, [(100, 100, 140, 140)])
+    assert chosen and all(t[0] <= 100 and t[1] <= 100 for t in chosen)
+    assert select_tiles(tiles, []) == []
+
+
+def test_merge_detections_drops_duplicates_and_cut_boxes():
+    det = np.array([
+        [100, 100, 200, 200, 0.9, 0],   # full object
+        [102, 101, 199, 201, 0.6, 0],   # same object from another tile
+        [100, 100, 150, 200, 0.5, 0],   # left half, cut at a tile border
+        [100, 100, 200, 200, 0.8, 1],   # other class, same place
+        [500, 500, 520, 520, 0.4, 0],
+    ], dtype=np.float32)
+    merged = merge_detections(det)
+    assert len(merged) == 3
+    np.testing.assert_allclose(sorted(merged[:, 4]), [0.4, 0.8, 0.9], atol=1e-6)
+
+
+def test_motion_regions_finds_moving_blob():
+    prev = np.zeros((180, 320), dtype=np.uint8)
+    cur = prev.copy()
+    cur[50:70, 200:230] = 255
+    boxes = motion_regions(prev, cur)
+    assert len(boxes) == 1
+    x1, y1, x2, y2 = boxes[0]
+    assert x1 <= 200 and y1 <= 50 and x2 >= 230 and y2 >= 70
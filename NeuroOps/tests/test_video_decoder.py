@@ -0,0 +1,80 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.video.decoder import VideoDecoder, fit_size
+from src.core.video.keyframe_index import KeyframeIndex
+
+
+def write_clip(path, frames=12, width=320, height=240, codec="mpeg4", options=None):
+    import av
+    container = av.open(path, "w")
+    stream = container.add_stream(codec, rate=10)
+    stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+    stream.options = options or {}
+    for i in range(frames):
+        img = np.zeros((height, width, 3), dtype=np.uint8)
+        img[:, :, 0] = (20 * i) % 256
+        for packet in stream.encode(av.VideoFrame.from_ndarray(img, format="rgb24")):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+
+
+def test_fit_size_keeps_aspect_and_never_upscales():
+    assert fit_size(1920, 1080, 960, 960) == (960, 540)
+    assert fit_size(640, 480, 1920, 1080) == (640, 480)
+
+
+def test_qimages_own_their_frames(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_clip(path)
+    decoder = VideoDecoder(path, display_size=(160, 160), index_dir=str(tmp_path / "keyframes"))
+    images = [img for img, _ in decoder.decode_frames()]
+    decoder.close()
+
+    assert len(images) == 12
+    assert (images[-1].width(), images[-1].height()) == (160, 120)
+    # Every frame is still intact and in order: nothing is recycled under them
+    reds = []
+    for img in images:
+        ptr = img.constBits()
+        ptr.setsize(img.sizeInBytes())
+        pixels = np.frombuffer(ptr, np.uint8).reshape(img.height(), img.bytesPerLine())
+        reds.append(int(pixels[60, 240]))
+    assert reds == sorted(reds) and len(set(reds)) == len(reds)
+
+
+def test_seek_lands_on_exact_frame_and_index_is_persisted(tmp_path, monkeypatch):
+    import av
+    path = str(tmp_path / "gop.mp4")
+    write_clip(path, frames=120, width=160, height=96, codec="libx264", options={"g": "50", "bf": "2"})
+    with av.open(path) as container:
+        all_pts = sorted(f.pts for f in container.decode(video=0))
+
+    index_dir = str(tmp_path / "keyframes")
+    decoder = VideoDecoder(path, index_dir=index_dir)
+    tb = decoder.time_base
+    for i in [97, 3, 55, 50, 49, 0, 119]:
+        landed = decoder.seek(all_pts[i] * tb + 0.5 / decoder.fps)  # mid-frame target
+        assert round(landed / tb) == all_pts[i]
+        _, ts = next(decoder.decode_frames())
+        assert round(ts / tb) == all_pts[i]
+
+    # Stepping forward inside a GOP continues decoding without re-seeking
+    decoder.seek(all_pts[60] * tb)
+    frames = decoder._frames
+    for i in range(61, 70):
+        assert round(decoder.seek(all_pts[i] * tb) / tb) == all_pts[i]
+        if decoder.keyframes.position(all_pts[i]) == decoder.keyframes.position(all_pts[60]):
+            assert decoder._frames is frames
+    decoder.close()
+
+    assert len(os.listdir(index_dir)) == 1
+    monkeypatch.setattr(KeyframeIndex, "build", classmethod(lambda cls, p: 1 / 0))
+    index = KeyframeIndex.load_or_build(path, index_dir)
+    assert index.pts[0] == all_pts[0] and len(index.pts) >= 3
+    assert index.keyframe_before(all_pts[60])[0] <= all_pts[60]